@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
-from .models import ChatMessage
+from .models import ChatMessage, WeeklyMemeSnapshot
 
 
 @admin.register(ChatMessage)
@@ -46,4 +46,13 @@ class ChatMessageAdmin(admin.ModelAdmin):
     user_message_short.short_description = _('User Message')
     
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('suggested_transaction') 
\ No newline at end of file
+        return super().get_queryset(request).select_related('suggested_transaction')
+
+
+@admin.register(WeeklyMemeSnapshot)
+class WeeklyMemeSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['user', 'iso_year', 'iso_week', 'language', 'is_stale', 'computed_at']
+    list_filter = ['is_stale', 'language', 'iso_year']
+    search_fields = ['user__email']
+    list_select_related = ['user']
+    readonly_fields = ['computed_at']
@@ -5,5 +5,10 @@ from django.utils.translation import gettext_lazy as _
 class AiChatConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ai_chat'
-    verbose_name = _('AI Chat') 
- 
\ No newline at end of file
+    verbose_name = _('AI Chat')
+    
+    def ready(self):
+        # Transaction writes invalidate the weekly meme snapshots of their weeks
+        from transactions.signals import transactions_changed
+        from .snapshot_service import mark_snapshots_stale
+        transactions_changed.connect(mark_snapshots_stale)
@@ -6,10 +6,12 @@ import logging
 from typing import Dict, Any, Optional
 from datetime import datetime, date
 from .date_parser import DateParser
+from expense_tracker.profiling import phase_timer
 
 logger = logging.getLogger(__name__)
 
 
+@phase_timer('gemini')
 class GeminiService:
     def __init__(self, language='vi'):
         """Initialize Gemini service with language support"""
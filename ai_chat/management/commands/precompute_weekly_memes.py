@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ai_chat.snapshot_service import WeeklyMemeSnapshotService
+
+
+PRECOMPUTE_CHUNK_SIZE = 200
+
+
+class Command(BaseCommand):
+    help = (
+        "Precompute the current week's meme and spending analysis of every "
+        "active user (schedule it, e.g. hourly via cron) so the meme endpoints "
+        "are single-row reads"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=PRECOMPUTE_CHUNK_SIZE,
+            help='Number of users computed per grouped query',
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=30,
+            help='Only users with a transaction in the last N days',
+        )
+        parser.add_argument(
+            '--language',
+            action='append',
+            help='Languages to precompute (repeatable, default: all of LANGUAGES)',
+        )
+
+    def handle(self, *args, **options):
+        languages = options['language'] or [code for code, _name in settings.LANGUAGES]
+        user_ids = WeeklyMemeSnapshotService.active_user_ids(options['days'])
+        chunk_size = max(1, options['chunk_size'])
+
+        self.stdout.write(f'🎭 Precomputing weekly memes for {len(user_ids)} active users...')
+
+        written = 0
+        for offset in range(0, len(user_ids), chunk_size):
+            chunk = user_ids[offset:offset + chunk_size]
+            written += WeeklyMemeSnapshotService.precompute(chunk, languages)
+            self.stdout.write(f'   📊 {offset + len(chunk)}/{len(user_ids)} users, {written} snapshots')
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Stored {written} weekly meme snapshots'))
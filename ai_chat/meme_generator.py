@@ -3,17 +3,15 @@ AI Meme Generator for Expense Tracker
 Analyzes weekly spending patterns and generates humorous memes
 """
 
-from datetime import datetime, timedelta
-from django.db.models import Sum
+from datetime import date, timedelta
 from django.utils.translation import gettext as _
-from django.core.cache import cache
 import random
-import hashlib
-from typing import Dict, List, Any
-from transactions.models import Transaction
+from typing import Dict, List, Any, Tuple
+from transactions.summary_service import TransactionSummary, TransactionSummaryService
 
 class MemeGenerator:
-    def __init__(self, language='vi'):
+    def __init__(self, user, language='vi'):
+        self.user = user
         self.language = language
         
         # Meme templates with their trigger conditions
@@ -391,21 +389,42 @@ class MemeGenerator:
             }
         }
 
+    @staticmethod
+    def _current_week() -> Tuple[date, date]:
+        """Monday and Sunday of the current ISO week"""
+        today = date.today()
+        start_date = today - timedelta(days=today.isoweekday() - 1)
+        return start_date, start_date + timedelta(days=6)
+
     def generate_weekly_meme(self, user_transactions=None) -> Dict[str, Any]:
-        """Generate a weekly meme based on user's spending patterns"""
-        
-        # Create cache key based on date and language
-        today = datetime.now().date()
-        cache_key = f"weekly_meme_{today}_{self.language}"
+        """
+        Generate a weekly meme based on user's spending patterns.
         
-        # Check cache first (cache for 1 hour to allow some variation)
-        if not user_transactions:  # Only cache when using real data
-            cached_meme = cache.get(cache_key)
-            if cached_meme:
-                return cached_meme
+        Read from the user's WeeklyMemeSnapshot of the current ISO week and
+        language, which is rebuilt when missing or stale.
+        """
+        if user_transactions is not None:  # Explicit transactions are never stored
+            return self._build_weekly_meme(self._analyze_weekly_spending(user_transactions))
         
-        # Get weekly analysis
-        analysis = self._analyze_weekly_spending(user_transactions)
+        from .snapshot_service import WeeklyMemeSnapshotService
+        return WeeklyMemeSnapshotService.get_snapshot(self.user, self.language).meme
+
+    def build_weekly_payloads(self, summary: TransactionSummary = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Build the meme and the spending analysis of the current ISO week.
+        
+        Args:
+            summary (TransactionSummary): Precomputed summary of the week's
+                transactions (batch job); queried when omitted
+        
+        Returns:
+            tuple: (meme data, spending analysis)
+        """
+        analysis = self._analyze_weekly_spending(summary=summary)
+        return self._build_weekly_meme(analysis), self._build_spending_analysis(analysis)
+
+    def _build_weekly_meme(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Choose and render a meme for a weekly analysis"""
         
         # Determine personality
         personality = self._determine_personality(analysis)
@@ -426,56 +445,33 @@ class MemeGenerator:
             'shareable_text': self._create_shareable_text(personality, analysis)
         }
         
-        # Cache the result for 1 hour
-        if not user_transactions:
-            cache.set(cache_key, meme_data, 3600)
-        
         return meme_data
 
-    def _analyze_weekly_spending(self, user_transactions=None) -> Dict[str, Any]:
-        """Analyze spending patterns for the past week"""
-        
-        # Get date range for past week
-        end_date = datetime.now().date()
-        start_date = end_date - timedelta(days=7)
-        
-        # Query transactions for the past week
-        if user_transactions is None:
-            transactions = Transaction.objects.filter(
-                date__gte=start_date,
-                date__lte=end_date
-            )
-        else:
-            transactions = user_transactions
-        
-        # Calculate totals by type
-        expense_total = abs(transactions.filter(
-            transaction_type='expense'
-        ).aggregate(total=Sum('amount'))['total'] or 0)
+    def _analyze_weekly_spending(self, user_transactions=None, summary: TransactionSummary = None) -> Dict[str, Any]:
+        """Analyze spending patterns of the current ISO week (Monday to Sunday)"""
         
-        saving_total = transactions.filter(
-            transaction_type='saving'
-        ).aggregate(total=Sum('amount'))['total'] or 0
+        start_date, end_date = self._current_week()
         
-        investment_total = transactions.filter(
-            transaction_type='investment'
-        ).aggregate(total=Sum('amount'))['total'] or 0
+        # Totals by type and expense category in one grouped query
+        if user_transactions is not None:
+            summary = TransactionSummaryService.summarize_queryset(user_transactions)
+        elif summary is None:
+            summary = TransactionSummaryService.summarize(self.user, start_date, end_date)  # CRITICAL: Filter by user
+        expense_total = summary.expense_total
+        saving_total = summary.saving_total
+        investment_total = summary.investment_total
         
         # Calculate category breakdowns for expenses
         category_totals = {}
-        expense_transactions = transactions.filter(transaction_type='expense')
-        
-        for transaction in expense_transactions:
-            category = transaction.expense_category or 'other'
-            if category not in category_totals:
-                category_totals[category] = 0
-            category_totals[category] += abs(transaction.amount)
+        for category, total in summary.category_totals.items():
+            category = category or 'other'
+            category_totals[category] = category_totals.get(category, 0) + total
         
         # Find dominant category
         dominant_category = max(category_totals.items(), key=lambda x: x[1]) if category_totals else ('other', 0)
         
         # Calculate transaction frequency
-        transaction_count = transactions.count()
+        transaction_count = summary.transaction_count
         
         return {
             'expense_total': expense_total,
@@ -571,9 +567,14 @@ class MemeGenerator:
         return personality_labels.get(personality, personality_labels['balanced_spender'])
 
     def get_spending_analysis(self) -> Dict[str, Any]:
-        """Get detailed spending analysis for the week"""
+        """Get detailed spending analysis for the week (from the week's snapshot)"""
+        
+        from .snapshot_service import WeeklyMemeSnapshotService
+        return WeeklyMemeSnapshotService.get_snapshot(self.user, self.language).analysis
+
+    def _build_spending_analysis(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Personality and insights for a weekly analysis"""
         
-        analysis = self._analyze_weekly_spending()
         personality = self._determine_personality(analysis)
         
         return {
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.2 on 2026-10-17 07:57
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_chat', '0003_alter_chatmessage_user'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeeklyMemeSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('iso_year', models.IntegerField(verbose_name='ISO Year')),
+                ('iso_week', models.IntegerField(verbose_name='ISO Week')),
+                ('language', models.CharField(default='vi', max_length=10, verbose_name='Language')),
+                ('meme', models.JSONField(verbose_name='Meme')),
+                ('analysis', models.JSONField(verbose_name='Analysis')),
+                ('is_stale', models.BooleanField(default=False, verbose_name='Is Stale')),
+                ('computed_at', models.DateTimeField(auto_now=True, verbose_name='Computed At')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='weekly_meme_snapshots', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Weekly Meme Snapshot',
+                'verbose_name_plural': 'Weekly Meme Snapshots',
+                'ordering': ['-iso_year', '-iso_week'],
+                'unique_together': {('user', 'iso_year', 'iso_week', 'language')},
+            },
+        ),
+    ]
@@ -74,4 +74,49 @@ class ChatMessage(models.Model):
     def __str__(self):
         voice_indicator = "🎤" if self.has_voice_input else "⌨️"
         confirm_indicator = "✅" if self.is_confirmed else "⏳"
-        return f"{voice_indicator} {confirm_indicator} {self.user_message[:50]}..." 
\ No newline at end of file
+        return f"{voice_indicator} {confirm_indicator} {self.user_message[:50]}..."
+
+
+class WeeklyMemeSnapshot(models.Model):
+    """
+    Precomputed weekly meme and spending analysis of a user for one ISO
+    week and language, so the meme endpoints are single-row reads.
+    Filled by manage.py precompute_weekly_memes and on demand.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='weekly_meme_snapshots',
+        verbose_name=_('User')
+    )
+    iso_year = models.IntegerField(verbose_name=_('ISO Year'))
+    iso_week = models.IntegerField(verbose_name=_('ISO Week'))
+    language = models.CharField(
+        max_length=10,
+        default='vi',
+        verbose_name=_('Language')
+    )
+    
+    # JSON-ready payloads as returned by the meme endpoints
+    meme = models.JSONField(verbose_name=_('Meme'))
+    analysis = models.JSONField(verbose_name=_('Analysis'))
+    
+    # Set when a transaction of the week changes; the next read recomputes
+    is_stale = models.BooleanField(
+        default=False,
+        verbose_name=_('Is Stale')
+    )
+    
+    computed_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_('Computed At')
+    )
+    
+    class Meta:
+        unique_together = ['user', 'iso_year', 'iso_week', 'language']
+        verbose_name = _('Weekly Meme Snapshot')
+        verbose_name_plural = _('Weekly Meme Snapshots')
+        ordering = ['-iso_year', '-iso_week']
+    
+    def __str__(self):
+        return f"{self.user.email} - {self.iso_year}-W{self.iso_week:02d} ({self.language})"
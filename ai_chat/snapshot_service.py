@@ -0,0 +1,192 @@
+"""
+Weekly Meme Snapshots
+Precomputed weekly meme and spending analysis per user, ISO week and
+language. The meme endpoints read one WeeklyMemeSnapshot row; a missing
+or stale row is rebuilt on read. manage.py precompute_weekly_memes fills
+the table for all active users in chunks, with one grouped query per chunk.
+"""
+import json
+import logging
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Iterable, List, Tuple
+
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from rest_framework.utils.encoders import JSONEncoder
+
+from transactions.models import Transaction
+from transactions.summary_service import TransactionSummary, TransactionSummaryService
+from .meme_generator import MemeGenerator
+from .models import WeeklyMemeSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+def _json_ready(data: Any) -> Any:
+    """Same JSON types as a rendered API response (Decimal as number, dates as ISO strings)"""
+    return json.loads(json.dumps(data, cls=JSONEncoder))
+
+
+class WeeklyMemeSnapshotService:
+    """
+    Read, rebuild and invalidate WeeklyMemeSnapshot rows.
+    """
+
+    @staticmethod
+    def week_of(day: date) -> Tuple[int, int]:
+        """(ISO year, ISO week) of a date"""
+        iso_year, iso_week, _weekday = day.isocalendar()
+        return iso_year, iso_week
+
+    @staticmethod
+    def get_snapshot(user, language: str) -> WeeklyMemeSnapshot:
+        """
+        Get the user's snapshot of the current ISO week, rebuilding it when
+        missing or stale.
+
+        Args:
+            user: User instance
+            language (str): Language of the meme texts and insights
+
+        Returns:
+            WeeklyMemeSnapshot: Fresh snapshot
+        """
+        iso_year, iso_week = WeeklyMemeSnapshotService.week_of(date.today())
+        snapshot = WeeklyMemeSnapshot.objects.filter(
+            user=user,  # CRITICAL: Filter by user
+            iso_year=iso_year,
+            iso_week=iso_week,
+            language=language,
+        ).first()
+
+        if snapshot is None or snapshot.is_stale:
+            snapshot = WeeklyMemeSnapshotService.refresh(user, language)
+        return snapshot
+
+    @staticmethod
+    def refresh(user, language: str) -> WeeklyMemeSnapshot:
+        """
+        Recompute and store the user's snapshot of the current ISO week.
+
+        Args:
+            user: User instance
+            language (str): Language of the meme texts and insights
+
+        Returns:
+            WeeklyMemeSnapshot: Stored snapshot
+        """
+        iso_year, iso_week = WeeklyMemeSnapshotService.week_of(date.today())
+        meme, analysis = MemeGenerator(user, language=language).build_weekly_payloads()
+        snapshot, _created = WeeklyMemeSnapshot.objects.update_or_create(
+            user=user,
+            iso_year=iso_year,
+            iso_week=iso_week,
+            language=language,
+            defaults={
+                'meme': _json_ready(meme),
+                'analysis': _json_ready(analysis),
+                'is_stale': False,
+            },
+        )
+        return snapshot
+
+    @staticmethod
+    def active_user_ids(days: int = 30) -> List[int]:
+        """
+        IDs of active users with a transaction in the last `days` days.
+
+        Args:
+            days (int): Look-back window
+
+        Returns:
+            list: User IDs in ascending order
+        """
+        since = date.today() - timedelta(days=days)
+        return list(
+            get_user_model().objects.filter(is_active=True, transactions__date__gte=since)
+            .order_by('id').values_list('id', flat=True).distinct()
+        )
+
+    @staticmethod
+    def precompute(user_ids: Iterable[int], languages: Iterable[str]) -> int:
+        """
+        Compute and upsert the current week's snapshots of a chunk of users.
+
+        The week's totals of the whole chunk come from one grouped query;
+        all snapshots are written with one INSERT ... ON CONFLICT UPDATE.
+
+        Args:
+            user_ids: IDs of the users in the chunk
+            languages: Languages to build a snapshot for
+
+        Returns:
+            int: Number of snapshots written
+        """
+        users = get_user_model().objects.in_bulk(list(user_ids))
+        if not users:
+            return 0
+
+        start_date, end_date = MemeGenerator._current_week()
+        rows = Transaction.objects.filter(
+            user_id__in=list(users), date__gte=start_date, date__lte=end_date
+        ).order_by().values('user_id', 'expense_category').annotate(
+            **TransactionSummaryService.aggregates()
+        )
+
+        summaries = defaultdict(TransactionSummary)
+        for row in rows:
+            summaries[row['user_id']].add_row(row)
+
+        iso_year, iso_week = WeeklyMemeSnapshotService.week_of(start_date)
+        snapshots = []
+        for user_id, user in users.items():
+            for language in languages:
+                meme, analysis = MemeGenerator(user, language=language).build_weekly_payloads(
+                    summary=summaries[user_id]
+                )
+                snapshots.append(WeeklyMemeSnapshot(
+                    user=user,
+                    iso_year=iso_year,
+                    iso_week=iso_week,
+                    language=language,
+                    meme=_json_ready(meme),
+                    analysis=_json_ready(analysis),
+                    is_stale=False,
+                ))
+
+        WeeklyMemeSnapshot.objects.bulk_create(
+            snapshots,
+            update_conflicts=True,
+            unique_fields=['user', 'iso_year', 'iso_week', 'language'],
+            update_fields=['meme', 'analysis', 'is_stale', 'computed_at'],
+        )
+        return len(snapshots)
+
+    @staticmethod
+    def mark_weeks_stale(user_id: int, dates: Iterable[date]) -> int:
+        """
+        Flag the snapshots of the weeks containing the given dates for
+        recomputation on next read.
+
+        Args:
+            user_id (int): User ID
+            dates: Changed transaction dates
+
+        Returns:
+            int: Number of rows marked stale
+        """
+        condition = Q()
+        for iso_year, iso_week in {WeeklyMemeSnapshotService.week_of(day) for day in dates}:
+            condition |= Q(iso_year=iso_year, iso_week=iso_week)
+
+        if not condition:
+            return 0
+        return WeeklyMemeSnapshot.objects.filter(
+            condition, user_id=user_id, is_stale=False
+        ).update(is_stale=True)
+
+
+def mark_snapshots_stale(sender, user_id, dates, **kwargs):
+    """transactions_changed receiver"""
+    WeeklyMemeSnapshotService.mark_weeks_stale(user_id, dates)
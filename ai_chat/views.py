@@ -23,6 +23,7 @@ from .serializers import (
 from .voice_processor import VoiceProcessor
 from transactions.models import Transaction
 from transactions.monthly_service import update_monthly_totals_on_transaction_change
+from transactions.data_version import conditional_on_data_version
 
 
 def placeholder_view(request):
@@ -386,57 +387,20 @@ def _generate_response_text(ai_result, language):
 @api_view(['GET'])
 @authentication_classes([SessionAuthentication, TokenAuthentication])
 @permission_classes([IsAuthenticated])
+@conditional_on_data_version
 def get_calendar_data(request, year, month):
-    """Get calendar data for specific month with transaction summaries (user-specific)"""
+    """
+    Get calendar data for specific month with transaction summaries (user-specific)
+    Query params: include_transactions (true|false, default true)
+    """
     try:
-        from transactions.models import Transaction
-        from datetime import date, timedelta
+        from transactions.calendar_service import CalendarService, render_daily_data
         import calendar
         
-        # Get all transactions for the month filtered by current user
-        transactions = Transaction.objects.filter(
-            user=request.user,  # CRITICAL FIX: Filter by user
-            date__year=year,
-            date__month=month
-        ).select_related().order_by('date')
-        
-        # Group transactions by date
-        daily_data = {}
-        for transaction in transactions:
-            date_str = transaction.date.isoformat()
-            if date_str not in daily_data:
-                daily_data[date_str] = {
-                    'transactions': [],
-                    'totals': {'expense': 0, 'saving': 0, 'investment': 0, 'net': 0}
-                }
-            
-            # Add transaction data
-            transaction_data = {
-                'id': transaction.id,
-                'transaction_type': transaction.transaction_type,  # Changed from 'type' to 'transaction_type'
-                'amount': float(transaction.amount),
-                'description': transaction.description,
-                'expense_category': transaction.expense_category if transaction.transaction_type == 'expense' else None,
-                'icon': transaction.get_icon(),
-                'confidence': transaction.ai_confidence
-            }
-            daily_data[date_str]['transactions'].append(transaction_data)
-            
-            # Update daily totals
-            if transaction.transaction_type == 'expense':
-                daily_data[date_str]['totals']['expense'] += float(transaction.amount)
-            elif transaction.transaction_type == 'saving':
-                daily_data[date_str]['totals']['saving'] += float(transaction.amount)
-            elif transaction.transaction_type == 'investment':
-                daily_data[date_str]['totals']['investment'] += float(transaction.amount)
+        include_transactions = request.GET.get('include_transactions', 'true').lower() not in ('0', 'false', 'no')
         
-        # Calculate net totals for each day
-        for date_str in daily_data:
-            totals = daily_data[date_str]['totals']
-            # Hiển thị chi tiêu là âm, nhưng net total là tổng của tất cả
-            expense_display = -abs(totals['expense']) if totals['expense'] != 0 else 0
-            totals['expense'] = expense_display
-            totals['net'] = abs(totals['expense']) + totals['saving'] + totals['investment']
+        # Same cached month view as /api/calendar-data/
+        view = CalendarService.get_month_view(request.user, year, month, include_transactions=include_transactions)
         
         # Get month info
         month_name = calendar.month_name[month]
@@ -449,8 +413,11 @@ def get_calendar_data(request, year, month):
             'month_name': month_name,
             'days_in_month': days_in_month,
             'first_day_weekday': first_day_weekday,
-            'daily_data': daily_data,
-            'total_transactions': transactions.count()
+            'daily_data': render_daily_data(view),
+            'total_transactions': sum(
+                day['expense_count'] + day['saving_count'] + day['investment_count']
+                for day in view['days']
+            )
         })
         
     except Exception as e:
@@ -460,6 +427,7 @@ def get_calendar_data(request, year, month):
 @api_view(['GET'])
 @authentication_classes([SessionAuthentication, TokenAuthentication])
 @permission_classes([IsAuthenticated])
+@conditional_on_data_version
 def get_daily_summary(request, date):
     """Get detailed summary for a specific date (user-specific)"""
     try:
@@ -665,7 +633,7 @@ def generate_weekly_meme(request):
         language = get_language() or 'vi'
         
         # Initialize meme generator
-        meme_gen = MemeGenerator(language=language)
+        meme_gen = MemeGenerator(request.user, language=language)
         
         # Generate meme data
         meme_data = meme_gen.generate_weekly_meme()
@@ -694,7 +662,7 @@ def get_meme_analysis(request):
         language = get_language() or 'vi'
         
         # Initialize meme generator
-        meme_gen = MemeGenerator(language=language)
+        meme_gen = MemeGenerator(request.user, language=language)
         
         # Get analysis data
         analysis_data = meme_gen.get_spending_analysis()
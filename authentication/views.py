@@ -372,61 +372,43 @@ class DemoLoginView(View):
     def create_sample_transactions(self, user):
         """Create sample transactions for demo user"""
         from transactions.models import Transaction
+        from transactions.sample_data import SAMPLE_EXPENSES, SAMPLE_INVESTMENTS, SAMPLE_SAVINGS
         from datetime import date, timedelta
         import random
         
-        # Sample data for demo
-        sample_expenses = [
-            {'amount': 45000, 'description': _('Coffee and breakfast'), 'category': 'coffee'},
-            {'amount': 120000, 'description': _('Lunch at restaurant'), 'category': 'food'},
-            {'amount': 25000, 'description': _('Bus fare'), 'category': 'transport'},
-            {'amount': 300000, 'description': _('Groceries'), 'category': 'shopping'},
-            {'amount': 150000, 'description': _('Movie tickets'), 'category': 'entertainment'},
-        ]
-        
-        sample_savings = [
-            {'amount': 500000, 'description': _('Monthly savings')},
-            {'amount': 200000, 'description': _('Emergency fund')},
-        ]
-        
-        sample_investments = [
-            {'amount': 1000000, 'description': _('Stock investment')},
-            {'amount': 300000, 'description': _('Gold purchase')},
-        ]
-        
         base_date = date.today()
         
         try:
             # Create sample expenses
-            for i, expense in enumerate(sample_expenses):
+            for i, expense in enumerate(SAMPLE_EXPENSES):
                 Transaction.objects.create(
                     user=user,
                     transaction_type='expense',
                     amount=-abs(expense['amount']),  # Negative for expenses
-                    description=expense['description'],
+                    description=str(expense['description']),
                     expense_category=expense['category'],
                     date=base_date - timedelta(days=random.randint(0, 30)),
                     ai_confidence=0.9
                 )
             
             # Create sample savings
-            for i, saving in enumerate(sample_savings):
+            for i, saving in enumerate(SAMPLE_SAVINGS):
                 Transaction.objects.create(
                     user=user,
                     transaction_type='saving',
                     amount=saving['amount'],
-                    description=saving['description'],
+                    description=str(saving['description']),
                     date=base_date - timedelta(days=random.randint(0, 15)),
                     ai_confidence=0.9
                 )
             
             # Create sample investments
-            for i, investment in enumerate(sample_investments):
+            for i, investment in enumerate(SAMPLE_INVESTMENTS):
                 Transaction.objects.create(
                     user=user,
                     transaction_type='investment',
                     amount=investment['amount'],
-                    description=investment['description'],
+                    description=str(investment['description']),
                     date=base_date - timedelta(days=random.randint(0, 20)),
                     ai_confidence=0.9
                 )
@@ -1,6 +1,18 @@
 """
 Custom middleware for Railway deployment
 """
+import cProfile
+import logging
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .profiling import PhaseTimer, SamplingProfiler, get_profile_mode, save_artifact
+from .query_budget import QueryRecorder
+
+logger = logging.getLogger(__name__)
+
 
 class HealthCheckMiddleware:
     """Middleware to handle health check requests without SSL redirect"""
@@ -32,4 +44,98 @@ class RailwayMiddleware:
                 request.is_railway_health_check = True
         
         response = self.get_response(request)
-        return response 
\ No newline at end of file
+        return response
+
+
+class QueryBudgetMiddleware:
+    """
+    Record query count, database time and duplicate SQL of every request.
+
+    Adds a Server-Timing header (visible in the browser devtools), logs the
+    repeated statements at DEBUG level and warns when a request goes over
+    its budget (settings.QUERY_BUDGETS by URL name, else
+    settings.QUERY_BUDGET_DEFAULT). Enabled by settings.QUERY_BUDGET_ENABLED.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_BUDGET_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.default_budget = getattr(settings, 'QUERY_BUDGET_DEFAULT', 50)
+        self.budgets = getattr(settings, 'QUERY_BUDGETS', {})
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - start) * 1000
+
+        server_timing = f'{recorder.server_timing()}, total;dur={total_ms:.1f}'
+        if response.has_header('Server-Timing'):
+            server_timing = f"{response['Server-Timing']}, {server_timing}"
+        response['Server-Timing'] = server_timing
+
+        url_name = request.resolver_match.url_name if request.resolver_match else None
+        budget = self.budgets.get(url_name, self.default_budget)
+        if recorder.count > budget:
+            logger.warning(
+                f"⚠️ Query budget exceeded on {request.method} {request.path} "
+                f"({url_name}): {recorder.count} > {budget}\n{recorder.report()}"
+            )
+        elif recorder.duplicate_count:
+            logger.debug(f"🔁 {request.method} {request.path}: {recorder.report()}")
+
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Profile single requests of staff users on demand (?_profile=sample|cprofile
+    or an X-Profile header), see expense_tracker/profiling.py.
+
+    The artifact name is returned in X-Profile-Artifact and the per-phase
+    timers (Gemini, Gmail, parsing, totals, ORM) in Server-Timing. Must run
+    after AuthenticationMiddleware. Enabled by settings.PROFILING_ENABLED.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_interval = getattr(settings, 'PROFILING_SAMPLE_INTERVAL', 0.005)
+
+    def __call__(self, request):
+        mode = get_profile_mode(request)
+        if mode is None:
+            return self.get_response(request)
+
+        with PhaseTimer() as phases, QueryRecorder() as recorder:
+            if mode == 'sample':
+                profiler = SamplingProfiler(self.sample_interval)
+                profiler.start()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    profiler.stop()
+                content = profiler.collapsed()
+            else:
+                content = cProfile.Profile()
+                content.enable()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    content.disable()
+
+        try:
+            artifact = save_artifact(request, mode, content)
+            response['X-Profile-Artifact'] = artifact
+            logger.info(f"🔬 Profiled {request.method} {request.path} ({mode}): {artifact}")
+        except OSError as e:
+            logger.error(f"❌ Failed to store profile: {str(e)}")
+
+        server_timing = phases.server_timing()
+        server_timing.append(f'orm;dur={recorder.duration_ms:.1f};desc="{recorder.count} queries"')
+        if response.has_header('Server-Timing'):
+            server_timing.insert(0, response['Server-Timing'])
+        response['Server-Timing'] = ', '.join(server_timing)
+        return response
@@ -0,0 +1,234 @@
+"""
+Request Profiling
+Opt-in profiling of single requests for staff users: add ?_profile=sample
+(or cprofile) or the header "X-Profile: sample" to any request.
+
+- sample: a sampling profiler thread records the request thread's stack
+  every PROFILING_SAMPLE_INTERVAL seconds and stores collapsed stacks
+  ("a;b;c 12" per line), ready for flamegraph.pl or speedscope.
+- cprofile: deterministic cProfile, stored as a pstats file (snakeviz).
+
+Classes decorated with @phase_timer('name') report their inclusive time
+per request as Server-Timing entries, which splits a profile into Gemini,
+Gmail, parsing and totals work. Artifacts are listed and downloaded via
+/api/profiles/ (staff only).
+"""
+import cProfile
+import inspect
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from functools import wraps
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.http import FileResponse, JsonResponse
+from django.utils import timezone
+
+
+PROFILE_MODES = ('sample', 'cprofile')
+PROFILE_QUERY_PARAM = '_profile'
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+ARTIFACT_NAME = re.compile(r'^[\w.-]+\.(collapsed|prof)$')
+
+_current_phases: ContextVar[Optional['PhaseTimer']] = ContextVar('profiling_phases', default=None)
+
+
+class PhaseTimer:
+    """Inclusive time and call count per phase during one profiled request"""
+
+    def __init__(self):
+        self.totals: Dict[str, List[float]] = {}  # name -> [seconds, calls]
+        self.active = set()
+
+    def __enter__(self):
+        self._token = _current_phases.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _current_phases.reset(self._token)
+
+    def server_timing(self) -> List[str]:
+        return [
+            f'{name};dur={seconds * 1000:.1f};desc="{calls} calls"'
+            for name, (seconds, calls) in sorted(self.totals.items())
+        ]
+
+
+def _timed(func, name):
+    if inspect.isgeneratorfunction(func):
+        return _timed_generator(func, name)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        timer = _current_phases.get()
+        # Not profiling, or an outer call of the same phase is already timed
+        if timer is None or name in timer.active:
+            return func(*args, **kwargs)
+
+        timer.active.add(name)
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timer.active.discard(name)
+            entry = timer.totals.setdefault(name, [0.0, 0])
+            entry[0] += time.perf_counter() - started
+            entry[1] += 1
+    return wrapper
+
+
+def _timed_generator(func, name):
+    """Time a generator's work per resume, not the caller's time between items"""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        generator = func(*args, **kwargs)
+        timed_next = _timed(lambda: next(generator), name)
+        while True:
+            try:
+                item = timed_next()
+            except StopIteration:
+                return
+            yield item
+    return wrapper
+
+
+def phase_timer(name: str):
+    """
+    Class decorator timing every public method (and __init__) of a class
+    as one phase of profiled requests. Costs a context variable lookup per
+    call otherwise.
+
+    Args:
+        name (str): Phase name shown in Server-Timing
+    """
+    def decorate(cls):
+        for attribute, value in list(vars(cls).items()):
+            if attribute.startswith('_') and attribute != '__init__':
+                continue
+            if isinstance(value, staticmethod):
+                setattr(cls, attribute, staticmethod(_timed(value.__func__, name)))
+            elif isinstance(value, classmethod):
+                setattr(cls, attribute, classmethod(_timed(value.__func__, name)))
+            elif inspect.isfunction(value):
+                setattr(cls, attribute, _timed(value, name))
+        return cls
+    return decorate
+
+
+class SamplingProfiler:
+    """Samples the stack of one thread from a background thread"""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples = Counter()
+        self._thread_id = None
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def start(self):
+        self._thread_id = threading.get_ident()
+        self._sampler = threading.Thread(target=self._run, name='request-sampler', daemon=True)
+        self._sampler.start()
+
+    def stop(self):
+        self._stop.set()
+        self._sampler.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        """Collapsed stacks, one "frame;frame;frame count" line per stack"""
+        return ''.join(f'{stack} {count}\n' for stack, count in self.samples.most_common())
+
+
+def get_profile_mode(request) -> Optional[str]:
+    """Profiling mode requested by a staff user, or None"""
+    requested = request.GET.get(PROFILE_QUERY_PARAM) or request.META.get(PROFILE_HEADER)
+    if not requested:
+        return None
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_staff:
+        return None
+    return requested if requested in PROFILE_MODES else 'sample'
+
+
+def _profiles_dir() -> Path:
+    return Path(getattr(settings, 'PROFILING_DIR', Path(settings.BASE_DIR) / 'profiles'))
+
+
+def save_artifact(request, mode: str, content) -> str:
+    """
+    Store a profile and keep only the newest PROFILING_MAX_ARTIFACTS.
+
+    Args:
+        request: Profiled request
+        mode (str): sample|cprofile
+        content: Collapsed stacks (str) or a cProfile.Profile
+
+    Returns:
+        str: Artifact file name
+    """
+    directory = _profiles_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+
+    slug = re.sub(r'[^\w]+', '-', request.path).strip('-') or 'root'
+    extension = 'collapsed' if mode == 'sample' else 'prof'
+    name = f"{timezone.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}-{request.method.lower()}-{slug[:60]}.{extension}"
+    path = directory / name
+
+    if isinstance(content, cProfile.Profile):
+        content.dump_stats(str(path))
+    else:
+        path.write_text(content)
+
+    artifacts = sorted(directory.iterdir(), key=lambda item: item.stat().st_mtime, reverse=True)
+    for old in artifacts[getattr(settings, 'PROFILING_MAX_ARTIFACTS', 50):]:
+        old.unlink(missing_ok=True)
+
+    return name
+
+
+# =============================================================================
+# STAFF ENDPOINTS
+# =============================================================================
+
+def profile_list(request):
+    """List stored profiles (staff only)"""
+    if not request.user.is_staff:
+        return JsonResponse({'error': 'Staff only'}, status=403)
+
+    directory = _profiles_dir()
+    artifacts = sorted(directory.iterdir(), key=lambda item: item.stat().st_mtime, reverse=True) if directory.exists() else []
+    return JsonResponse({
+        'profiles': [
+            {'name': artifact.name, 'size': artifact.stat().st_size}
+            for artifact in artifacts if ARTIFACT_NAME.match(artifact.name)
+        ]
+    })
+
+
+def profile_download(request, name):
+    """Download a stored profile (staff only)"""
+    if not request.user.is_staff:
+        return JsonResponse({'error': 'Staff only'}, status=403)
+
+    path = _profiles_dir() / name
+    if not ARTIFACT_NAME.match(name) or not path.is_file():
+        return JsonResponse({'error': 'Profile not found'}, status=404)
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=name)
@@ -0,0 +1,144 @@
+"""
+Query Budget Instrumentation
+Records the SQL run by a request (or a block of test code): query count,
+total database time and statements repeated with different parameters,
+the usual signature of an N+1 loop.
+
+Used by QueryBudgetMiddleware (Server-Timing header + debug log) and by
+assertQueryBudget() to pin the query budget of an endpoint in tests:
+
+    @assertQueryBudget(4)
+    def test_monthly_totals(self):
+        self.client.get('/api/monthly-totals/')
+"""
+import re
+import time
+from collections import Counter
+from contextlib import ContextDecorator
+from typing import List, Optional, Tuple
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+_WHITESPACE = re.compile(r'\s+')
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+
+
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace and IN (...) lists so equivalent statements compare equal"""
+    return _IN_LIST.sub('IN (...)', _WHITESPACE.sub(' ', sql).strip())
+
+
+class QueryRecorder:
+    """
+    Connection execute wrapper collecting every statement with its duration.
+
+    Use as a context manager; queries are recorded on the given database
+    alias of the current thread only.
+    """
+
+    def __init__(self, using: str = DEFAULT_DB_ALIAS):
+        self.using = using
+        self.queries: List[Tuple[str, float]] = []  # (normalized sql, seconds)
+        self._wrapper_context = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((normalize_sql(sql), time.perf_counter() - start))
+
+    def __enter__(self):
+        self._wrapper_context = connections[self.using].execute_wrapper(self)
+        self._wrapper_context.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._wrapper_context.__exit__(exc_type, exc_value, traceback)
+        self._wrapper_context = None
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def duration_ms(self) -> float:
+        return sum(duration for _, duration in self.queries) * 1000
+
+    def duplicates(self) -> List[Tuple[str, int]]:
+        """
+        Statements run more than once.
+
+        Returns:
+            list: (normalized sql, times run), most repeated first
+        """
+        counts = Counter(sql for sql, _ in self.queries)
+        return [(sql, times) for sql, times in counts.most_common() if times > 1]
+
+    @property
+    def duplicate_count(self) -> int:
+        """Number of avoidable queries (repeats beyond the first run)"""
+        return sum(times - 1 for _, times in self.duplicates())
+
+    def server_timing(self) -> str:
+        """Server-Timing header entry for the recorded queries"""
+        return (
+            f'db;dur={self.duration_ms:.1f};'
+            f'desc="{self.count} queries, {self.duplicate_count} duplicate"'
+        )
+
+    def report(self, limit: int = 5) -> str:
+        """Human readable summary with the most repeated statements"""
+        lines = [f'{self.count} queries in {self.duration_ms:.1f}ms, {self.duplicate_count} duplicate']
+        for sql, times in self.duplicates()[:limit]:
+            lines.append(f'  {times}x {sql[:300]}')
+        return '\n'.join(lines)
+
+
+class QueryBudget(ContextDecorator):
+    """Context manager/decorator failing when a block exceeds its query budget"""
+
+    def __init__(self, max_queries: int, max_duplicates: Optional[int] = None,
+                 using: str = DEFAULT_DB_ALIAS):
+        self.max_queries = max_queries
+        self.max_duplicates = max_duplicates
+        self.using = using
+        self.recorder = None
+
+    def __enter__(self):
+        self.recorder = QueryRecorder(self.using).__enter__()
+        return self.recorder
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.recorder.__exit__(exc_type, exc_value, traceback)
+        if exc_type is not None:
+            return False
+
+        if self.recorder.count > self.max_queries:
+            raise AssertionError(
+                f'Query budget exceeded: {self.recorder.count} > {self.max_queries}\n'
+                f'{self.recorder.report()}'
+            )
+        if self.max_duplicates is not None and self.recorder.duplicate_count > self.max_duplicates:
+            raise AssertionError(
+                f'Duplicate query budget exceeded: {self.recorder.duplicate_count} > {self.max_duplicates}\n'
+                f'{self.recorder.report()}'
+            )
+        return False
+
+
+def assertQueryBudget(max_queries: int, max_duplicates: Optional[int] = None,
+                      using: str = DEFAULT_DB_ALIAS) -> QueryBudget:
+    """
+    Pin the query budget of a test (decorator) or a block (context manager).
+
+    Args:
+        max_queries (int): Maximum number of queries
+        max_duplicates (int): Maximum number of repeated statements (None = unchecked)
+        using (str): Database alias
+
+    Returns:
+        QueryBudget: Decorator/context manager yielding the QueryRecorder
+    """
+    return QueryBudget(max_queries, max_duplicates, using)
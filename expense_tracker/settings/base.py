@@ -43,6 +43,7 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'expense_tracker.middleware.QueryBudgetMiddleware',  # Server-Timing + N+1 log (QUERY_BUDGET_ENABLED)
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',  # i18n support
@@ -50,6 +51,7 @@ MIDDLEWARE = [
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'authentication.middleware.AuthenticationMiddleware',  # Custom auth middleware
+    'expense_tracker.middleware.ProfilingMiddleware',  # Staff-only ?_profile=sample|cprofile
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -184,6 +186,16 @@ GOOGLE_CLIENT_ID = GOOGLE_OAUTH2_CLIENT_ID
 GOOGLE_CLIENT_SECRET = GOOGLE_OAUTH2_CLIENT_SECRET 
 SITE_URL = config('SITE_URL', default='http://localhost:8000') 
 
+# Gmail API fetching (see transactions/gmail_fetch.py)
+GMAIL_API_ENDPOINT = config('GMAIL_API_ENDPOINT', default=None)  # e.g. a local stub server in tests
+GMAIL_BATCH_SIZE = 50  # messages.get calls per batch request (max 100)
+GMAIL_QUOTA_UNITS_PER_SECOND = 250  # Per-user Gmail quota
+GMAIL_HISTORY_MAX_MESSAGES = 200  # Incremental syncs above this many new messages use the sender search
+EMAIL_TEXT_MAX_BYTES = 8 * 1024  # Email text handed to the AI parser (see transactions/email_text.py)
+
+# Server-Sent Events: open streams per process, each holds a gunicorn thread (see transactions/events.py)
+EVENT_STREAM_MAX_CONNECTIONS = config('EVENT_STREAM_MAX_CONNECTIONS', default=4, cast=int)
+
 # Session Configuration
 # Session only lasts while browser is open (not persistent)
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
@@ -196,4 +208,23 @@ SESSION_COOKIE_SAMESITE = 'Lax'  # CSRF protection
 SESSION_COOKIE_SECURE = config('SESSION_COOKIE_SECURE', default=False, cast=bool)  # HTTPS only in production
 
 # Clear expired sessions more frequently
-SESSION_ENGINE = 'django.contrib.sessions.backends.db' 
\ No newline at end of file
+SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+
+# Per-request query instrumentation (see expense_tracker/query_budget.py)
+QUERY_BUDGET_ENABLED = config('QUERY_BUDGET_ENABLED', default=DEBUG, cast=bool)
+QUERY_BUDGET_DEFAULT = 50  # Queries per request before a warning is logged
+QUERY_BUDGETS = {
+    # URL name -> max queries (a cold month includes its rollup rebuild)
+    'calendar-data': 15,
+    'monthly-totals': 15,
+    'monthly-breakdown': 15,
+    'today-summary': 15,
+    'bank-sync-history': 15,
+    'bank_config_list': 15,
+}
+
+# On-demand request profiling for staff (see expense_tracker/profiling.py)
+PROFILING_ENABLED = config('PROFILING_ENABLED', default=True, cast=bool)
+PROFILING_DIR = config('PROFILING_DIR', default=str(BASE_DIR / 'profiles'))
+PROFILING_SAMPLE_INTERVAL = 0.005  # Seconds between stack samples
+PROFILING_MAX_ARTIFACTS = 50
@@ -63,6 +63,11 @@ LOGGING = {
             'level': 'DEBUG',
             'propagate': True,
         },
+        'expense_tracker': {
+            'handlers': ['console'],
+            'level': 'DEBUG',  # Duplicate query reports of QueryBudgetMiddleware
+            'propagate': True,
+        },
         'django': {
             'handlers': ['console'],
             'level': 'INFO',
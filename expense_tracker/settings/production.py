@@ -140,6 +140,14 @@ else:
         }
     }
 
+# Realtime dashboard events: fan out across gunicorn workers through Redis
+if CACHE_URL:
+    EVENTS_BROKER = 'transactions.events.RedisEventBroker'
+    EVENTS_REDIS_URL = CACHE_URL
+
+# Query instrumentation is opt-in in production (Server-Timing exposes DB timings)
+QUERY_BUDGET_ENABLED = config('QUERY_BUDGET_ENABLED', default=False, cast=bool)
+
 # Performance optimizations for multi-user
 CONN_MAX_AGE = 60  # Keep database connections alive for 60 seconds
 
@@ -7,6 +7,7 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.conf.urls.i18n import i18n_patterns
 from .health import health_check
+from .profiling import profile_download, profile_list
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.generic import TemplateView
@@ -41,6 +42,10 @@ urlpatterns += [
     # Authentication endpoints
     path('auth/', include('authentication.urls')),
     
+    # Stored request profiles (staff only)
+    path('api/profiles/', profile_list, name='profile_list'),
+    path('api/profiles/<str:name>/', profile_download, name='profile_download'),
+    
     # API endpoints (outside i18n patterns)
     path('api/', include('transactions.api_urls')),
     path('api/chat/', include('ai_chat.urls')),  # Main AI chat endpoints
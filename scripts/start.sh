@@ -24,10 +24,14 @@ print('✅ MonthlyTotalService ready')
 " || echo "⚠️ Service test failed - continuing anyway"
 
 # Build script handles migrations, so start the server
+# Each dashboard event stream holds a thread; EVENT_STREAM_MAX_CONNECTIONS (default 4)
+# caps them per worker so most of the 16 threads stay free for API requests
 echo "🌐 Starting gunicorn server..."
 uv run gunicorn expense_tracker.wsgi:application \
     --bind 0.0.0.0:${PORT:-8000} \
     --workers 2 \
+    --worker-class gthread \
+    --threads 16 \
     --timeout 120 \
     --access-logfile - \
     --error-logfile - \
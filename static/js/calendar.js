@@ -8,6 +8,7 @@ class ExpenseCalendar {
         this.currentYear = new Date().getFullYear();
         this.currentFilter = 'all';
         this.transactions = {};
+        this.dayDetails = {};  // Date -> daily summary, loaded when a day is opened
         this.isLoading = false;
         
         // Month names in Vietnamese and English
@@ -118,7 +119,8 @@ class ExpenseCalendar {
     }
     
     /**
-     * Load transactions for current month
+     * Load daily totals for current month
+     * The grid only needs totals; a day's transactions are loaded when it is opened
      */
     async loadTransactions() {
         if (this.isLoading) return;
@@ -138,11 +140,13 @@ class ExpenseCalendar {
         try {
             
             const response = await fetch(
-                `/api/chat/calendar/${this.currentYear}/${this.currentMonth + 1}/`,
+                `/api/chat/calendar/${this.currentYear}/${this.currentMonth + 1}/?include_transactions=false`,
                 {
                     method: 'GET',
                     headers: getCommonHeaders(),
-                    credentials: 'same-origin'
+                    credentials: 'same-origin',
+                    // Revalidate with If-None-Match; unchanged months come back as 304
+                    cache: 'no-cache'
                 }
             );
             
@@ -156,6 +160,7 @@ class ExpenseCalendar {
             
             const data = await response.json();
             this.transactions = this.processNewTransactionData(data.daily_data || {});
+            this.dayDetails = {};
 
         } catch (error) {
             console.error('❌ Error loading calendar transactions:', error);
@@ -207,11 +212,8 @@ class ExpenseCalendar {
             processed[dateKey] = {
                 transactions: dayData.transactions || [],
                 total: dayData.totals.net || 0,
-                counts: {
-                    expense: dayData.transactions.filter(t => t.type === 'expense').length,
-                    saving: dayData.transactions.filter(t => t.type === 'saving').length,
-                    investment: dayData.transactions.filter(t => t.type === 'investment').length
-                }
+                totals: dayData.totals,
+                counts: dayData.counts || { expense: 0, saving: 0, investment: 0 }
             };
         });
         
@@ -373,7 +375,7 @@ class ExpenseCalendar {
         
         // Get day data - use local date format to match database
         const dateKey = this.formatDateForDatabase(date);
-        const dayData = this.transactions[dateKey] || { transactions: [], total: 0, counts: {} };
+        const dayData = this.transactions[dateKey] || { transactions: [], total: 0, totals: {}, counts: {} };
         
         // Create day number
         const dayNumber = document.createElement('div');
@@ -384,38 +386,22 @@ class ExpenseCalendar {
         const eventsContainer = document.createElement('div');
         eventsContainer.className = 'day-events';
         
-        // Add transaction events
-        const filteredTransactions = this.filterTransactions(dayData.transactions);
-        filteredTransactions.slice(0, 3).forEach(transaction => { // Show max 3 events
-            const eventElement = this.createEventElement(transaction, date);
+        // Add one event per transaction type with transactions (filtered)
+        const shownTypes = this.filterTypes(dayData.counts);
+        shownTypes.forEach(type => {
+            const eventElement = this.createTypeTotalElement(type, dayData, date);
             eventsContainer.appendChild(eventElement);
         });
         
-        // Add "more" indicator if there are more than 3 transactions
-        if (filteredTransactions.length > 3) {
-            const moreElement = document.createElement('div');
-            moreElement.className = 'day-event more';
-            moreElement.textContent = `+${filteredTransactions.length - 3} more`;
-            moreElement.onclick = (e) => {
-                e.stopPropagation();
-                this.showDayDetails(date, dayData);
-            };
-            eventsContainer.appendChild(moreElement);
-        }
-        
-        // Create day total badge (only for filtered transactions)
-        if (filteredTransactions.length > 0) {
-            // Calculate total as sum of absolute values (total money moved in a day)
-            // Similar to "today total" and "net total" logic
-            const filteredTotal = filteredTransactions.reduce((sum, t) => {
-                const amount = Math.abs(t.amount); // Always use absolute value
-                return sum + amount;
-            }, 0);
-            
-            if (filteredTotal > 0) {
-                const totalBadge = this.createTotalBadge(filteredTotal);
-                dayDiv.appendChild(totalBadge);
-            }
+        // Create day total badge (only for filtered types)
+        // Total as sum of absolute values (total money moved in a day),
+        // similar to "today total" and "net total" logic
+        const filteredTotal = shownTypes.reduce(
+            (sum, type) => sum + Math.abs((dayData.totals || {})[type] || 0), 0
+        );
+        if (filteredTotal > 0) {
+            const totalBadge = this.createTotalBadge(filteredTotal);
+            dayDiv.appendChild(totalBadge);
         }
         
         // Assemble day element
@@ -429,37 +415,33 @@ class ExpenseCalendar {
     }
     
     /**
-     * Filter transactions based on current filter
+     * Transaction types of a day shown with the current filter
      */
-    filterTransactions(transactions) {
-        if (this.currentFilter === 'all') {
-            return transactions;
-        }
-        
-        const filtered = transactions.filter(t => t.transaction_type === this.currentFilter);
-        
-        return filtered;
+    filterTypes(counts) {
+        return ['expense', 'saving', 'investment'].filter(type =>
+            (counts[type] || 0) > 0 && (this.currentFilter === 'all' || this.currentFilter === type)
+        );
     }
     
     /**
-     * Create transaction event element
+     * Create the event element summarizing one transaction type of a day
      */
-    createEventElement(transaction, date) {
+    createTypeTotalElement(type, dayData, date) {
         const eventDiv = document.createElement('div');
-        eventDiv.className = `day-event ${transaction.transaction_type}`;
+        eventDiv.className = `day-event ${type}`;
         
-        // Get transaction icon
-        const icon = this.getTransactionIcon(transaction);
-        const amount = Math.abs(transaction.amount);
+        const icon = this.getTransactionIcon({ transaction_type: type });
+        const amount = Math.abs((dayData.totals || {})[type] || 0);
         const amountText = amount >= 1000000 ? `${(amount/1000000).toFixed(1)}M` : `${(amount/1000).toFixed(0)}k`;
+        const count = dayData.counts[type];
         
-        eventDiv.textContent = `${icon} ${amountText}`;
-        eventDiv.title = `${transaction.description} - ${this.formatMoney(transaction.amount)}`;
+        eventDiv.textContent = count > 1 ? `${icon} ${amountText} ×${count}` : `${icon} ${amountText}`;
+        eventDiv.title = this.formatMoney(amount);
         
-        // Add click handler
+        // Details (the day's transactions) load on click
         eventDiv.onclick = (e) => {
             e.stopPropagation();
-            this.showEventDetails(transaction, date);
+            this.onDayClick(date, dayData);
         };
         
         return eventDiv;
@@ -549,8 +531,8 @@ class ExpenseCalendar {
         // Update filter button states
         this.updateFilterButtons();
         
-        // Refresh calendar with new filter
-        this.refreshCalendar();
+        // Filtering uses the loaded daily totals, no refetch needed
+        this.render();
     }
     
     /**
@@ -581,11 +563,29 @@ class ExpenseCalendar {
     async onDayClick(date, dayData) {
         const dateStr = this.formatDateForDatabase(date);
         
+        // Days without transactions have nothing to load
+        const counts = (dayData && dayData.counts) || {};
+        if (!((counts.expense || 0) + (counts.saving || 0) + (counts.investment || 0))) {
+            this.showAddTransactionDialog(date);
+            return;
+        }
+        
+        // Loaded before since the month was last fetched
+        if (this.dayDetails[dateStr]) {
+            this.showDayDetails(date, this.dayDetails[dateStr]);
+            return;
+        }
+        
         try {
-            // Load detailed day data from API
-            const response = await fetch(`/api/chat/daily-summary/${dateStr}/`);
+            // Load the day's transactions from API
+            const response = await fetch(`/api/chat/daily-summary/${dateStr}/`, {
+                method: 'GET',
+                headers: getCommonHeaders(),
+                credentials: 'same-origin'
+            });
             if (response.ok) {
                 const detailedData = await response.json();
+                this.dayDetails[dateStr] = detailedData;
                 this.showDayDetails(date, detailedData);
             } else {
                 // Fallback to existing data or add transaction dialog
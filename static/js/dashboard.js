@@ -7,6 +7,7 @@ class Dashboard {
         this.elements = {};
         this.animationDuration = 300;
         this.updateInterval = null;
+        this.eventSource = null;
         this.currentTotals = {};
         this.init();
     }
@@ -104,7 +105,8 @@ class Dashboard {
      */
     async fetchMonthlyTotals() {
         try {
-            const response = await fetch('/api/monthly-totals/');
+            // Polled: revalidate with If-None-Match, unchanged data comes back as 304
+            const response = await fetch('/api/monthly-totals/', { cache: 'no-cache' });
             if (!response.ok) {
                 throw new Error(`HTTP ${response.status}: ${response.statusText}`);
             }
@@ -133,7 +135,7 @@ class Dashboard {
      */
     async fetchTodaySummary() {
         try {
-            const response = await fetch('/api/today-summary/');
+            const response = await fetch('/api/today-summary/', { cache: 'no-cache' });
             if (!response.ok) {
                 throw new Error(`HTTP ${response.status}: ${response.statusText}`);
             }
@@ -444,13 +446,87 @@ class Dashboard {
     
     /**
      * Setup auto-refresh for dashboard
+     * Server push (Server-Sent Events) when available, polling otherwise
      */
     setupAutoRefresh() {
-        // Refresh dashboard every 30 seconds
+        if (typeof EventSource === 'undefined') {
+            this.startPolling();
+            return;
+        }
+        
+        this.eventSource = new EventSource('/api/events/');
+        
+        this.eventSource.addEventListener('open', () => {
+            this.stopPolling();
+        });
+        
+        this.eventSource.addEventListener('totals', (event) => {
+            this.applyTotalsEvent(JSON.parse(event.data));
+        });
+        
+        // Changes were missed while reconnecting
+        this.eventSource.addEventListener('resync', () => {
+            this.loadDashboardData();
+        });
+        
+        // Server is at its stream limit; poll until the long retry delay reconnects
+        this.eventSource.addEventListener('busy', () => {
+            this.startPolling();
+        });
+        
+        this.eventSource.addEventListener('error', () => {
+            // EventSource reconnects by itself; poll until it is back
+            this.startPolling();
+        });
+    }
+    
+    /**
+     * Apply pushed totals without refetching monthly totals
+     */
+    async applyTotalsEvent(data) {
+        const now = new Date();
+        const currentMonth = (data.months || []).find(
+            month => month.year === now.getFullYear() && month.month === now.getMonth() + 1
+        );
+        
+        if (currentMonth) {
+            this.updateDashboardCards({
+                expense: Math.abs(currentMonth.expense || 0),
+                saving: Math.abs(currentMonth.saving || 0),
+                investment: Math.abs(currentMonth.investment || 0),
+                monthly_net: Number(currentMonth.net_total) || 0
+            });
+        }
+        
+        // Today's list only needs a refetch when today was touched
+        const today = [
+            now.getFullYear(),
+            String(now.getMonth() + 1).padStart(2, '0'),
+            String(now.getDate()).padStart(2, '0')
+        ].join('-');
+        if ((data.dates || []).includes(today)) {
+            const todayData = await this.fetchTodaySummary();
+            if (todayData) {
+                this.updateTodaySummary(todayData.transactions);
+            }
+        }
+    }
+    
+    /**
+     * Fallback: refresh dashboard every 30 seconds
+     */
+    startPolling() {
+        if (this.updateInterval) return;
         this.updateInterval = setInterval(() => {
             this.loadDashboardData();
         }, 30000);
-        
+    }
+    
+    stopPolling() {
+        if (this.updateInterval) {
+            clearInterval(this.updateInterval);
+            this.updateInterval = null;
+        }
     }
     
     /**
@@ -500,8 +576,9 @@ class Dashboard {
      * Cleanup
      */
     destroy() {
-        if (this.updateInterval) {
-            clearInterval(this.updateInterval);
+        this.stopPolling();
+        if (this.eventSource) {
+            this.eventSource.close();
         }
     }
 }
@@ -1,6 +1,13 @@
+from collections import defaultdict
+
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
-from .models import Transaction, MonthlyTotal, UserGmailPermission, UserBankConfig, BankEmailTransaction
+from .models import (
+    Transaction, MonthlyTotal, MonthlyCategoryTotal, DailyTotal, BackgroundJob,
+    UserGmailPermission, UserBankConfig, BankEmailTransaction
+)
+from .monthly_service import MonthlyTotalService
+from .signals import transactions_changed
 
 
 @admin.register(Transaction)
@@ -43,7 +50,38 @@ class TransactionAdmin(admin.ModelAdmin):
     
     def save_model(self, request, obj, form, change):
         """Override to ensure proper amount signs"""
+        changed = self._affected_dates([obj.pk]) if change else set()
         super().save_model(request, obj, form, change)
+        changed.add((obj.user_id, obj.date))
+        self._mark_changed(changed)
+    
+    def delete_model(self, request, obj):
+        """Flag the month's totals for recomputation after deleting"""
+        changed = self._affected_dates([obj.pk])
+        super().delete_model(request, obj)
+        self._mark_changed(changed)
+    
+    def delete_queryset(self, request, queryset):
+        """Flag every affected month's totals after a bulk delete"""
+        changed = self._affected_dates(queryset.values_list('pk', flat=True))
+        super().delete_queryset(request, queryset)
+        self._mark_changed(changed)
+    
+    def _affected_dates(self, pks):
+        """(user_id, date) of the given transactions as currently stored"""
+        return set(Transaction.objects.filter(pk__in=list(pks)).values_list('user_id', 'date'))
+    
+    def _mark_changed(self, changed):
+        """Flag the touched months stale and notify listeners per user"""
+        MonthlyTotalService.mark_months_stale(
+            (user_id, transaction_date.year, transaction_date.month)
+            for user_id, transaction_date in changed
+        )
+        dates_by_user = defaultdict(list)
+        for user_id, transaction_date in changed:
+            dates_by_user[user_id].append(transaction_date)
+        for user_id, dates in dates_by_user.items():
+            transactions_changed.send(sender=Transaction, user_id=user_id, dates=dates)
     
     def get_queryset(self, request):
         return super().get_queryset(request).select_related()
@@ -53,9 +91,10 @@ class TransactionAdmin(admin.ModelAdmin):
 class MonthlyTotalAdmin(admin.ModelAdmin):
     list_display = [
         'user', 'year', 'month', 'expense_amount', 'saving_amount', 
-        'investment_amount', 'total_amount', 'transaction_count', 'updated_at'
+        'investment_amount', 'total_amount', 'transaction_count', 'is_stale', 'updated_at'
     ]
-    list_filter = ['user', 'year', 'month']  # Added user filter
+    list_select_related = ['user']  # One JOIN instead of a user query per row
+    list_filter = ['user', 'year', 'month', 'is_stale']  # Added user filter
     ordering = ['-year', '-month']
     
     fieldsets = (
@@ -65,6 +104,12 @@ class MonthlyTotalAdmin(admin.ModelAdmin):
         (_('Totals'), {
             'fields': ('expense_amount', 'saving_amount', 'investment_amount', 'total_amount', 'transaction_count')
         }),
+        (_('Counts'), {
+            'fields': ('expense_count', 'saving_count', 'investment_count')
+        }),
+        (_('Status'), {
+            'fields': ('is_stale',)
+        }),
         (_('Metadata'), {
             'fields': ('updated_at',),
             'classes': ('collapse',)
@@ -85,6 +130,65 @@ class MonthlyTotalAdmin(admin.ModelAdmin):
         return qs
 
 
+@admin.register(MonthlyCategoryTotal)
+class MonthlyCategoryTotalAdmin(admin.ModelAdmin):
+    list_display = ['user', 'year', 'month', 'category', 'amount', 'transaction_count', 'updated_at']
+    list_select_related = ['user']
+    list_filter = ['user', 'year', 'month', 'category']
+    ordering = ['-year', '-month', '-amount']
+    readonly_fields = ['updated_at']
+    
+    def has_add_permission(self, request):
+        """Category totals are maintained with the monthly totals"""
+        return False
+    
+    def get_queryset(self, request):
+        """Filter by user for non-superusers"""
+        qs = super().get_queryset(request)
+        if not request.user.is_superuser:
+            qs = qs.filter(user=request.user)
+        return qs
+
+
+@admin.register(DailyTotal)
+class DailyTotalAdmin(admin.ModelAdmin):
+    list_display = [
+        'user', 'date', 'expense_amount', 'saving_amount', 'investment_amount',
+        'expense_count', 'saving_count', 'investment_count', 'updated_at'
+    ]
+    list_select_related = ['user']
+    list_filter = ['user']
+    date_hierarchy = 'date'
+    ordering = ['-date']
+    readonly_fields = ['updated_at']
+    
+    def has_add_permission(self, request):
+        """Daily totals are maintained with the monthly totals"""
+        return False
+    
+    def get_queryset(self, request):
+        """Filter by user for non-superusers"""
+        qs = super().get_queryset(request)
+        if not request.user.is_superuser:
+            qs = qs.filter(user=request.user)
+        return qs
+
+
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'job_id', 'status', 'started_at', 'updated_at', 'finished_at']
+    list_filter = ['status', 'name']
+    search_fields = ['job_id']
+    readonly_fields = [
+        'job_id', 'name', 'status', 'progress', 'result', 'error',
+        'started_at', 'updated_at', 'finished_at'
+    ]
+    
+    def has_add_permission(self, request):
+        """Jobs are started through the API or BackgroundJobService"""
+        return False
+
+
 # =============================================================================
 # BANK INTEGRATION ADMIN (Phase 1)
 # =============================================================================
@@ -95,6 +199,7 @@ class UserGmailPermissionAdmin(admin.ModelAdmin):
         'user', 'has_gmail_permission', 'permission_granted_at', 
         'permission_last_used', 'token_status'
     ]
+    list_select_related = ['user']
     list_filter = ['has_gmail_permission', 'permission_granted_at']
     search_fields = ['user__email', 'user__first_name', 'user__last_name']
     ordering = ['-permission_granted_at']
@@ -134,6 +239,7 @@ class UserBankConfigAdmin(admin.ModelAdmin):
         'user', 'bank_code', 'is_enabled', 'last_sync_at', 
         'last_successful_sync', 'sync_error_count'
     ]
+    list_select_related = ['user']
     list_filter = ['bank_code', 'is_enabled', 'sync_error_count']
     search_fields = ['user__email', 'user__first_name', 'user__last_name']
     ordering = ['-last_sync_at']
@@ -164,6 +270,7 @@ class BankEmailTransactionAdmin(admin.ModelAdmin):
         'bank_config', 'description', 'amount', 'transaction_type', 
         'date', 'ai_confidence', 'is_processed', 'email_date'
     ]
+    list_select_related = ['bank_config__user']  # Bank config column renders its user
     list_filter = [
         'bank_config__bank_code', 'transaction_type', 'is_processed', 
         'parsing_method', 'date', 'email_date'
@@ -23,11 +23,16 @@ urlpatterns = [
     # Monthly totals endpoints
     path('monthly-totals/', views.monthly_totals, name='monthly-totals'),
     path('monthly-totals/refresh/', views.refresh_monthly_totals, name='refresh-monthly-totals'),
+    path('monthly-totals/refresh/<str:job_id>/', views.refresh_monthly_totals_status, name='refresh-monthly-totals-status'),
+    path('cache-stats/', views.result_cache_stats, name='result-cache-stats'),
     path('monthly-breakdown/', views.monthly_breakdown, name='monthly-breakdown'),
     
     # Today summary
     path('today-summary/', views.today_summary, name='today-summary'),
     
+    # Realtime dashboard updates (Server-Sent Events)
+    path('events/', views.event_stream, name='event-stream'),
+    
     # Future projection endpoints (Phase 8)
     path('future-projection/', views.future_projection, name='future-projection'),
     path('monthly-analysis/', views.monthly_analysis, name='monthly-analysis'),
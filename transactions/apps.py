@@ -5,4 +5,26 @@ from django.utils.translation import gettext_lazy as _
 class TransactionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'transactions'
-    verbose_name = _('Transactions') 
\ No newline at end of file
+    verbose_name = _('Transactions')
+    
+    def ready(self):
+        from django.db.models.signals import post_migrate, post_save, post_delete
+        post_migrate.connect(ensure_search_index, sender=self)
+        
+        # Any write to a user's data invalidates their ETags and cached views
+        from .data_version import bump_data_version
+        from .models import Transaction, BankEmailTransaction, UserBankConfig, UserGmailPermission
+        for model in (Transaction, BankEmailTransaction, UserBankConfig, UserGmailPermission):
+            post_save.connect(bump_data_version, sender=model)
+            post_delete.connect(bump_data_version, sender=model)
+
+
+def ensure_search_index(using, **kwargs):
+    """
+    Re-create the search index if a later migration rebuilt the table.
+    SQLite table rebuilds silently drop the FTS sync triggers.
+    """
+    from django.db import connections
+    from .search import install_search_index
+    install_search_index(connections[using])
+
@@ -0,0 +1,161 @@
+"""
+Background Jobs
+Run long maintenance tasks in a worker thread and record their progress
+in the database (BackgroundJob) so an API endpoint can poll it from any
+process, with or without a shared cache
+"""
+import logging
+import threading
+import uuid
+from datetime import timedelta
+from typing import Any, Callable, Dict, Optional
+from django.db import connection
+from django.utils import timezone
+
+from .models import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+
+# Jobs report progress at least this often; a queued/running job silent for
+# longer lost its worker (restart, deploy) and is reported as failed
+JOB_HEARTBEAT_TIMEOUT = timedelta(minutes=15)
+
+
+class BackgroundJobService:
+    """
+    Minimal in-process job runner.
+
+    Jobs run in a daemon thread of the process that started them, so a
+    worker restart stops them; their row then stops updating and
+    get_status() marks them failed after JOB_HEARTBEAT_TIMEOUT.
+    """
+
+    @staticmethod
+    def _as_status(job: BackgroundJob) -> Dict[str, Any]:
+        status = {
+            'job_id': job.job_id,
+            'name': job.name,
+            'status': job.status,
+            'started_at': job.started_at.isoformat(),
+            'updated_at': job.updated_at.isoformat(),
+        }
+        status.update(job.progress)
+        if job.finished_at:
+            status['finished_at'] = job.finished_at.isoformat()
+        if job.result is not None:
+            status['result'] = job.result
+        if job.error:
+            status['error'] = job.error
+        return status
+
+    @staticmethod
+    def get_status(job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the last reported status of a job.
+
+        Args:
+            job_id (str): Job identifier returned by start()
+
+        Returns:
+            dict: Job status or None if unknown
+        """
+        job = BackgroundJob.objects.filter(job_id=job_id).first()
+        if job is None:
+            return None
+
+        if not job.is_finished and timezone.now() - job.updated_at > JOB_HEARTBEAT_TIMEOUT:
+            logger.warning(f"⚠️ Background job {job_id} stopped reporting, marking it failed")
+            BackgroundJobService._save_status(
+                job_id,
+                status='failed',
+                error='Worker stopped before the job finished',
+                finished_at=timezone.now()
+            )
+            job.refresh_from_db()
+
+        return BackgroundJobService._as_status(job)
+
+    @staticmethod
+    def _save_status(job_id: str, progress: Optional[Dict[str, Any]] = None, **fields) -> None:
+        job = BackgroundJob.objects.get(job_id=job_id)
+        if progress:
+            job.progress = {**job.progress, **progress}
+        for field, value in fields.items():
+            setattr(job, field, value)
+        job.save()
+
+    @staticmethod
+    def start(name: str, func: Callable, *args, **kwargs) -> str:
+        """
+        Start func in a daemon thread.
+
+        func is called as func(*args, report=report, **kwargs); report(**progress)
+        merges progress fields into the job status. The return value of func
+        (JSON serializable) is stored as 'result' once it finishes.
+
+        Args:
+            name (str): Job name shown in the status
+            func (callable): Work to run
+
+        Returns:
+            str: Job identifier
+        """
+        job_id = uuid.uuid4().hex
+        BackgroundJob.objects.create(job_id=job_id, name=name, status='queued')
+
+        thread = threading.Thread(
+            target=BackgroundJobService._run_in_thread,
+            args=(job_id, func) + args,
+            kwargs=kwargs,
+            name=f'{name}-{job_id[:8]}',
+            daemon=True
+        )
+        thread.start()
+
+        logger.info(f"🚀 Started background job {name} ({job_id})")
+        return job_id
+
+    @staticmethod
+    def run(job_id: str, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a job in the current thread, recording its status.
+
+        Args:
+            job_id (str): Job identifier (of an existing BackgroundJob)
+            func (callable): Work to run
+
+        Returns:
+            Result of func, or None if it failed
+        """
+        def report(**progress):
+            BackgroundJobService._save_status(job_id, progress=progress)
+
+        BackgroundJobService._save_status(job_id, status='running')
+        try:
+            result = func(*args, report=report, **kwargs)
+            BackgroundJobService._save_status(
+                job_id,
+                status='completed',
+                result=result,
+                finished_at=timezone.now()
+            )
+            logger.info(f"✅ Background job {job_id} completed")
+            return result
+        except Exception as e:
+            logger.error(f"❌ Background job {job_id} failed: {str(e)}")
+            BackgroundJobService._save_status(
+                job_id,
+                status='failed',
+                error=str(e),
+                finished_at=timezone.now()
+            )
+            return None
+
+    @staticmethod
+    def _run_in_thread(job_id: str, func: Callable, *args, **kwargs) -> None:
+        try:
+            BackgroundJobService.run(job_id, func, *args, **kwargs)
+        finally:
+            # Worker threads get their own DB connection; don't leak it
+            connection.close()
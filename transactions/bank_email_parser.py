@@ -8,9 +8,11 @@ import re
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 from ai_chat.gemini_service import GeminiService
+from expense_tracker.profiling import phase_timer
 
 logger = logging.getLogger(__name__)
 
+@phase_timer('bank_parser')
 class BankEmailAIParser(GeminiService):
     """
     AI parser for bank emails - extends existing GeminiService
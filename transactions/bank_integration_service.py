@@ -4,18 +4,25 @@ Coordinates Gmail API, email parsing, and transaction creation
 """
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from django.utils import timezone
 from django.conf import settings
 from django.db import transaction as db_transaction
 
 from .models import UserBankConfig, BankEmailTransaction, UserGmailPermission, Transaction
-from .gmail_service import GmailService, BankEmailProcessor
+from .gmail_service import (
+    GmailService, GmailHistoryExpired, GmailHistoryTooLarge, GmailStreamIncomplete, BankEmailProcessor
+)
 from .bank_email_parser import BankEmailAIParser
 from .currency_service import CurrencyService
+from .search import normalize_search_text
+from .data_version import DataVersionService
 
 logger = logging.getLogger(__name__)
 
+SYNC_CHUNK_SIZE = 50  # Emails parsed and saved per step of a sync
+
 class BankIntegrationService:
     """
     Main service coordinating bank email integration
@@ -147,17 +154,6 @@ class BankIntegrationService:
             
             logger.info(f"Syncing {bank_config.bank_code} from {since_datetime} to {until_datetime or 'now'}")
             
-            # Get emails from Gmail with date range
-            emails = gmail_service.get_bank_emails(sender_emails, since_datetime, until_datetime)
-            
-            # Filter for actual transaction emails
-            transaction_emails = []
-            for email in emails:
-                if BankEmailProcessor.is_bank_transaction_email(email, bank_config.bank_code):
-                    transaction_emails.append(email)
-            
-            logger.info(f"Found {len(transaction_emails)} transaction emails for {bank_config.bank_code}")
-            
             # Handle force refresh option
             force_refresh = sync_options.get('force_refresh', False)
             if force_refresh:
@@ -165,79 +161,59 @@ class BankIntegrationService:
                 self._clear_existing_email_records(bank_config, since_datetime, until_datetime)
                 logger.info(f"Force refresh enabled - cleared existing records for {bank_config.bank_code}")
             
-            # Check for already processed emails (unless force refresh)
-            existing_email_ids = set()
-            if not force_refresh:
-                existing_email_ids = set(
-                    BankEmailTransaction.objects.filter(
-                        user=self.user,
-                        bank_config=bank_config
-                    ).values_list('email_message_id', flat=True)
-                )
-            
-            new_emails = [
-                email for email in transaction_emails
-                if email.get('id') not in existing_email_ids
-            ]
-            
-            logger.info(f"Processing {len(new_emails)} new emails for {bank_config.bank_code}")
-            
-            # Parse emails with AI
             user_context = {
                 'account_suffix': bank_config.account_suffix,
                 'bank_code': bank_config.bank_code
             }
             
-            logger.info(f"Starting AI parsing for {len(new_emails)} emails from {bank_config.bank_code}")
+            # Stream emails from Gmail and parse/save them SYNC_CHUNK_SIZE at a time
+            new_emails_count = 0
+            parsed_transactions_count = 0
+            created_transactions_count = 0
             
-            # Log sample email for debugging
-            if new_emails:
-                logger.warning(f"📧 DEBUG: Sample email content (first 500 chars): {new_emails[0].get('body', '')[:500]}...")
-                logger.warning(f"📧 DEBUG: Email subject: {new_emails[0].get('subject', 'No subject')}")
-            else:
-                logger.warning(f"📧 DEBUG: No new emails found for parsing!")
+            incomplete_error = None
             
-            parsed_transactions = self.parser.parse_multiple_emails(
-                new_emails, 
-                bank_config.bank_code, 
-                user_context
+            emails, history_id = self._open_email_stream(
+                gmail_service, bank_config, sender_emails, since_datetime, until_datetime, sync_options
             )
-            
-            logger.info(f"AI parsing results: {len(parsed_transactions)} transactions found from {len(new_emails)} emails")
-            
-            # Save parsed email transactions and create actual transactions
-            created_transactions_count = 0
-            
-            for parsed_data in parsed_transactions:
-                try:
-                    # Create BankEmailTransaction record
-                    bank_email_transaction = self._create_bank_email_transaction(
-                        bank_config, parsed_data
-                    )
-                    
-                    # Create actual Transaction if confidence is high enough
-                    confidence = parsed_data.get('ai_confidence', 0)
-                    logger.info(f"Transaction confidence: {confidence}")
+            try:
+                for new_emails in self._iter_email_chunks(emails, bank_config):
+                    logger.info(f"Starting AI parsing for {len(new_emails)} emails from {bank_config.bank_code}")
                     
-                    if confidence >= 0.3:  # Lowered to 30% confidence threshold - accepting even uncertain transactions
-                        actual_transaction = self._create_actual_transaction(
-                            bank_email_transaction, parsed_data
-                        )
-                        if actual_transaction:
-                            bank_email_transaction.transaction_id = actual_transaction
-                            bank_email_transaction.is_processed = True
-                            bank_email_transaction.save()
-                            created_transactions_count += 1
-                            logger.info(f"✅ Created transaction {actual_transaction.id}")
-                    else:
-                        logger.warning(f"⚠️ Transaction skipped due to low confidence: {confidence}")
+                    parsed_transactions = self.parser.parse_multiple_emails(
+                        new_emails, 
+                        bank_config.bank_code, 
+                        user_context
+                    )
                     
-                except Exception as e:
-                    logger.error(f"Error processing parsed transaction: {str(e)}")
-                    continue
+                    new_emails_count += len(new_emails)
+                    parsed_transactions_count += len(parsed_transactions)
+                    created_transactions_count += self._save_parsed_transactions(bank_config, parsed_transactions)
+            except GmailStreamIncomplete as e:
+                # Keep what was saved, but do not move last_sync_at past emails that were never read
+                incomplete_error = str(e)
+                logger.warning(f"⚠️ Incomplete Gmail read for {bank_config.bank_code}: {incomplete_error}")
+            
+            logger.info(f"AI parsing results: {parsed_transactions_count} transactions found from {new_emails_count} emails")
+            
+            if incomplete_error:
+                bank_config.sync_error_count += 1
+                bank_config.last_sync_error = incomplete_error
+                bank_config.save()
+                return {
+                    'bank_code': bank_config.bank_code,
+                    'success': False,
+                    'incomplete': True,
+                    'error': incomplete_error,
+                    'new_emails_count': new_emails_count,
+                    'parsed_transactions_count': parsed_transactions_count,
+                    'created_transactions_count': created_transactions_count,
+                }
             
-            # Update bank config sync status
+            # Update bank config sync status (the stream was read completely)
             bank_config.last_sync_at = timezone.now()
+            if history_id:
+                bank_config.gmail_history_id = history_id
             if created_transactions_count > 0:
                 bank_config.last_successful_sync = timezone.now()
                 bank_config.sync_error_count = 0
@@ -246,11 +222,11 @@ class BankIntegrationService:
             
             # Create detailed summary message
             summary_msg = f"📊 Sync complete for {bank_config.bank_code.upper()}: "
-            summary_msg += f"📧 {len(new_emails)} emails checked, "
-            summary_msg += f"💳 {len(parsed_transactions)} transactions found, "
+            summary_msg += f"📧 {new_emails_count} emails checked, "
+            summary_msg += f"💳 {parsed_transactions_count} transactions found, "
             summary_msg += f"✅ {created_transactions_count} imported"
             
-            if len(new_emails) > 0 and len(parsed_transactions) == 0:
+            if new_emails_count > 0 and parsed_transactions_count == 0:
                 summary_msg += " (No transaction emails found - this is normal for promotional emails)"
             
             logger.info(summary_msg)
@@ -258,8 +234,8 @@ class BankIntegrationService:
             return {
                 'bank_code': bank_config.bank_code,
                 'success': True,
-                'new_emails_count': len(new_emails),
-                'parsed_transactions_count': len(parsed_transactions),
+                'new_emails_count': new_emails_count,
+                'parsed_transactions_count': parsed_transactions_count,
                 'created_transactions_count': created_transactions_count,
                 'last_sync_at': bank_config.last_sync_at.isoformat(),
                 'sync_date_range': {
@@ -282,6 +258,216 @@ class BankIntegrationService:
                 'error': str(e)
             }
     
+    def _open_email_stream(self, gmail_service: GmailService, bank_config: UserBankConfig, sender_emails: List[str],
+                           since_datetime: datetime, until_datetime: Optional[datetime],
+                           sync_options: Dict[str, Any]) -> Tuple[Iterator[Dict[str, Any]], Optional[str]]:
+        """
+        Choose how a sync reads the mailbox
+        
+        Default syncs of a bank with a Gmail history checkpoint only fetch
+        messages added since the checkpoint (users.history.list). Explicit
+        date options, force refresh, a missing checkpoint, an expired
+        history or a history too large to check message by message fall
+        back to the date window search. Searches that run up to now start
+        a new checkpoint.
+        
+        The caller stores the returned historyId (and last_sync_at) only
+        after the stream was read completely: an incomplete stream raises
+        GmailStreamIncomplete and the old checkpoint is kept, so the next
+        sync reads the missed messages again.
+        
+        Returns:
+            (email stream, historyId to store after the sync or None)
+        """
+        explicit_window = any(sync_options.get(option) for option in (
+            'sync_all', 'sync_date', 'sync_year', 'from_date', 'force_refresh'
+        ))
+        filters = self._email_filters(bank_config, skip_existing=not sync_options.get('force_refresh', False))
+        
+        if bank_config.gmail_history_id and not explicit_window:
+            try:
+                message_ids, history_id = gmail_service.list_history_message_ids(bank_config.gmail_history_id)
+                logger.info(f"Incremental sync for {bank_config.bank_code}: {len(message_ids)} new messages since checkpoint")
+                return gmail_service.iter_emails(message_ids, sender_emails, **filters), history_id
+            except GmailHistoryExpired:
+                logger.warning(f"⚠️ Gmail history expired for {bank_config.bank_code}, falling back to date window search")
+            except GmailHistoryTooLarge as e:
+                logger.info(f"📬 {e} for {bank_config.bank_code}, using the sender search instead")
+        
+        # Read the checkpoint before searching so nothing added during the search is missed
+        history_id = gmail_service.get_history_id() if until_datetime is None else None
+        return gmail_service.iter_bank_emails(sender_emails, since_datetime, until_datetime, **filters), history_id
+    
+    def _email_filters(self, bank_config: UserBankConfig, skip_existing: bool = True) -> Dict[str, Any]:
+        """
+        exclude_ids/accept filters for GmailService streams of a bank
+        
+        Stored emails are dropped by ID before anything is fetched, and
+        banks with subject keywords are filtered on headers before bodies
+        are fetched (custom banks accept every email of their sender).
+        """
+        def exclude_ids(message_ids):
+            return set(
+                BankEmailTransaction.objects.filter(
+                    user=self.user,  # CRITICAL: Filter by user
+                    bank_config=bank_config,
+                    email_message_id__in=message_ids
+                ).values_list('email_message_id', flat=True)
+            )
+        
+        def accept(email):
+            return BankEmailProcessor.is_bank_transaction_email(email, bank_config.bank_code)
+        
+        return {
+            'exclude_ids': exclude_ids if skip_existing else None,
+            'accept': accept if BankEmailProcessor.filters_by_subject(bank_config.bank_code) else None,
+        }
+    
+    def _iter_email_chunks(self, emails: Iterable[Dict[str, Any]], bank_config: UserBankConfig) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Split a stream of new transaction emails into chunks
+        
+        Memory stays bounded by SYNC_CHUNK_SIZE regardless of mailbox size.
+        
+        Args:
+            emails: Filtered email stream from GmailService
+            bank_config: Bank configuration to sync
+            
+        Yields:
+            Lists of at most SYNC_CHUNK_SIZE emails
+        """
+        emails = iter(emails)
+        while True:
+            chunk = list(islice(emails, SYNC_CHUNK_SIZE))
+            if not chunk:
+                return
+            logger.info(f"Processing {len(chunk)} new emails for {bank_config.bank_code}")
+            yield chunk
+    
+    def _save_parsed_transactions(self, bank_config: UserBankConfig, parsed_transactions: List[Dict[str, Any]]) -> int:
+        """
+        Store parsed emails and create transactions for confident ones
+        
+        The chunk is written in bulk: one query for already stored emails,
+        one for duplicate candidates, TransactionBulkService for the new
+        transactions (totals recomputed once per month) and one INSERT for
+        the email records.
+        
+        Returns:
+            Number of transactions created (or linked to an existing duplicate)
+        """
+        from .bulk_service import TransactionBulkService
+        
+        stored_email_ids = set(
+            BankEmailTransaction.objects.filter(
+                user=self.user,  # CRITICAL: Filter by user
+                email_message_id__in=[parsed_data.get('email_id') for parsed_data in parsed_transactions]
+            ).values_list('email_message_id', flat=True)
+        )
+        
+        pending = []  # (parsed_data, email record, unsaved Transaction or None)
+        for parsed_data in parsed_transactions:
+            try:
+                email_id = parsed_data['email_id']
+                if email_id in stored_email_ids:
+                    logger.info(f"🔄 Email {email_id[:20]}... already stored, skipping")
+                    continue
+                stored_email_ids.add(email_id)
+                
+                bank_email_transaction = BankEmailTransaction(
+                    user=self.user,
+                    bank_config=bank_config,
+                    email_message_id=email_id,
+                    email_date=parsed_data['email_date'],
+                    email_subject=parsed_data.get('email_subject', ''),
+                    transaction_type=parsed_data['transaction_type'],
+                    amount=parsed_data['amount'],
+                    description=parsed_data['description'],
+                    date=parsed_data['date'],
+                    expense_category=parsed_data.get('expense_category'),
+                    ai_confidence=parsed_data.get('ai_confidence', 0.5),
+                    parsing_method='gemini'
+                )
+                
+                # Create actual Transaction if confidence is high enough
+                confidence = parsed_data.get('ai_confidence', 0)
+                actual_transaction = None
+                if confidence >= 0.3:  # Lowered to 30% confidence threshold - accepting even uncertain transactions
+                    try:
+                        actual_transaction = self._build_actual_transaction(parsed_data)
+                    except Exception as e:
+                        logger.error(f"Error creating Transaction: {str(e)}")
+                else:
+                    logger.warning(f"⚠️ Transaction skipped due to low confidence: {confidence}")
+                
+                pending.append((parsed_data, bank_email_transaction, actual_transaction))
+                
+            except Exception as e:
+                logger.error(f"Error processing parsed transaction: {str(e)}")
+                continue
+        
+        if not pending:
+            return 0
+        
+        with db_transaction.atomic():
+            new_transactions = self._link_transactions(pending)
+            TransactionBulkService.bulk_ingest(self.user, new_transactions, validate=False)
+            
+            email_records = []
+            for _parsed_data, bank_email_transaction, _actual_transaction in pending:
+                if bank_email_transaction.transaction_id:
+                    bank_email_transaction.is_processed = True
+                email_records.append(bank_email_transaction)
+            BankEmailTransaction.objects.bulk_create(email_records)
+        
+        created_transactions_count = sum(1 for record in email_records if record.transaction_id)
+        logger.info(f"✅ Stored {len(email_records)} emails, {created_transactions_count} transactions for {bank_config.bank_code}")
+        return created_transactions_count
+    
+    def _link_transactions(self, pending: List[Tuple[Dict[str, Any], BankEmailTransaction, Optional[Transaction]]]) -> List[Transaction]:
+        """
+        Point each email record at its transaction
+        
+        Rows that match an existing transaction (or an earlier row of the
+        batch) are linked to it instead of creating a duplicate; candidates
+        are loaded with one query.
+        
+        Args:
+            pending: (parsed data, email record, unsaved Transaction or None) tuples
+            
+        Returns:
+            Unsaved transactions to insert
+        """
+        candidates = {}
+        for transaction in Transaction.objects.filter(
+            user=self.user,  # CRITICAL: Filter by user
+            date__in={transaction.date for _, _, transaction in pending if transaction}
+        ):
+            key = (transaction.transaction_type, transaction.amount, transaction.date)
+            candidates.setdefault(key, []).append(transaction)
+        
+        new_transactions = []
+        for transaction_data, bank_email_transaction, actual_transaction in pending:
+            if actual_transaction is None:
+                continue
+            key = (actual_transaction.transaction_type, actual_transaction.amount, actual_transaction.date)
+            needle = self._duplicate_needle(transaction_data)
+            duplicate = next(
+                (candidate for candidate in candidates.get(key, []) if needle in candidate.search_text),
+                None
+            )
+            if duplicate is not None:
+                logger.info(f"🔄 Duplicate found, linking to existing transaction {duplicate.id or '(new)'}")
+                bank_email_transaction.transaction_id = duplicate
+                continue
+            
+            actual_transaction.normalize()
+            new_transactions.append(actual_transaction)
+            bank_email_transaction.transaction_id = actual_transaction
+            candidates.setdefault(key, []).append(actual_transaction)
+        
+        return new_transactions
+    
     def _calculate_sync_date_range(self, bank_config: UserBankConfig, sync_options: Dict[str, Any]) -> tuple:
         """Calculate sync date range based on options with timezone awareness"""
         from datetime import datetime, timedelta
@@ -362,98 +548,55 @@ class BankIntegrationService:
         
         return deleted_count
     
-    def _create_bank_email_transaction(self, bank_config: UserBankConfig, parsed_data: Dict[str, Any]) -> BankEmailTransaction:
-        """Create BankEmailTransaction record from parsed data"""
-        try:
-            bank_email_transaction = BankEmailTransaction.objects.create(
-                user=self.user,
-                bank_config=bank_config,
-                email_message_id=parsed_data['email_id'],
-                email_date=parsed_data['email_date'],
-                email_subject=parsed_data.get('email_subject', ''),
-                transaction_type=parsed_data['transaction_type'],
-                amount=parsed_data['amount'],
-                description=parsed_data['description'],
-                date=parsed_data['date'],
-                expense_category=parsed_data.get('expense_category'),
-                ai_confidence=parsed_data.get('ai_confidence', 0.5),
-                parsing_method='gemini'
-            )
-            
-            logger.info(f"Created BankEmailTransaction {bank_email_transaction.id}")
-            return bank_email_transaction
-            
-        except Exception as e:
-            logger.error(f"Error creating BankEmailTransaction: {str(e)}")
-            raise
-    
-    def _create_actual_transaction(self, bank_email_transaction: BankEmailTransaction, parsed_data: Dict[str, Any]) -> Optional[Transaction]:
-        """Create actual Transaction from parsed email data with currency conversion"""
-        try:
-            # Apply currency conversion if needed
-            original_amount = parsed_data['amount']
-            original_currency = parsed_data.get('currency', 'VND')
-            description = parsed_data.get('description', '')
-            
-            # Convert to VND if transaction is in USD
-            if original_currency == 'USD':
-                vnd_amount = self.currency_service.convert_usd_to_vnd(original_amount)
-                if vnd_amount:
-                    final_amount = vnd_amount
-                    exchange_rate = self.currency_service.get_usd_to_vnd_rate()
-                    final_description = f"[Bank] {description} (${original_amount:.2f} USD → {final_amount:,.0f}₫ @ {exchange_rate:,.0f})"
-                    logger.info(f"💱 ${original_amount} USD → {final_amount:,.0f} VND @ {exchange_rate:,.0f}")
-                else:
-                    # Fallback if conversion fails
-                    final_amount = original_amount * 24000  # Approximate rate
-                    final_description = f"[Bank] {description} (${original_amount:.2f} USD → {final_amount:,.0f}₫ @ ~24,000)"
-                    logger.warning(f"💱 Currency conversion failed, using fallback rate")
+    def _build_actual_transaction(self, parsed_data: Dict[str, Any]) -> Transaction:
+        """Build an unsaved Transaction from parsed email data with currency conversion"""
+        # Apply currency conversion if needed
+        original_amount = parsed_data['amount']
+        original_currency = parsed_data.get('currency', 'VND')
+        description = parsed_data.get('description', '')
+        
+        # Convert to VND if transaction is in USD
+        if original_currency == 'USD':
+            vnd_amount = self.currency_service.convert_usd_to_vnd(original_amount)
+            if vnd_amount:
+                final_amount = vnd_amount
+                exchange_rate = self.currency_service.get_usd_to_vnd_rate()
+                final_description = f"[Bank] {description} (${original_amount:.2f} USD → {final_amount:,.0f}₫ @ {exchange_rate:,.0f})"
+                logger.info(f"💱 ${original_amount} USD → {final_amount:,.0f} VND @ {exchange_rate:,.0f}")
             else:
-                # Already in VND, no conversion needed
-                final_amount = original_amount
-                final_description = f"[Bank] {description}"
-            
-            # Check for duplicate transactions based on converted amount, date, and description
-            duplicate_query = Transaction.objects.filter(
-                user=self.user,
-                transaction_type=parsed_data['transaction_type'],
-                amount=final_amount,
-                date=parsed_data['date'],
-                description__icontains=description[:20]  # Partial match on original description
-            )
-            
-            existing_transaction = duplicate_query.first()
-            if existing_transaction:
-                logger.info(f"🔄 Duplicate found, linking to existing transaction {existing_transaction.id}")
-                return existing_transaction
-            
-            # Parse date properly
-            transaction_date = parsed_data['date']
-            if isinstance(transaction_date, str):
-                from datetime import datetime
-                try:
-                    transaction_date = datetime.strptime(transaction_date, '%Y-%m-%d').date()
-                except ValueError:
-                    from datetime import date
-                    transaction_date = date.today()
-                    logger.warning(f"⚠️ Invalid date format, using today: {transaction_date}")
-            
-            # Create new transaction with converted amount
-            transaction = Transaction.objects.create(
-                user=self.user,
-                transaction_type=parsed_data['transaction_type'],
-                amount=final_amount,
-                description=final_description,
-                date=transaction_date,
-                expense_category=parsed_data.get('expense_category'),
-                ai_confidence=parsed_data.get('ai_confidence', 0.5)
-            )
-            
-            return transaction
-            
-        except Exception as e:
-            logger.error(f"Error creating Transaction: {str(e)}")
-            return None
+                # Fallback if conversion fails
+                final_amount = original_amount * 24000  # Approximate rate
+                final_description = f"[Bank] {description} (${original_amount:.2f} USD → {final_amount:,.0f}₫ @ ~24,000)"
+                logger.warning(f"💱 Currency conversion failed, using fallback rate")
+        else:
+            # Already in VND, no conversion needed
+            final_amount = original_amount
+            final_description = f"[Bank] {description}"
+        
+        # Parse date properly
+        transaction_date = parsed_data['date']
+        if isinstance(transaction_date, str):
+            try:
+                transaction_date = datetime.strptime(transaction_date, '%Y-%m-%d').date()
+            except ValueError:
+                from datetime import date
+                transaction_date = date.today()
+                logger.warning(f"⚠️ Invalid date format, using today: {transaction_date}")
+        
+        return Transaction(
+            user=self.user,
+            transaction_type=parsed_data['transaction_type'],
+            amount=final_amount,
+            description=final_description,
+            date=transaction_date,
+            expense_category=parsed_data.get('expense_category'),
+            ai_confidence=parsed_data.get('ai_confidence', 0.5)
+        )
+    
+    @staticmethod
+    def _duplicate_needle(parsed_data: Dict[str, Any]) -> str:
+        """Normalized description prefix used to spot already imported transactions"""
+        return normalize_search_text(parsed_data.get('description', '')[:20])
     
     def get_sync_history(self, bank_code: str = None, limit: int = 50) -> List[Dict[str, Any]]:
         """
@@ -472,23 +615,28 @@ class BankIntegrationService:
             if bank_code:
                 query = query.filter(bank_config__bank_code=bank_code)
             
-            email_transactions = query.order_by('-email_date')[:limit]
+            # values() with the bank code joined in: one query, no model instances
+            email_transactions = query.order_by('-email_date').values(
+                'id', 'bank_config__bank_code', 'email_date', 'email_subject',
+                'transaction_type', 'amount', 'description', 'date',
+                'ai_confidence', 'is_processed', 'transaction_id', 'created_at'
+            )[:limit]
             
             history = []
             for et in email_transactions:
                 history.append({
-                    'id': et.id,
-                    'bank_code': et.bank_config.bank_code,
-                    'email_date': et.email_date.isoformat(),
-                    'email_subject': et.email_subject,
-                    'transaction_type': et.transaction_type,
-                    'amount': float(et.amount),
-                    'description': et.description,
-                    'date': et.date.isoformat(),
-                    'ai_confidence': et.ai_confidence,
-                    'is_processed': et.is_processed,
-                    'has_transaction': et.transaction_id is not None,
-                    'created_at': et.created_at.isoformat()
+                    'id': et['id'],
+                    'bank_code': et['bank_config__bank_code'],
+                    'email_date': et['email_date'].isoformat(),
+                    'email_subject': et['email_subject'],
+                    'transaction_type': et['transaction_type'],
+                    'amount': float(et['amount']),
+                    'description': et['description'],
+                    'date': et['date'].isoformat(),
+                    'ai_confidence': et['ai_confidence'],
+                    'is_processed': et['is_processed'],
+                    'has_transaction': et['transaction_id'] is not None,
+                    'created_at': et['created_at'].isoformat()
                 })
             
             return history
@@ -554,17 +702,24 @@ class BankIntegrationService:
             
             # Collect preview transactions from all banks
             all_preview_transactions = []
+            warnings = []
             
             for bank_config in bank_configs:
                 preview_result = self._get_single_bank_preview(gmail_service, bank_config, sync_options)
                 if preview_result.get('success'):
                     all_preview_transactions.extend(preview_result.get('transactions', []))
+                if preview_result.get('incomplete'):
+                    warnings.append(f"{bank_config.bank_code}: {preview_result['warning']}")
             
-            return {
+            result = {
                 'success': True,
                 'transactions': all_preview_transactions,
                 'total_count': len(all_preview_transactions)
             }
+            if warnings:
+                result['incomplete'] = True
+                result['warnings'] = warnings
+            return result
             
         except Exception as e:
             logger.error(f"Error getting sync preview: {str(e)}")
@@ -586,77 +741,39 @@ class BankIntegrationService:
             
             logger.info(f"📅 Sync date range: {since_datetime} to {until_datetime}")
             
-            # Get emails from Gmail
-            emails = gmail_service.get_bank_emails(sender_emails, since_datetime, until_datetime)
-            logger.info(f"📧 Found {len(emails)} total emails from Gmail")
-            
-            # Filter for transaction emails
-            transaction_emails = [
-                email for email in emails
-                if BankEmailProcessor.is_bank_transaction_email(email, bank_config.bank_code)
-            ]
-            logger.info(f"💳 Filtered to {len(transaction_emails)} transaction emails")
-            
             # Check force refresh option
             force_refresh = sync_options.get('force_refresh', False)
             logger.info(f"🔄 Force refresh enabled: {force_refresh}")
             
-            if force_refresh:
-                # Clear existing records for this date range in force refresh mode
-                since_datetime, until_datetime = self._calculate_sync_date_range(bank_config, sync_options)
-                existing_count = BankEmailTransaction.objects.filter(
-                    user=self.user,
-                    bank_config=bank_config,
-                    email_date__gte=since_datetime
-                ).count()
-                
-                if until_datetime:
-                    existing_count = BankEmailTransaction.objects.filter(
-                        user=self.user,
-                        bank_config=bank_config,
-                        email_date__gte=since_datetime,
-                        email_date__lte=until_datetime
-                    ).count()
-                
-                logger.info(f"🔄 Force refresh mode: {existing_count} existing records in date range")
-                
-                # Include all emails for force refresh preview
-                new_emails = transaction_emails
-                logger.info(f"🔄 Force refresh: Using all {len(new_emails)} transaction emails for re-parsing")
-            else:
-                # Check for already processed emails
-                existing_email_ids = set(
-                    BankEmailTransaction.objects.filter(
-                        user=self.user,
-                        bank_config=bank_config
-                    ).values_list('email_message_id', flat=True)
-                )
-                
-                logger.info(f"📊 Total transaction emails: {len(transaction_emails)}, existing in DB: {len(existing_email_ids)}")
-                
-                new_emails = [
-                    email for email in transaction_emails
-                    if email.get('id') not in existing_email_ids
-                ]
-                
-                logger.info(f"📊 New emails to process: {len(new_emails)}")
-            
-            logger.info(f"🔍 Found {len(new_emails)} new emails for preview")
-            
             # Parse emails with AI (preview only)
             user_context = {
                 'account_suffix': bank_config.account_suffix,
                 'bank_code': bank_config.bank_code
             }
             
-            logger.info(f"🤖 Starting AI parsing for {len(new_emails)} emails")
+            # Stream emails from Gmail and parse them SYNC_CHUNK_SIZE at a time;
+            # force refresh re-parses emails that are already stored
+            parsed_transactions = []
+            new_emails_count = 0
+            incomplete_error = None
             try:
-                parsed_transactions = self.parser.parse_multiple_emails(
-                    new_emails, 
-                    bank_config.bank_code, 
-                    user_context
+                emails = gmail_service.iter_bank_emails(
+                    sender_emails, since_datetime, until_datetime,
+                    **self._email_filters(bank_config, skip_existing=not force_refresh)
                 )
-                logger.info(f"✅ AI parsing completed: {len(parsed_transactions)} transactions parsed")
+                for new_emails in self._iter_email_chunks(emails, bank_config):
+                    new_emails_count += len(new_emails)
+                    logger.info(f"🤖 Starting AI parsing for {len(new_emails)} emails")
+                    parsed_transactions.extend(self.parser.parse_multiple_emails(
+                        new_emails, 
+                        bank_config.bank_code, 
+                        user_context
+                    ))
+                logger.info(f"✅ AI parsing completed: {len(parsed_transactions)} transactions parsed from {new_emails_count} new emails")
+            except GmailStreamIncomplete as e:
+                # Show what could be read, flagged as partial
+                logger.warning(f"⚠️ Incomplete Gmail read for {bank_config.bank_code}: {str(e)}")
+                incomplete_error = str(e)
             except Exception as e:
                 logger.error(f"❌ AI parsing failed: {str(e)}")
                 return {'success': False, 'error': f'AI parsing failed: {str(e)}'}
@@ -685,10 +802,14 @@ class BankIntegrationService:
             
             logger.info(f"🎯 Preview result: {len(preview_transactions)} transactions formatted")
             
-            return {
+            result = {
                 'success': True,
                 'transactions': preview_transactions
             }
+            if incomplete_error:
+                result['incomplete'] = True
+                result['warning'] = incomplete_error
+            return result
             
         except Exception as e:
             logger.error(f"Error getting preview for {bank_config.bank_code}: {str(e)}")
@@ -698,12 +819,18 @@ class BankIntegrationService:
         """
         Import only selected transactions from preview
         
+        Bank configs, existing email records and duplicate candidates are
+        loaded with one query each, new transactions are inserted with
+        TransactionBulkService and totals are recomputed once per month.
+        
         Args:
             selected_transactions: List of transaction data to import
             
         Returns:
             Import results
         """
+        from .bulk_service import TransactionBulkService
+        
         logger.info(f"📥 Importing {len(selected_transactions)} selected transactions")
         
         imported_count = 0
@@ -712,30 +839,57 @@ class BankIntegrationService:
         
         try:
             with db_transaction.atomic():
+                bank_configs = {
+                    config.bank_code: config
+                    for config in UserBankConfig.objects.filter(
+                        user=self.user,
+                        bank_code__in={row.get('bank_code') for row in selected_transactions}
+                    )
+                }
+                existing_emails = {
+                    (email.bank_config_id, email.email_message_id): email
+                    for email in BankEmailTransaction.objects.filter(
+                        user=self.user,
+                        email_message_id__in={row.get('email_id') for row in selected_transactions}
+                    ).select_related('transaction_id')
+                }
+                
+                now = timezone.now()
+                pending = []  # (transaction_data, email record, unsaved Transaction or None)
+                old_transaction_ids = []
+                touched_dates = []
+                seen_email_ids = set()
+                
                 for transaction_data in selected_transactions:
                     try:
+                        email_id = transaction_data['email_id']
+                        if email_id in seen_email_ids:
+                            skipped_count += 1
+                            import_details.append({
+                                'email_id': email_id,
+                                'status': 'skipped',
+                                'reason': 'Duplicate email in request'
+                            })
+                            continue
+                        seen_email_ids.add(email_id)
+                        
                         # Get bank config
-                        bank_config = UserBankConfig.objects.get(
-                            user=self.user,
-                            bank_code=transaction_data['bank_code']
-                        )
+                        bank_config = bank_configs.get(transaction_data['bank_code'])
+                        if bank_config is None:
+                            raise UserBankConfig.DoesNotExist('UserBankConfig matching query does not exist.')
                         
                         # Check if email already exists (for force refresh handling)
-                        email_id = transaction_data['email_id']
-                        existing_email_transaction = BankEmailTransaction.objects.filter(
-                            user=self.user,
-                            bank_config=bank_config,
-                            email_message_id=email_id
-                        ).first()
+                        existing_email_transaction = existing_emails.get((bank_config.id, email_id))
                         
                         if existing_email_transaction:
                             logger.info(f"🔄 Email {email_id[:20]}... already exists, updating with new data")
                             
-                            # Delete old transaction if exists (for force refresh)
+                            # Delete old transaction (for force refresh) before duplicate detection
                             if existing_email_transaction.transaction_id:
                                 old_transaction = existing_email_transaction.transaction_id
                                 logger.info(f"🗑️ Deleting old transaction {old_transaction.id} for re-creation")
-                                old_transaction.delete()
+                                old_transaction_ids.append(old_transaction.id)
+                                touched_dates.append(old_transaction.date)
                             
                             # Update existing record with new parsed data
                             existing_email_transaction.email_date = transaction_data['email_date']
@@ -749,15 +903,15 @@ class BankIntegrationService:
                             existing_email_transaction.parsing_method = 'gemini'
                             existing_email_transaction.is_processed = False  # Mark as unprocessed for re-creation
                             existing_email_transaction.transaction_id = None  # Clear old transaction reference
-                            existing_email_transaction.save()
+                            existing_email_transaction.updated_at = now
                             
                             bank_email_transaction = existing_email_transaction
                         else:
-                            # Create new BankEmailTransaction record
-                            bank_email_transaction = BankEmailTransaction.objects.create(
+                            # New BankEmailTransaction record, inserted in bulk below
+                            bank_email_transaction = BankEmailTransaction(
                                 user=self.user,
                                 bank_config=bank_config,
-                                email_message_id=transaction_data['email_id'],
+                                email_message_id=email_id,
                                 email_date=transaction_data['email_date'],
                                 email_subject=transaction_data.get('email_subject', ''),
                                 transaction_type=transaction_data['transaction_type'],
@@ -769,34 +923,15 @@ class BankIntegrationService:
                                 parsing_method='gemini'
                             )
                         
-                        # Create actual transaction with currency conversion
-                        actual_transaction = self._create_actual_transaction(
-                            bank_email_transaction, 
-                            transaction_data
-                        )
+                        # Actual transaction with currency conversion
+                        try:
+                            actual_transaction = self._build_actual_transaction(transaction_data)
+                        except Exception as e:
+                            logger.error(f"Error creating Transaction: {str(e)}")
+                            actual_transaction = None
+                        
+                        pending.append((transaction_data, bank_email_transaction, actual_transaction))
                         
-                        if actual_transaction:
-                            bank_email_transaction.transaction_id = actual_transaction
-                            bank_email_transaction.is_processed = True
-                            bank_email_transaction.save()
-                            imported_count += 1
-                            
-                            logger.info(f"✅ Imported {transaction_data.get('description', 'N/A')[:30]}... → {actual_transaction.amount:,.0f} VND")
-                            
-                            import_details.append({
-                                'email_id': transaction_data['email_id'],
-                                'transaction_id': actual_transaction.id,
-                                'status': 'imported',
-                                'amount': float(actual_transaction.amount)
-                            })
-                        else:
-                            skipped_count += 1
-                            import_details.append({
-                                'email_id': transaction_data['email_id'],
-                                'status': 'skipped',
-                                'reason': 'Failed to create transaction'
-                            })
-                            
                     except Exception as e:
                         skipped_count += 1
                         import_details.append({
@@ -805,6 +940,55 @@ class BankIntegrationService:
                             'reason': str(e)
                         })
                         logger.error(f"Error importing transaction: {str(e)}")
+                
+                if old_transaction_ids:
+                    Transaction.objects.filter(user=self.user, id__in=old_transaction_ids).delete()
+                
+                new_transactions = self._link_transactions(pending)
+                
+                # One INSERT per batch, totals recomputed once per month
+                TransactionBulkService.bulk_ingest(
+                    self.user, new_transactions, validate=False, touched_dates=touched_dates
+                )
+                
+                new_emails = []
+                updated_emails = []
+                for transaction_data, bank_email_transaction, actual_transaction in pending:
+                    linked_transaction = bank_email_transaction.transaction_id
+                    if linked_transaction:
+                        bank_email_transaction.is_processed = True
+                        imported_count += 1
+                        
+                        logger.info(f"✅ Imported {transaction_data.get('description', 'N/A')[:30]}... → {linked_transaction.amount:,.0f} VND")
+                        
+                        import_details.append({
+                            'email_id': transaction_data['email_id'],
+                            'transaction_id': linked_transaction.id,
+                            'status': 'imported',
+                            'amount': float(linked_transaction.amount)
+                        })
+                    else:
+                        skipped_count += 1
+                        import_details.append({
+                            'email_id': transaction_data['email_id'],
+                            'status': 'skipped',
+                            'reason': 'Failed to create transaction'
+                        })
+                    
+                    if bank_email_transaction.pk:
+                        updated_emails.append(bank_email_transaction)
+                    else:
+                        new_emails.append(bank_email_transaction)
+                
+                BankEmailTransaction.objects.bulk_create(new_emails)
+                BankEmailTransaction.objects.bulk_update(updated_emails, [
+                    'email_date', 'email_subject', 'transaction_type', 'amount', 'description',
+                    'date', 'expense_category', 'ai_confidence', 'parsing_method',
+                    'is_processed', 'transaction_id', 'updated_at'
+                ])
+                
+                # Bulk writes skip post_save; refresh sync status ETags after commit
+                db_transaction.on_commit(lambda: DataVersionService.bump(self.user.id))
             
             return {
                 'success': True,
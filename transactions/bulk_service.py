@@ -0,0 +1,135 @@
+"""
+Bulk Transaction Ingest
+Create many transactions with one INSERT per batch and recompute the
+monthly/category/daily totals once per affected month, instead of one
+save() plus one incremental totals update per row
+"""
+import logging
+from typing import Any, Dict, Iterable, List, Union
+
+from django.core.exceptions import ValidationError
+from django.db import transaction as db_transaction
+
+from .data_version import DataVersionService
+from .events import publish_totals_changed
+from .models import Transaction
+from .signals import transactions_changed
+
+logger = logging.getLogger(__name__)
+
+
+BULK_BATCH_SIZE = 500
+BULK_MAX_ITEMS = 1000  # Per API request
+
+
+class TransactionBulkService:
+    """Batched transaction writes for API clients and bank imports"""
+
+    @staticmethod
+    def build(user, data: Union[Dict[str, Any], Transaction], validate: bool = True) -> Transaction:
+        """
+        Build an unsaved, normalized transaction.
+
+        Args:
+            user: Owner
+            data: Transaction field values or an unsaved Transaction
+            validate (bool): Run model field validation (choices, lengths)
+
+        Returns:
+            Transaction: Unsaved instance
+
+        Raises:
+            ValidationError: If validate is set and a field is invalid
+        """
+        transaction = data if isinstance(data, Transaction) else Transaction(**data)
+        transaction.user = user
+        transaction.normalize()
+        if validate:
+            # The user is set above; skipping it avoids a query per row
+            transaction.full_clean(exclude=['user', 'search_text'])
+        return transaction
+
+    @staticmethod
+    def bulk_ingest(user, rows: Iterable[Union[Dict[str, Any], Transaction]], validate: bool = True,
+                    touched_dates: Iterable = (), batch_size: int = BULK_BATCH_SIZE) -> List[Transaction]:
+        """
+        Validate and insert transactions of one user, then refresh totals.
+
+        All rows are validated before anything is written; the insert and
+        the totals refresh run in one database transaction.
+
+        Args:
+            user: Owner of every row
+            rows: Transaction field dicts or unsaved Transaction instances
+            validate (bool): Run model field validation on every row
+            touched_dates: Dates of other writes in the same batch (e.g. deleted
+                           rows) whose months must be recomputed too
+            batch_size (int): Rows per INSERT statement
+
+        Returns:
+            list: Created transactions (with primary keys)
+
+        Raises:
+            ValidationError: {row index: ['field: message', ...]} for every invalid row
+        """
+        transactions = []
+        errors = {}
+        for index, row in enumerate(rows):
+            try:
+                transactions.append(TransactionBulkService.build(user, row, validate=validate))
+            except ValidationError as e:
+                if hasattr(e, 'error_dict'):
+                    errors[index] = [
+                        f'{field}: {message}'
+                        for field, messages in e.message_dict.items()
+                        for message in messages
+                    ]
+                else:
+                    errors[index] = e.messages
+        if errors:
+            raise ValidationError(errors)
+
+        touched_dates = list(touched_dates)
+        if not transactions and not touched_dates:
+            return []
+
+        with db_transaction.atomic():
+            created = Transaction.objects.bulk_create(transactions, batch_size=batch_size)
+            TransactionBulkService.refresh_totals(
+                user, [transaction.date for transaction in created] + touched_dates
+            )
+
+        logger.info(f"📥 Bulk ingested {len(created)} transactions for user {user.id}")
+        return created
+
+    @staticmethod
+    def refresh_totals(user, dates: Iterable) -> int:
+        """
+        Recompute the totals of every month touched by a batch.
+
+        bulk_create()/queryset writes skip the post_save signal and the
+        incremental update, so this also bumps the data version and pushes
+        the new totals to open dashboards.
+
+        Args:
+            user: User instance
+            dates: Transaction dates written by the batch
+
+        Returns:
+            int: Number of months recomputed
+        """
+        from .monthly_service import MonthlyTotalService
+
+        dates = list(dates)
+        periods = sorted({(day.year, day.month) for day in dates})
+        for year, month in periods:
+            MonthlyTotalService.update_monthly_totals(user, year, month)
+        transactions_changed.send(sender=Transaction, user_id=user.id, dates=dates)
+
+        def notify():
+            # After commit, so no reader can cache pre-commit data under the new version
+            version = DataVersionService.bump(user.id)
+            publish_totals_changed(user, dates, version)
+
+        db_transaction.on_commit(notify)
+        return len(periods)
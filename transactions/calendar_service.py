@@ -0,0 +1,198 @@
+"""
+Calendar Month View Service
+Builds the month grid served by both calendar endpoints
+(/api/calendar-data/ and /api/chat/calendar/<year>/<month>/) from the
+DailyTotal rollup and caches it per user and month
+"""
+import calendar
+import logging
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from .date_ranges import month_date_filter
+from .fast_serializers import TRANSACTION_LIST_FIELDS, serialize_transaction_row, transaction_icon
+from .models import Transaction
+from .result_cache import ResultCache
+
+logger = logging.getLogger(__name__)
+
+
+CALENDAR_FILTERS = ('all', 'expense', 'saving', 'investment')
+
+
+class CalendarService:
+    """
+    Month view builder shared by the calendar endpoints.
+
+    Month views are cached in the 'calendar' namespace of ResultCache,
+    keyed by the user's data version, so stale months are never read again
+    and writes racing a build can't poison the cache.
+    """
+
+    @staticmethod
+    def get_month_view(user, year: int, month: int, filter_type: str = 'all',
+                       include_transactions: bool = True, version: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get the (cached) month view of a user.
+
+        Args:
+            user: User instance
+            year (int): Year
+            month (int): Month (1-12)
+            filter_type (str): all|expense|saving|investment
+            include_transactions (bool): Include the transaction rows of each day
+            version (int): DataVersionService version, read now if omitted
+
+        Returns:
+            dict: Month view, see build_month_view()
+        """
+        return ResultCache.get_or_compute(
+            'calendar', user, (year, month, filter_type, int(include_transactions)),
+            lambda: CalendarService.build_month_view(user, year, month, filter_type, include_transactions),
+            version=version
+        )
+
+    @staticmethod
+    def build_month_view(user, year: int, month: int, filter_type: str = 'all',
+                         include_transactions: bool = True) -> Dict[str, Any]:
+        """
+        Build the month view from the daily rollup (and the month's
+        transactions when requested).
+
+        Amounts are absolute Decimals; with a type filter the other types
+        are reported as zero.
+
+        Args:
+            user: User instance
+            year (int): Year
+            month (int): Month (1-12)
+            filter_type (str): all|expense|saving|investment
+            include_transactions (bool): Include the transaction rows of each day
+
+        Returns:
+            dict: {'year', 'month', 'filter', 'days': [...]} with one entry
+                  per day of the month
+        """
+        from .monthly_service import MonthlyTotalService
+
+        # Daily totals come from the rollup table (at most 31 rows)
+        daily_totals = MonthlyTotalService.get_daily_totals(user, year, month)
+
+        rows_by_date = {}
+        if include_transactions:
+            transactions = Transaction.objects.filter(
+                user=user,  # CRITICAL: Filter by user
+                **month_date_filter(year, month)
+            )
+            if filter_type != 'all':
+                transactions = transactions.filter(transaction_type=filter_type)
+
+            for row in transactions.values(*TRANSACTION_LIST_FIELDS, 'ai_confidence'):
+                rows_by_date.setdefault(row['date'], []).append(row)
+
+        days = []
+        for day in range(1, calendar.monthrange(year, month)[1] + 1):
+            current_date = date(year, month, day)
+            day_total = daily_totals.get(current_date)
+
+            day_data = {'date': current_date}
+            for transaction_type in ('expense', 'saving', 'investment'):
+                shown = day_total is not None and filter_type in ('all', transaction_type)
+                day_data[transaction_type] = getattr(day_total, f'{transaction_type}_amount') if shown else Decimal('0')
+                day_data[f'{transaction_type}_count'] = getattr(day_total, f'{transaction_type}_count') if shown else 0
+            if include_transactions:
+                day_data['transactions'] = rows_by_date.get(current_date, [])
+
+            days.append(day_data)
+
+        return {
+            'year': year,
+            'month': month,
+            'filter': filter_type,
+            'days': days,
+        }
+
+
+def _format_signed_total(total: Decimal) -> str:
+    """Format daily total with proper sign"""
+    if total == 0:
+        return "0₫"
+    sign = "+" if total > 0 else ""
+    return f"{sign}{total:,.0f}₫"
+
+
+def render_calendar_days(view: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Render a month view in the /api/calendar-data/ format.
+
+    Args:
+        view (dict): Month view from CalendarService
+
+    Returns:
+        list: One dict per day of the month
+    """
+    calendar_data = []
+    for day in view['days']:
+        # Expenses count negative in the daily total
+        daily_total = day['saving'] + day['investment'] - day['expense']
+        day_data = {'date': day['date'].isoformat()}
+        if 'transactions' in day:
+            day_data['transactions'] = [serialize_transaction_row(row) for row in day['transactions']]
+        day_data.update({
+            'daily_total': '{:f}'.format(daily_total.quantize(Decimal('1'))),
+            'formatted_daily_total': _format_signed_total(daily_total),
+            'expense_count': day['expense_count'],
+            'saving_count': day['saving_count'],
+            'investment_count': day['investment_count'],
+        })
+        calendar_data.append(day_data)
+    return calendar_data
+
+
+def render_daily_data(view: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Render a month view in the /api/chat/calendar/ format: only days with
+    transactions, keyed by ISO date, amounts as floats.
+
+    Args:
+        view (dict): Month view from CalendarService
+
+    Returns:
+        dict: ISO date -> {'totals': {...}, 'counts': {...}, 'transactions': [...]}
+    """
+    daily_data = {}
+    for day in view['days']:
+        if not (day['expense_count'] or day['saving_count'] or day['investment_count']):
+            continue
+
+        # Hiển thị chi tiêu là âm, nhưng net total là tổng của tất cả
+        expense = float(day['expense'])
+        day_data = {
+            'totals': {
+                'expense': -expense if expense != 0 else 0,
+                'saving': float(day['saving']),
+                'investment': float(day['investment']),
+                'net': float(day['expense'] + day['saving'] + day['investment'])
+            },
+            'counts': {
+                'expense': day['expense_count'],
+                'saving': day['saving_count'],
+                'investment': day['investment_count']
+            }
+        }
+        if 'transactions' in day:
+            day_data['transactions'] = [
+                {
+                    'id': row['id'],
+                    'transaction_type': row['transaction_type'],
+                    'amount': float(row['amount']),
+                    'description': row['description'],
+                    'expense_category': row['expense_category'] if row['transaction_type'] == 'expense' else None,
+                    'icon': transaction_icon(row['transaction_type'], row['expense_category']),
+                    'confidence': row['ai_confidence']
+                }
+                for row in day['transactions']
+            ]
+        daily_data[day['date'].isoformat()] = day_data
+    return daily_data
@@ -0,0 +1,151 @@
+"""
+Per-User Data Version
+A cache-backed version per user, bumped on every write to the user's
+transactions, bank email transactions and bank settings. Read endpoints
+derive ETag/Last-Modified from it and answer conditional requests with
+304 before running any query.
+"""
+import hashlib
+import logging
+import time
+from datetime import date
+from functools import wraps
+
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.utils.translation import get_language
+from rest_framework.views import APIView
+
+logger = logging.getLogger(__name__)
+
+
+DATA_VERSION_PREFIX = 'data_version'
+
+
+def _now_version() -> int:
+    return int(time.time() * 1_000_000)
+
+
+class DataVersionService:
+    """
+    Versions live in the default cache. With a per-process cache (LocMem)
+    they are only coherent for a single process; with DummyCache every
+    request sees a new version, i.e. conditional GETs are disabled.
+    """
+
+    @staticmethod
+    def _cache_key(user_id: int) -> str:
+        return f'{DATA_VERSION_PREFIX}:{user_id}'
+
+    @staticmethod
+    def get_version(user_id: int) -> int:
+        """
+        Get the data version of a user.
+
+        The version is the time (in microseconds) of the last write, so it
+        doubles as the Last-Modified value.
+
+        Args:
+            user_id (int): User ID
+
+        Returns:
+            int: Current version
+        """
+        key = DataVersionService._cache_key(user_id)
+        version = cache.get(key)
+        if version is None:
+            # First request or evicted: start a new version now
+            cache.add(key, _now_version(), None)
+            version = cache.get(key) or _now_version()
+        return version
+
+    @staticmethod
+    def bump(user_id: int) -> int:
+        """
+        Move a user to a new data version after a write.
+
+        Args:
+            user_id (int): User ID
+
+        Returns:
+            int: New version
+        """
+        version = _now_version()
+        cache.set(DataVersionService._cache_key(user_id), version, None)
+        return version
+
+    @staticmethod
+    def etag(request, version: int) -> str:
+        """
+        Strong ETag for a GET response of the current user.
+
+        Besides the data version the response depends on the URL, today's
+        date (current month, today summary, projections) and the language.
+
+        Args:
+            request: HTTP request
+            version (int): Version from get_version()
+
+        Returns:
+            str: Quoted ETag
+        """
+        raw = ':'.join(str(part) for part in (
+            request.user.id, version, request.get_full_path(),
+            date.today().isoformat(), get_language()
+        ))
+        return '"%s"' % hashlib.md5(raw.encode()).hexdigest()
+
+    @staticmethod
+    def set_validators(response, etag: str, version: int):
+        """
+        Add ETag/Last-Modified and make browsers revalidate every time.
+
+        Args:
+            response: Response to patch
+            etag (str): ETag from etag()
+            version (int): Version from get_version()
+
+        Returns:
+            Response: The same response
+        """
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(version // 1_000_000)
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+def conditional_on_data_version(view_func):
+    """
+    Decorator adding ETag/304 support to a read-only view of user data.
+
+    Apply below @api_view (or to an APIView.get method) so the request is
+    already authenticated. Anonymous requests and error responses pass
+    through untouched.
+    """
+    @wraps(view_func)
+    def wrapper(*args, **kwargs):
+        request = args[1] if isinstance(args[0], APIView) else args[0]
+        if request.method not in ('GET', 'HEAD') or not request.user.is_authenticated:
+            return view_func(*args, **kwargs)
+
+        version = DataVersionService.get_version(request.user.id)
+        etag = DataVersionService.etag(request, version)
+
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=version // 1_000_000
+        )
+        if not_modified is not None:
+            return DataVersionService.set_validators(not_modified, etag, version)
+
+        response = view_func(*args, **kwargs)
+        if response.status_code == 200:
+            DataVersionService.set_validators(response, etag, version)
+        return response
+
+    return wrapper
+
+
+def bump_data_version(instance, **kwargs):
+    """post_save/post_delete receiver for models with a user foreign key"""
+    DataVersionService.bump(instance.user_id)
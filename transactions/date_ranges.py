@@ -0,0 +1,52 @@
+"""
+Date Range Helpers
+Turn year/month filters into half-open date ranges so the database can use
+the (user, date, ...) indexes instead of EXTRACT()ing every row
+"""
+from datetime import date
+from typing import Dict, Tuple
+
+
+def month_date_range(year: int, month: int) -> Tuple[date, date]:
+    """
+    Get the half-open date range covering one month.
+
+    Args:
+        year (int): Year
+        month (int): Month (1-12)
+
+    Returns:
+        tuple: (first day of the month, first day of the next month)
+
+    Raises:
+        ValueError: If year/month is not a valid month
+    """
+    start = date(int(year), int(month), 1)
+    if start.month == 12:
+        end = date(start.year + 1, 1, 1)
+    else:
+        end = date(start.year, start.month + 1, 1)
+    return start, end
+
+
+def month_date_filter(year: int, month: int, field: str = 'date') -> Dict[str, date]:
+    """
+    Filter kwargs selecting one month on a date field.
+
+    Use instead of `date__year=..., date__month=...`:
+
+        Transaction.objects.filter(user=user, **month_date_filter(year, month))
+
+    Args:
+        year (int): Year
+        month (int): Month (1-12)
+        field (str): Date field name
+
+    Returns:
+        dict: {'<field>__gte': start, '<field>__lt': end}
+    """
+    start, end = month_date_range(year, month)
+    return {
+        f'{field}__gte': start,
+        f'{field}__lt': end,
+    }
@@ -0,0 +1,202 @@
+"""
+Email Text Extraction
+Turns Gmail message payloads into compact plain text for the AI parser.
+
+HTML bodies go through a streaming html.parser based extractor: style,
+script and head content is dropped, entities are decoded, block elements
+become line breaks and table cells are joined with " | " so label/value
+rows survive. Extraction stops once EMAIL_TEXT_MAX_BYTES of text have
+been produced; transaction details sit at the top of bank notifications,
+the long tail is footers and marketing.
+"""
+import base64
+import re
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+
+EMAIL_TEXT_MAX_BYTES = 8 * 1024  # UTF-8 bytes of text handed to the parser
+FEED_CHUNK_SIZE = 16 * 1024  # HTML characters fed to the parser per step
+CELL_SEPARATOR = ' | '
+
+SKIPPED_TAGS = frozenset({'head', 'noscript', 'script', 'style', 'svg', 'template', 'title'})
+CELL_TAGS = frozenset({'td', 'th'})
+BLOCK_TAGS = frozenset({
+    'address', 'article', 'aside', 'blockquote', 'br', 'caption', 'dd', 'div', 'dl', 'dt',
+    'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'ol', 'p',
+    'pre', 'section', 'table', 'tbody', 'tfoot', 'thead', 'tr', 'ul',
+})
+
+WHITESPACE = re.compile(r'\s+')
+LOOKS_LIKE_HTML = re.compile(r'<(!doctype|html|body|table|div|p|br)\b', re.IGNORECASE)
+CHARSET = re.compile(r'charset="?([\w-]+)"?', re.IGNORECASE)
+
+
+class _BudgetReached(Exception):
+    pass
+
+
+class EmailTextExtractor(HTMLParser):
+    """html.parser handler collecting the visible text of an email, line by line"""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(convert_charrefs=True)
+        self.max_bytes = max_bytes
+        self.lines: List[str] = []
+        self.size = 0  # UTF-8 bytes of the finished lines (with newlines)
+        self.truncated = False
+        self._line: List[str] = []
+        self._line_size = 0
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag in BLOCK_TAGS:
+            self._end_line()
+        elif tag in CELL_TAGS and self._line:
+            self._add(CELL_SEPARATOR)
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in BLOCK_TAGS:
+            self._end_line()
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        text = WHITESPACE.sub(' ', data)
+        if text.strip() or (text and self._line):
+            self._add(text)
+
+    def _add(self, text: str):
+        self._line.append(text)
+        self._line_size += len(text.encode('utf-8'))
+        if self.size + self._line_size >= self.max_bytes:
+            self._end_line()
+            self.truncated = True
+            raise _BudgetReached
+
+    def _end_line(self):
+        line = WHITESPACE.sub(' ', ''.join(self._line)).strip(' |')
+        self._line = []
+        self._line_size = 0
+        if line:
+            self.lines.append(line)
+            self.size += len(line.encode('utf-8')) + 1
+
+    def text(self) -> str:
+        """Extracted text, at most max_bytes UTF-8 bytes"""
+        self._end_line()
+        return _truncate('\n'.join(self.lines), self.max_bytes)
+
+
+def _truncate(text: str, max_bytes: int) -> str:
+    encoded = text.encode('utf-8')
+    if len(encoded) <= max_bytes:
+        return text
+    return encoded[:max_bytes].decode('utf-8', errors='ignore')
+
+
+def _max_bytes(max_bytes: Optional[int]) -> int:
+    if max_bytes is not None:
+        return max_bytes
+    return getattr(settings, 'EMAIL_TEXT_MAX_BYTES', EMAIL_TEXT_MAX_BYTES)
+
+
+def html_to_text(html: str, max_bytes: Optional[int] = None) -> str:
+    """
+    Visible text of an HTML document, stopping at the byte budget.
+
+    Args:
+        html (str): HTML source
+        max_bytes (int): Budget in UTF-8 bytes (EMAIL_TEXT_MAX_BYTES if omitted)
+
+    Returns:
+        str: Text with one line per block and " | " between table cells
+    """
+    extractor = EmailTextExtractor(_max_bytes(max_bytes))
+    try:
+        for start in range(0, len(html), FEED_CHUNK_SIZE):
+            extractor.feed(html[start:start + FEED_CHUNK_SIZE])
+        extractor.close()
+    except _BudgetReached:
+        pass
+    return extractor.text()
+
+
+def plain_to_text(text: str, max_bytes: Optional[int] = None) -> str:
+    """Plain text body with collapsed whitespace and no blank lines, within the byte budget"""
+    lines = (WHITESPACE.sub(' ', line).strip() for line in text.splitlines())
+    return _truncate('\n'.join(line for line in lines if line), _max_bytes(max_bytes))
+
+
+def decode_part_data(part: Dict[str, Any]) -> str:
+    """Decode the base64url body data of a Gmail message part"""
+    data = part.get('body', {}).get('data')
+    if not data:
+        return ''
+
+    charset = 'utf-8'
+    for header in part.get('headers', []):
+        if header['name'].lower() == 'content-type':
+            match = CHARSET.search(header['value'])
+            if match:
+                charset = match.group(1)
+
+    raw = base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+    try:
+        return raw.decode(charset, errors='replace')
+    except LookupError:  # Unknown charset name
+        return raw.decode('utf-8', errors='replace')
+
+
+def _find_text_parts(payload: Dict[str, Any]) -> Tuple[Optional[Dict], Optional[Dict]]:
+    """First text/plain and text/html part of a (nested) multipart payload, skipping attachments"""
+    plain = html = None
+    stack = [payload]
+    while stack and not (plain and html):
+        part = stack.pop()
+        if part.get('parts'):
+            stack.extend(reversed(part['parts']))
+            continue
+        if part.get('filename'):
+            continue
+        mime_type = part.get('mimeType')
+        if mime_type == 'text/plain' and plain is None:
+            plain = part
+        elif mime_type == 'text/html' and html is None:
+            html = part
+    return plain, html
+
+
+def extract_email_text(payload: Dict[str, Any], max_bytes: Optional[int] = None) -> str:
+    """
+    Text of a Gmail message payload for parsing.
+
+    Prefers the text/plain part (converted like HTML if it actually holds
+    HTML) and falls back to the text/html part.
+
+    Args:
+        payload (dict): Gmail message payload (format='full')
+        max_bytes (int): Budget in UTF-8 bytes (EMAIL_TEXT_MAX_BYTES if omitted)
+
+    Returns:
+        str: Extracted text, empty if the message has no text part
+    """
+    plain, html = _find_text_parts(payload)
+
+    if plain is not None:
+        text = decode_part_data(plain)
+        if text.strip():
+            if LOOKS_LIKE_HTML.search(text[:2048]):
+                return html_to_text(text, max_bytes)
+            return plain_to_text(text, max_bytes)
+
+    if html is not None:
+        return html_to_text(decode_part_data(html), max_bytes)
+
+    return ''
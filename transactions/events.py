@@ -0,0 +1,249 @@
+"""
+Realtime Events
+Per-user pub/sub used to push totals changes to open dashboards over
+Server-Sent Events instead of interval polling.
+
+Every open stream holds a server thread (gunicorn gthread worker), so
+each process serves at most EVENT_STREAM_MAX_CONNECTIONS streams and
+sends further clients back to polling (see acquire_stream_slot()).
+
+The default broker is in-process and only reaches clients connected to
+the same worker process. Set EVENTS_BROKER = 'transactions.events.RedisEventBroker'
+(production does when REDIS_URL is configured) to fan out across workers.
+"""
+import json
+import logging
+import queue
+import threading
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+EVENT_CHANNEL_PREFIX = 'user_events'
+SUBSCRIBER_QUEUE_SIZE = 100  # Slow clients drop events instead of growing memory
+EVENT_STREAM_MAX_CONNECTIONS = 4  # Per process; leaves most worker threads for API requests
+
+_open_streams = 0
+_open_streams_lock = threading.Lock()
+
+
+def acquire_stream_slot() -> bool:
+    """
+    Reserve one of this process's event stream slots.
+
+    Returns:
+        bool: False if EVENT_STREAM_MAX_CONNECTIONS streams are already open
+    """
+    global _open_streams
+    limit = getattr(settings, 'EVENT_STREAM_MAX_CONNECTIONS', EVENT_STREAM_MAX_CONNECTIONS)
+    with _open_streams_lock:
+        if _open_streams >= limit:
+            return False
+        _open_streams += 1
+        return True
+
+
+def release_stream_slot() -> None:
+    """Free a slot taken with acquire_stream_slot()"""
+    global _open_streams
+    with _open_streams_lock:
+        _open_streams = max(0, _open_streams - 1)
+
+
+class Subscription:
+    """A client's stream of events; get() blocks until an event or timeout"""
+
+    def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        raise NotImplementedError
+
+
+class InProcessSubscription(Subscription):
+    def __init__(self, broker, user_id: int):
+        self.broker = broker
+        self.user_id = user_id
+        self.queue = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        self.broker._unsubscribe(self)
+
+
+class InProcessEventBroker:
+    """Thread-safe fan-out to subscribers of the current process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = InProcessSubscription(self, user_id)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: InProcessSubscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+    def has_subscribers(self, user_id: int) -> bool:
+        return user_id in self._subscribers
+
+    def publish(self, user_id: int, event: Dict[str, Any]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for subscription in subscribers:
+            try:
+                subscription.queue.put_nowait(event)
+            except queue.Full:
+                logger.warning(f"⚠️ Dropping event for slow subscriber of user {user_id}")
+
+
+class RedisSubscription(Subscription):
+    def __init__(self, pubsub):
+        self.pubsub = pubsub
+
+    def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        message = self.pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        if message is None:
+            return None
+        return json.loads(message['data'])
+
+    def close(self) -> None:
+        self.pubsub.close()
+
+
+class RedisEventBroker:
+    """Fan-out through Redis pub/sub channels, one channel per user"""
+
+    def __init__(self):
+        import redis
+        self.client = redis.Redis.from_url(settings.EVENTS_REDIS_URL)
+
+    @staticmethod
+    def _channel(user_id: int) -> str:
+        return f'{EVENT_CHANNEL_PREFIX}:{user_id}'
+
+    def subscribe(self, user_id: int) -> Subscription:
+        pubsub = self.client.pubsub()
+        pubsub.subscribe(self._channel(user_id))
+        return RedisSubscription(pubsub)
+
+    def has_subscribers(self, user_id: int) -> bool:
+        # Subscribers may live in any process
+        return True
+
+    def publish(self, user_id: int, event: Dict[str, Any]) -> None:
+        self.client.publish(self._channel(user_id), json.dumps(event))
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Get the configured event broker (settings.EVENTS_BROKER)"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                broker_path = getattr(settings, 'EVENTS_BROKER', 'transactions.events.InProcessEventBroker')
+                _broker = import_string(broker_path)()
+    return _broker
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """
+    Encode an event in the text/event-stream format.
+
+    Args:
+        event (dict): Event with 'type' and optional 'id'
+
+    Returns:
+        str: SSE frame
+    """
+    lines = []
+    if event.get('id') is not None:
+        lines.append(f"id: {event['id']}")
+    lines.append(f"event: {event['type']}")
+    lines.append(f"data: {json.dumps(event, default=str)}")
+    return '\n'.join(lines) + '\n\n'
+
+
+def _decimal_string(amount) -> str:
+    """Amount as the API renders DecimalField(decimal_places=2), also for freshly computed rows"""
+    return str(Decimal(amount).quantize(Decimal('0.01')))
+
+
+def publish_totals_changed(user, dates, version: int) -> None:
+    """
+    Push the new totals of changed months to the user's open dashboards.
+
+    Args:
+        user: User instance
+        dates: Transaction dates touched by the change
+        version (int): Data version after the change (used as event id)
+    """
+    broker = get_broker()
+    if not dates or not broker.has_subscribers(user.id):
+        return
+
+    from django.db.models import Q
+    from .models import MonthlyTotal
+    from .monthly_service import MonthlyTotalService
+
+    periods = {(day.year, day.month) for day in dates}
+    condition = Q()
+    for year, month in periods:
+        condition |= Q(year=year, month=month)
+
+    rows = {
+        (row.year, row.month): row
+        for row in MonthlyTotal.objects.filter(condition, user=user)  # CRITICAL: Filter by user
+    }
+    for period in periods:
+        row = rows.get(period)
+        # Admin and bulk edits mark months stale instead of applying deltas
+        if row is None or row.is_stale:
+            rows[period] = MonthlyTotalService.get_month_total(user, *period)
+
+    # Same fields (and Decimal-as-string encoding) as /api/monthly-totals/
+    months = [
+        {
+            'year': row.year,
+            'month': row.month,
+            'expense': _decimal_string(row.expense_amount),
+            'saving': _decimal_string(row.saving_amount),
+            'investment': _decimal_string(row.investment_amount),
+            'net_total': _decimal_string(row.total_amount),
+            'transaction_count': row.transaction_count,
+        }
+        for _period, row in sorted(rows.items())
+    ]
+
+    try:
+        broker.publish(user.id, {
+            'type': 'totals',
+            'id': version,
+            'months': months,
+            'dates': sorted(day.isoformat() for day in set(dates)),
+        })
+    except Exception as e:
+        # Clients fall back to their periodic refresh
+        logger.error(f"❌ Failed to publish totals event: {str(e)}")
@@ -0,0 +1,81 @@
+"""
+Fast Row Serializers
+Render transaction rows straight from values() dicts through lookup tables,
+for list endpoints where DRF field machinery and model instantiation
+dominate the response time.
+
+Output matches TransactionListSerializer field for field.
+"""
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List
+
+from .models import Transaction
+
+
+# Columns needed to render a TransactionListSerializer row
+TRANSACTION_LIST_FIELDS = (
+    'id', 'transaction_type', 'amount', 'description', 'date', 'expense_category'
+)
+
+
+def transaction_icon(transaction_type: str, expense_category: str = None) -> str:
+    """Icon lookup equivalent to Transaction.get_icon()"""
+    if transaction_type == 'expense':
+        return Transaction.CATEGORY_ICONS.get(expense_category, '📦')
+    return Transaction.TYPE_ICONS.get(transaction_type, '💰')
+
+
+@lru_cache(maxsize=4096)
+def format_short_amount(transaction_type: str, amount: Decimal) -> str:
+    """Short "k" formatting used in list views ("-25k", "+1000k")"""
+    amount = abs(amount)
+    if transaction_type == 'expense':
+        return f"-{amount/1000:.0f}k"
+    return f"+{amount/1000:.0f}k"
+
+
+@lru_cache(maxsize=4096)
+def format_decimal(amount: Decimal) -> str:
+    """DRF DecimalField(decimal_places=0) string representation"""
+    if not isinstance(amount, Decimal):
+        amount = Decimal(str(amount))
+    return '{:f}'.format(amount.quantize(Decimal('1')))
+
+
+def serialize_transaction_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Render one values() row like TransactionListSerializer.
+
+    Args:
+        row (dict): Row with TRANSACTION_LIST_FIELDS keys
+
+    Returns:
+        dict: Serialized transaction
+    """
+    transaction_type = row['transaction_type']
+    amount = row['amount']
+    return {
+        'id': row['id'],
+        'transaction_type': transaction_type,
+        'amount': format_decimal(amount),
+        'formatted_amount': format_short_amount(transaction_type, amount),
+        'description': row['description'],
+        'date': row['date'].isoformat(),
+        'expense_category': row['expense_category'],
+        'icon': transaction_icon(transaction_type, row['expense_category']),
+    }
+
+
+def serialize_transaction_rows(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Render many values() rows, see serialize_transaction_row()"""
+    return [serialize_transaction_row(row) for row in rows]
+
+
+def transaction_list_values(queryset):
+    """
+    Restrict a Transaction queryset to the columns the fast path needs.
+
+    created_at is kept so keyset pagination can build its cursor.
+    """
+    return queryset.values(*TRANSACTION_LIST_FIELDS, 'created_at')
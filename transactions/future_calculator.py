@@ -1,11 +1,14 @@
-from django.db.models import Sum, Avg, Count
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
 from django.utils import timezone
 from datetime import datetime, date, timedelta
 from decimal import Decimal
 from typing import Dict, List, Any
 import json
 
-from .models import Transaction
+from .models import Transaction, MonthlyCategoryTotal
+from .summary_service import TransactionSummaryService
+from .monthly_service import MonthlyTotalService
 
 
 class FutureProjectionCalculator:
@@ -67,38 +70,29 @@ class FutureProjectionCalculator:
             date__gte=start_date,
             date__lte=end_date
         )
+        summary = TransactionSummaryService.summarize_queryset(transactions)
         
         # If no transactions in last 3 months, expand to last 6 months
-        if transactions.count() == 0:
+        if summary.transaction_count == 0:
             start_date = end_date - timedelta(days=180)
             transactions = Transaction.objects.filter(
                 user=self.user,  # CRITICAL: Filter by user
                 date__gte=start_date,
                 date__lte=end_date
             )
+            summary = TransactionSummaryService.summarize_queryset(transactions)
         
         # Calculate monthly averages by transaction type
-        expense_avg = abs(transactions.filter(transaction_type='expense').aggregate(
-            avg=Avg('amount'))['avg'] or 0)
-        saving_avg = transactions.filter(transaction_type='saving').aggregate(
-            avg=Avg('amount'))['avg'] or 0
-        investment_avg = transactions.filter(transaction_type='investment').aggregate(
-            avg=Avg('amount'))['avg'] or 0
-        
         # Convert to float for consistent calculations
-        expense_avg = float(expense_avg)
-        saving_avg = float(saving_avg)
-        investment_avg = float(investment_avg)
+        expense_avg = float(summary.average_for('expense'))
+        saving_avg = float(summary.average_for('saving'))
+        investment_avg = float(summary.average_for('investment'))
         
         # Analyze expense categories
         expense_categories = {}
         for category in ['coffee', 'food', 'transport', 'shopping', 'entertainment', 'health', 'education', 'utilities', 'other']:
-            category_transactions = transactions.filter(
-                transaction_type='expense',
-                expense_category=category
-            )
-            category_avg = abs(category_transactions.aggregate(avg=Avg('amount'))['avg'] or 0)
-            category_count = category_transactions.count()
+            category_avg = summary.category_average(category)
+            category_count = summary.category_counts.get(category, 0)
             expense_categories[category] = {
                 'monthly_avg': float(category_avg),
                 'transaction_count': category_count,
@@ -106,9 +100,9 @@ class FutureProjectionCalculator:
             }
         
         # Calculate monthly transaction counts
-        monthly_counts = transactions.values('date__year', 'date__month').annotate(
+        monthly_counts = transactions.annotate(month=TruncMonth('date')).values('month').annotate(
             count=Count('id')
-        ).order_by('-date__year', '-date__month')
+        ).order_by('-month')
         
         avg_monthly_transactions = sum(item['count'] for item in monthly_counts) / max(len(monthly_counts), 1)
         
@@ -301,24 +295,24 @@ class FutureProjectionCalculator:
         if self.user is None:
             raise ValueError("User is required for analysis")
             
-        transactions = Transaction.objects.filter(
-            user=self.user,  # CRITICAL: Filter by user
-            date__year=year,
-            date__month=month
+        monthly_total = MonthlyTotalService.get_month_total(self.user, year, month)
+        category_totals = dict(
+            MonthlyCategoryTotal.objects.filter(
+                user=self.user,  # CRITICAL: Filter by user
+                year=year,
+                month=month
+            ).values_list('category', 'amount')
         )
         
         analysis = {
             'year': year,
             'month': month,
             'totals': {
-                'expense': abs(transactions.filter(transaction_type='expense').aggregate(
-                    total=Sum('amount'))['total'] or 0),
-                'saving': transactions.filter(transaction_type='saving').aggregate(
-                    total=Sum('amount'))['total'] or 0,
-                'investment': transactions.filter(transaction_type='investment').aggregate(
-                    total=Sum('amount'))['total'] or 0
+                'expense': monthly_total.expense_amount,
+                'saving': monthly_total.saving_amount,
+                'investment': monthly_total.investment_amount
             },
-            'transaction_count': transactions.count(),
+            'transaction_count': monthly_total.transaction_count,
             'category_breakdown': {}
         }
         
@@ -329,10 +323,7 @@ class FutureProjectionCalculator:
         
         # Category breakdown for expenses
         for category in ['coffee', 'food', 'transport', 'shopping', 'entertainment', 'health', 'education', 'utilities', 'other']:
-            category_total = abs(transactions.filter(
-                transaction_type='expense',
-                expense_category=category
-            ).aggregate(total=Sum('amount'))['total'] or 0)
+            category_total = category_totals.get(category, 0)
             
             analysis['category_breakdown'][category] = {
                 'total': float(category_total),
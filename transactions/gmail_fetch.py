@@ -0,0 +1,275 @@
+"""
+Gmail Fetch Engine
+Fetches many Gmail messages through the batch HTTP endpoint (one round
+trip per GMAIL_BATCH_SIZE gets instead of one per message), throttled by
+a per-user token bucket sized to the Gmail per-user quota, and retries
+rate limited (429/403 rateLimitExceeded) and 5xx responses with
+exponential backoff.
+
+Works with any googleapiclient Gmail resource, including one built
+against a local stub server (settings.GMAIL_API_ENDPOINT).
+"""
+import logging
+import random
+import socket
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from django.conf import settings
+from googleapiclient.errors import HttpError
+from googleapiclient.http import BatchHttpRequest
+
+logger = logging.getLogger(__name__)
+
+
+GMAIL_BATCH_SIZE = 50  # Gmail allows 100 calls per batch but rate limits larger batches
+GMAIL_QUOTA_UNITS_PER_SECOND = 250  # Per-user quota
+GMAIL_GET_UNITS = 5  # Quota units of messages.get
+GMAIL_LIST_UNITS = 5  # Quota units of messages.list
+GMAIL_HISTORY_UNITS = 2  # Quota units of history.list
+GMAIL_PROFILE_UNITS = 1  # Quota units of getProfile
+GMAIL_MAX_RETRIES = 5
+GMAIL_BACKOFF_BASE = 1.0  # Seconds before the first retry, doubled per attempt
+GMAIL_BACKOFF_MAX = 32.0
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+RATE_LIMIT_REASONS = ('rateLimitExceeded', 'userRateLimitExceeded')
+
+
+def is_retryable(error: Exception) -> bool:
+    """True for rate limit, server and network errors of the Gmail API"""
+    if isinstance(error, HttpError):
+        status = error.resp.status
+        if status in RETRYABLE_STATUSES:
+            return True
+        # Gmail reports some rate limits as 403
+        return status == 403 and any(reason in str(error.content) for reason in RATE_LIMIT_REASONS)
+    return isinstance(error, (socket.timeout, ConnectionError, TimeoutError))
+
+
+def is_not_found(error: Exception) -> bool:
+    """True if Gmail reports the message as gone (deleted since it was listed)"""
+    return isinstance(error, HttpError) and error.resp.status == 404
+
+
+def backoff_delay(attempt: int, error: Optional[Exception] = None) -> float:
+    """
+    Seconds to wait before retry number `attempt` (1-based).
+
+    Honors a Retry-After header, otherwise exponential backoff with full
+    jitter capped at GMAIL_BACKOFF_MAX.
+    """
+    if isinstance(error, HttpError):
+        retry_after = error.resp.get('retry-after')
+        if retry_after and str(retry_after).isdigit():
+            return min(float(retry_after), GMAIL_BACKOFF_MAX)
+    return random.uniform(0, min(GMAIL_BACKOFF_MAX, GMAIL_BACKOFF_BASE * 2 ** (attempt - 1)))
+
+
+class QuotaLimiter:
+    """
+    Token bucket of Gmail quota units.
+
+    One bucket per user and process: concurrent syncs of the same user in
+    this process share it, other processes keep their own. Buckets are held
+    weakly and disappear with the last fetcher using them.
+    """
+
+    _buckets: 'weakref.WeakValueDictionary[Any, QuotaLimiter]' = weakref.WeakValueDictionary()
+    _buckets_lock = threading.Lock()
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_user(cls, user_id) -> 'QuotaLimiter':
+        """Shared limiter of a user"""
+        with cls._buckets_lock:
+            limiter = cls._buckets.get(user_id)
+            if limiter is None:
+                rate = getattr(settings, 'GMAIL_QUOTA_UNITS_PER_SECOND', GMAIL_QUOTA_UNITS_PER_SECOND)
+                limiter = cls(rate)
+                cls._buckets[user_id] = limiter
+            return limiter
+
+    def acquire(self, units: float) -> float:
+        """
+        Take quota units, sleeping until the bucket holds enough.
+
+        Costs above the bucket capacity (a large batch) are taken in
+        capacity-sized slices, so they are paced at the quota rate too.
+
+        Args:
+            units (float): Quota units of the next request(s)
+
+        Returns:
+            float: Seconds waited
+        """
+        waited = 0.0
+        while units > 0:
+            step = min(units, self.capacity)
+            waited += self._acquire_step(step)
+            units -= step
+        return waited
+
+    def _acquire_step(self, units: float) -> float:
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self.tokens >= units:
+                    self.tokens -= units
+                    return waited
+                wait = (units - self.tokens) / self.rate
+            self._sleep(wait)
+            waited += wait
+
+
+class GmailMessageFetcher:
+    """
+    Batched, throttled and retrying reads of one user's mailbox.
+    """
+
+    def __init__(self, service, user_id, batch_size: int = None, limiter: QuotaLimiter = None,
+                 max_retries: int = GMAIL_MAX_RETRIES, sleep: Callable[[float], None] = time.sleep,
+                 batch_uri: Optional[str] = None):
+        """
+        Args:
+            service: Gmail API resource (googleapiclient.discovery.build('gmail', 'v1'))
+            user_id: Key of the quota bucket (the app user's ID)
+            batch_size (int): Gets per batch request (max 100)
+            limiter (QuotaLimiter): Quota bucket, the user's shared one if omitted
+            max_retries (int): Retries per request before giving up
+            sleep (callable): Used for backoff waits
+            batch_uri (str): Batch endpoint, the service's default if omitted
+                (a custom api_endpoint does not move it)
+        """
+        self.service = service
+        self.batch_uri = batch_uri
+        self.batch_size = min(100, batch_size or getattr(settings, 'GMAIL_BATCH_SIZE', GMAIL_BATCH_SIZE))
+        self.limiter = limiter or QuotaLimiter.for_user(user_id)
+        self.max_retries = max_retries
+        self._sleep = sleep
+        self.stats = {'requests': 0, 'retries': 0, 'failed': 0}
+        # IDs of messages that could not be fetched (deleted messages are not counted)
+        self.given_up: List[str] = []
+
+    def execute(self, request, units: float = GMAIL_LIST_UNITS):
+        """
+        Execute a single API request with throttling and retry/backoff.
+
+        Args:
+            request: googleapiclient HttpRequest
+            units (float): Quota units of the request
+
+        Returns:
+            dict: Response body
+
+        Raises:
+            HttpError: Non-retryable error, or retries exhausted
+        """
+        attempt = 0
+        while True:
+            self.limiter.acquire(units)
+            self.stats['requests'] += 1
+            try:
+                return request.execute()
+            except Exception as e:
+                attempt += 1
+                if not is_retryable(e) or attempt > self.max_retries:
+                    raise
+                self.stats['retries'] += 1
+                delay = backoff_delay(attempt, e)
+                logger.warning(f"⚠️ Gmail request failed ({e}), retry {attempt} in {delay:.1f}s")
+                self._sleep(delay)
+
+    def iter_messages(self, message_ids: Iterable[str], format: str = 'full',
+                      metadata_headers: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Fetch messages with batch requests, yielding each batch's messages
+        as soon as the batch completes.
+
+        Messages that keep failing, or fail with a non-retryable error, are
+        logged, skipped and recorded in given_up (unless Gmail reports them
+        deleted), so callers can tell the result is incomplete.
+
+        Args:
+            message_ids: Gmail message IDs
+            format (str): 'full', 'metadata', 'minimal' or 'raw'
+            metadata_headers (list): Headers returned with format='metadata'
+
+        Yields:
+            dict: Gmail message resources
+        """
+        message_ids = list(message_ids)
+        for start in range(0, len(message_ids), self.batch_size):
+            yield from self._fetch_batch(message_ids[start:start + self.batch_size], format, metadata_headers)
+
+    def _fetch_batch(self, message_ids: List[str], format: str,
+                     metadata_headers: Optional[List[str]]) -> Iterator[Dict[str, Any]]:
+        pending = message_ids
+        attempt = 0
+        while pending:
+            results: Dict[str, Any] = {}
+            errors: Dict[str, Exception] = {}
+
+            def callback(request_id, response, exception):
+                if exception is not None:
+                    errors[request_id] = exception
+                else:
+                    results[request_id] = response
+
+            if self.batch_uri:
+                batch = BatchHttpRequest(callback=callback, batch_uri=self.batch_uri)
+            else:
+                batch = self.service.new_batch_http_request(callback=callback)
+            messages = self.service.users().messages()
+            for message_id in pending:
+                kwargs = {'userId': 'me', 'id': message_id, 'format': format}
+                if metadata_headers:
+                    kwargs['metadataHeaders'] = metadata_headers
+                batch.add(messages.get(**kwargs), request_id=message_id)
+
+            self.limiter.acquire(len(pending) * GMAIL_GET_UNITS)
+            self.stats['requests'] += 1
+            try:
+                batch.execute()
+            except Exception as e:
+                # The batch request itself failed: retry every message without a response
+                errors = {message_id: e for message_id in pending if message_id not in results}
+
+            for message_id in pending:
+                if message_id in results:
+                    yield results[message_id]
+
+            retry = [message_id for message_id, error in errors.items() if is_retryable(error)]
+            for message_id, error in errors.items():
+                if not is_retryable(error):
+                    self.stats['failed'] += 1
+                    if not is_not_found(error):
+                        self.given_up.append(message_id)
+                    logger.warning(f"Error getting message details for {message_id}: {str(error)}")
+
+            attempt += 1
+            if retry and attempt > self.max_retries:
+                self.stats['failed'] += len(retry)
+                self.given_up.extend(retry)
+                logger.error(f"❌ Gave up on {len(retry)} Gmail messages after {self.max_retries} retries")
+                return
+            if retry:
+                self.stats['retries'] += len(retry)
+                delay = backoff_delay(attempt, errors[retry[0]])
+                logger.warning(f"⚠️ {len(retry)} Gmail messages rate limited or failed, retry {attempt} in {delay:.1f}s")
+                self._sleep(delay)
+            pending = retry
@@ -4,15 +4,47 @@ Handles reading emails from supported banks
 """
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Iterator, Optional, Set, Tuple
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from django.conf import settings
 from django.utils import timezone
+from expense_tracker.profiling import phase_timer
+from .email_text import extract_email_text
+from .gmail_fetch import (
+    GmailMessageFetcher, GMAIL_GET_UNITS, GMAIL_HISTORY_UNITS, GMAIL_LIST_UNITS, GMAIL_PROFILE_UNITS
+)
 
 logger = logging.getLogger(__name__)
 
+GMAIL_LIST_PAGE_SIZE = 500  # Message IDs per messages.list page (Gmail maximum)
+GMAIL_HISTORY_PAGE_SIZE = 500  # History records per history.list page
+GMAIL_HISTORY_MAX_MESSAGES = 200  # Above this many new messages the sender search is cheaper
+HISTORY_SKIPPED_LABELS = frozenset({'SENT', 'DRAFT', 'CHAT'})  # Never from a bank
+METADATA_HEADERS = ['Subject', 'From', 'To', 'Date', 'Message-ID']  # Fetched by the metadata phase
+
+
+class GmailHistoryExpired(Exception):
+    """The startHistoryId is too old (or invalid); fall back to a date window search"""
+
+
+class GmailHistoryTooLarge(Exception):
+    """
+    More messages were added since the checkpoint than GMAIL_HISTORY_MAX_MESSAGES;
+    checking each one's sender would cost more quota than a from: search
+    """
+
+
+class GmailStreamIncomplete(Exception):
+    """
+    An email stream ended without every matching message: a results page
+    could not be listed or messages could not be fetched after retries.
+    Raised after everything that could be fetched has been yielded.
+    """
+
+
+@phase_timer('gmail')
 class GmailService:
     """
     Gmail API service for reading bank emails
@@ -24,6 +56,7 @@ class GmailService:
         self.user_gmail_permission = user_gmail_permission
         self.user = user_gmail_permission.user
         self.service = None
+        self.fetcher = None
         self._initialize_service()
     
     def _initialize_service(self):
@@ -50,8 +83,18 @@ class GmailService:
                 scopes=token_data.get('scopes', [])
             )
             
-            # Build Gmail service
-            self.service = build('gmail', 'v1', credentials=credentials)
+            # Build Gmail service (GMAIL_API_ENDPOINT points it at a local stub in tests)
+            api_endpoint = getattr(settings, 'GMAIL_API_ENDPOINT', None)
+            self.service = build(
+                'gmail', 'v1',
+                credentials=credentials,
+                client_options={'api_endpoint': api_endpoint} if api_endpoint else None
+            )
+            self.fetcher = GmailMessageFetcher(
+                self.service,
+                self.user.id,
+                batch_uri=f"{api_endpoint.rstrip('/')}/batch/gmail/v1" if api_endpoint else None
+            )
             
             # Update last used timestamp
             self.user_gmail_permission.permission_last_used = timezone.now()
@@ -108,7 +151,9 @@ class GmailService:
     
     def get_bank_emails(self, sender_emails: List[str], since_datetime: datetime = None, until_datetime: datetime = None) -> List[Dict[str, Any]]:
         """
-        Get bank emails from Gmail with flexible date filtering
+        Get all bank emails matching the filters as one list
+        
+        Holds every parsed email in memory; syncs use iter_bank_emails().
         
         Args:
             sender_emails: List of sender email patterns to filter
@@ -118,66 +163,263 @@ class GmailService:
         Returns:
             List of email dictionaries
         """
-        try:
-            if not self.service:
-                return []
-            
-            # Build Gmail search query
-            query_parts = []
+        return list(self.iter_bank_emails(sender_emails, since_datetime, until_datetime))
+    
+    def iter_bank_emails(self, sender_emails: List[str], since_datetime: datetime = None, until_datetime: datetime = None,
+                         exclude_ids: Callable[[List[str]], Set[str]] = None,
+                         accept: Callable[[Dict[str, Any]], bool] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream bank emails from Gmail with flexible date filtering
+        
+        Walks every page of the search results (nextPageToken) and yields
+        parsed emails as each batch of messages arrives, so only one page
+        of IDs and one batch of messages are held at a time. See
+        _iter_selected_emails() for the exclude_ids/accept filters.
+        
+        Args:
+            sender_emails: List of sender email patterns to filter
+            since_datetime: Start date for email filtering
+            until_datetime: End date for email filtering (optional)
+            exclude_ids: Returns the IDs of a batch to skip (e.g. already stored)
+            accept: Decides on an email's headers (no body) whether to fetch it
             
-            # Add sender filters
-            if sender_emails:
-                sender_query = ' OR '.join([f'from:{email}' for email in sender_emails])
-                query_parts.append(f'({sender_query})')
+        Yields:
+            Email dictionaries, newest first
             
-            # Add date filters
-            if since_datetime:
-                since_date_str = since_datetime.strftime('%Y/%m/%d')
-                query_parts.append(f'after:{since_date_str}')
+        Raises:
+            GmailStreamIncomplete: A page or some messages could not be fetched
+        """
+        if not self.service:
+            return
+        
+        query = self._build_search_query(sender_emails, since_datetime, until_datetime)
+        logger.info(f"Gmail search query: {query}")
+        
+        page_token = None
+        page_count = 0
+        found_count = 0
+        parsed_count = 0
+        given_up_before = len(self.fetcher.given_up)
+        while True:
+            try:
+                results = self.fetcher.execute(self.service.users().messages().list(
+                    userId='me',
+                    q=query,
+                    maxResults=GMAIL_LIST_PAGE_SIZE,
+                    pageToken=page_token
+                ), GMAIL_LIST_UNITS)
+            except Exception as e:
+                logger.error(f"Error getting bank emails: {str(e)}")
+                raise GmailStreamIncomplete(
+                    f"Gmail search stopped after {page_count} pages ({found_count} messages): {str(e)}"
+                ) from e
+            page_count += 1
+            
+            message_ids = [message['id'] for message in results.get('messages', [])]
+            found_count += len(message_ids)
+            
+            for email_data in self._iter_selected_emails(message_ids, exclude_ids, accept):
+                parsed_count += 1
+                yield email_data
+            
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                break
+        
+        logger.info(f"Found {found_count} messages matching criteria, parsed {parsed_count} emails")
+        self._check_complete(given_up_before)
+    
+    def get_history_id(self) -> Optional[str]:
+        """
+        Current historyId of the mailbox
+        
+        Taken before a date window search, it is the checkpoint from which
+        the next sync can continue with list_history_message_ids().
+        
+        Returns:
+            historyId string, or None if unavailable
+        """
+        try:
+            profile = self.fetcher.execute(self.service.users().getProfile(userId='me'), GMAIL_PROFILE_UNITS)
+            return profile.get('historyId')
+        except Exception as e:
+            logger.warning(f"Could not read Gmail historyId: {str(e)}")
+            return None
+    
+    def list_history_message_ids(self, start_history_id: str, max_messages: int = None) -> Tuple[List[str], str]:
+        """
+        IDs of messages added to the mailbox since a history checkpoint
+        
+        History covers the whole mailbox and every candidate costs a
+        metadata get to check its sender, so sent/draft/chat messages are
+        dropped on their labels and busy mailboxes are refused above
+        max_messages (the caller falls back to the sender search).
+        
+        Args:
+            start_history_id: historyId stored by the previous sync
+            max_messages: Candidate limit (GMAIL_HISTORY_MAX_MESSAGES if omitted)
             
-            if until_datetime:
-                until_date_str = until_datetime.strftime('%Y/%m/%d')
-                query_parts.append(f'before:{until_date_str}')
+        Returns:
+            (message IDs, newest first; historyId to store as the next checkpoint)
             
-            # Build final query
-            query = ' '.join(query_parts) if query_parts else 'in:inbox'
+        Raises:
+            GmailHistoryExpired: Gmail no longer has history that old (404)
+            GmailHistoryTooLarge: More than max_messages candidates
+        """
+        if max_messages is None:
+            max_messages = getattr(settings, 'GMAIL_HISTORY_MAX_MESSAGES', GMAIL_HISTORY_MAX_MESSAGES)
+        message_ids = []
+        seen = set()
+        history_id = start_history_id
+        page_token = None
+        while True:
+            try:
+                results = self.fetcher.execute(self.service.users().history().list(
+                    userId='me',
+                    startHistoryId=start_history_id,
+                    historyTypes=['messageAdded'],
+                    maxResults=GMAIL_HISTORY_PAGE_SIZE,
+                    pageToken=page_token
+                ), GMAIL_HISTORY_UNITS)
+            except HttpError as e:
+                if e.resp.status == 404:
+                    raise GmailHistoryExpired(str(e))
+                raise
+            
+            for record in results.get('history', []):
+                for added in record.get('messagesAdded', []):
+                    message_id = added['message']['id']
+                    if HISTORY_SKIPPED_LABELS.intersection(added['message'].get('labelIds', [])):
+                        continue
+                    if message_id not in seen:
+                        seen.add(message_id)
+                        message_ids.append(message_id)
+            
+            if len(message_ids) > max_messages:
+                raise GmailHistoryTooLarge(
+                    f"More than {max_messages} messages added since history {start_history_id}"
+                )
+            
+            history_id = results.get('historyId', history_id)
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                break
+        
+        logger.info(f"Gmail history since {start_history_id}: {len(message_ids)} new messages")
+        return message_ids[::-1], history_id
+    
+    def iter_emails(self, message_ids: List[str], sender_emails: List[str] = None,
+                    exclude_ids: Callable[[List[str]], Set[str]] = None,
+                    accept: Callable[[Dict[str, Any]], bool] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream parsed emails of the given messages, optionally only those
+        from one of the sender patterns
+        
+        Args:
+            message_ids: Gmail message IDs
+            sender_emails: Sender patterns the From header must contain
+            exclude_ids: Returns the IDs of a batch to skip (e.g. already stored)
+            accept: Decides on an email's headers (no body) whether to fetch it
             
-            logger.info(f"Gmail search query: {query}")
+        Yields:
+            Email dictionaries
             
-            # Search for messages
-            results = self.service.users().messages().list(
-                userId='me',
-                q=query,
-                maxResults=500  # Increased limit for batch processing
-            ).execute()
-            
-            messages = results.get('messages', [])
-            logger.info(f"Found {len(messages)} messages matching criteria")
-            
-            # Get detailed message information
-            emails = []
-            for message in messages:
-                try:
-                    msg_detail = self.service.users().messages().get(
-                        userId='me',
-                        id=message['id'],
-                        format='full'
-                    ).execute()
-                    
-                    email_data = self._parse_email_message(msg_detail)
-                    if email_data:
-                        emails.append(email_data)
-                        
-                except Exception as e:
-                    logger.warning(f"Error getting message details for {message['id']}: {str(e)}")
-                    continue
-            
-            logger.info(f"Successfully parsed {len(emails)} emails")
-            return emails
+        Raises:
+            GmailStreamIncomplete: Some messages could not be fetched
+        """
+        patterns = [pattern.lower() for pattern in sender_emails or []]
+        if patterns:
+            from_sender = lambda email: any(pattern in email['from'].lower() for pattern in patterns)
+            accept_email = (lambda email: from_sender(email) and accept(email)) if accept else from_sender
+        else:
+            accept_email = accept
+        
+        given_up_before = len(self.fetcher.given_up)
+        yield from self._iter_selected_emails(message_ids, exclude_ids, accept_email)
+        self._check_complete(given_up_before)
+    
+    def _check_complete(self, given_up_before: int):
+        """Raise GmailStreamIncomplete if the fetcher gave up on messages since given_up_before"""
+        missed = self.fetcher.given_up[given_up_before:]
+        if missed:
+            raise GmailStreamIncomplete(f"{len(missed)} Gmail messages could not be fetched")
+    
+    def _iter_selected_emails(self, message_ids: List[str], exclude_ids: Callable[[List[str]], Set[str]] = None,
+                              accept: Callable[[Dict[str, Any]], bool] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Fetch and parse messages, cheapest filters first
+        
+        Per batch of IDs: exclude_ids() drops messages by ID alone (no API
+        call), then - if there is an accept() filter - only the headers are
+        fetched (format='metadata') and accept() decides on them, and only
+        the survivors are fetched with format='full' and decoded.
+        
+        Yields:
+            Email dictionaries of the accepted messages
+        """
+        for start in range(0, len(message_ids), self.fetcher.batch_size):
+            batch = message_ids[start:start + self.fetcher.batch_size]
+            
+            if exclude_ids:
+                excluded = exclude_ids(batch)
+                batch = [message_id for message_id in batch if message_id not in excluded]
+            
+            if accept and batch:
+                batch = [
+                    email['id']
+                    for email in map(self._parse_email_metadata, self.fetcher.iter_messages(
+                        batch, format='metadata', metadata_headers=METADATA_HEADERS
+                    ))
+                    if email and accept(email)
+                ]
+            
+            for msg_detail in self.fetcher.iter_messages(batch):
+                email_data = self._parse_email_message(msg_detail)
+                if email_data:
+                    yield email_data
+    
+    def _build_search_query(self, sender_emails: List[str], since_datetime: datetime = None, until_datetime: datetime = None) -> str:
+        """Gmail search query for the given senders and date range"""
+        query_parts = []
+        
+        # Add sender filters
+        if sender_emails:
+            sender_query = ' OR '.join([f'from:{email}' for email in sender_emails])
+            query_parts.append(f'({sender_query})')
+        
+        # Add date filters
+        if since_datetime:
+            since_date_str = since_datetime.strftime('%Y/%m/%d')
+            query_parts.append(f'after:{since_date_str}')
+        
+        if until_datetime:
+            until_date_str = until_datetime.strftime('%Y/%m/%d')
+            query_parts.append(f'before:{until_date_str}')
+        
+        return ' '.join(query_parts) if query_parts else 'in:inbox'
+    
+    def _parse_email_metadata(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Parse a format='metadata' message (headers only, no body)
+        
+        Returns:
+            Email dictionary without body, or None if malformed
+        """
+        try:
+            headers = {}
+            for header in message.get('payload', {}).get('headers', []):
+                headers[header['name'].lower()] = header['value']
             
+            return {
+                'id': message['id'],
+                'subject': headers.get('subject', ''),
+                'from': headers.get('from', ''),
+                'date': self._parse_email_date(headers.get('date')),
+                'headers': headers
+            }
         except Exception as e:
-            logger.error(f"Error getting bank emails: {str(e)}")
-            return []
+            logger.error(f"Error parsing email metadata: {str(e)}")
+            return None
     
     def _parse_email_message(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
@@ -229,11 +471,11 @@ class GmailService:
             Email detail dictionary or None if error
         """
         try:
-            message = self.service.users().messages().get(
+            message = self.fetcher.execute(self.service.users().messages().get(
                 userId='me',
                 id=message_id,
                 format='full'
-            ).execute()
+            ), GMAIL_GET_UNITS)
             
             # Extract email headers
             headers = {}
@@ -266,100 +508,9 @@ class GmailService:
             return None
     
     def _extract_email_body(self, payload: Dict[str, Any]) -> str:
-        """Extract email body from Gmail payload"""
+        """Extract the email text (HTML converted, within EMAIL_TEXT_MAX_BYTES) from Gmail payload"""
         try:
-            body = ""
-            logger.warning(f"📧 DEBUG: Extracting body from payload mimeType: {payload.get('mimeType')}")
-            logger.warning(f"📧 DEBUG: Has parts: {'parts' in payload}")
-            
-            # Handle multipart emails
-            if 'parts' in payload:
-                logger.warning(f"📧 DEBUG: Processing {len(payload['parts'])} parts")
-                for i, part in enumerate(payload['parts']):
-                    mime_type = part.get('mimeType')
-                    has_data = bool(part.get('body', {}).get('data'))
-                    logger.warning(f"📧 DEBUG: Part {i}: mimeType={mime_type}, has_data={has_data}")
-                    
-                    # Try text/plain first, then text/html
-                    if mime_type in ['text/plain', 'text/html']:
-                        data = part.get('body', {}).get('data')
-                        if data:
-                            import base64
-                            try:
-                                decoded = base64.urlsafe_b64decode(data).decode('utf-8')
-                                body += decoded
-                                logger.warning(f"📧 DEBUG: Successfully decoded part {i} ({mime_type}): {decoded[:200]}...")
-                                if mime_type == 'text/plain':
-                                    break  # Prefer plain text
-                            except Exception as e:
-                                logger.warning(f"📧 DEBUG: Failed to decode part {i}: {str(e)}")
-            else:
-                # Single part email
-                mime_type = payload.get('mimeType')
-                logger.warning(f"📧 DEBUG: Single part email, mimeType: {mime_type}")
-                
-                if mime_type in ['text/plain', 'text/html']:
-                    data = payload.get('body', {}).get('data')
-                    if data:
-                        import base64
-                        try:
-                            body = base64.urlsafe_b64decode(data).decode('utf-8')
-                            logger.warning(f"📧 DEBUG: Successfully decoded single part: {body[:200]}...")
-                        except Exception as e:
-                            logger.warning(f"📧 DEBUG: Failed to decode single part: {str(e)}")
-            
-            logger.warning(f"📧 DEBUG: Final body length: {len(body)}")
-            
-            # Strip HTML tags to get plain text for AI parsing
-            if body and (body.strip().startswith('<!DOCTYPE') or '<html' in body.lower()):
-                logger.warning(f"📧 DEBUG: Detected HTML content, stripping tags...")
-                import re
-                
-                # More comprehensive HTML cleaning
-                clean_body = body
-                
-                # Remove CSS styles and scripts
-                clean_body = re.sub(r'<style[^>]*>.*?</style>', ' ', clean_body, flags=re.DOTALL | re.IGNORECASE)
-                clean_body = re.sub(r'<script[^>]*>.*?</script>', ' ', clean_body, flags=re.DOTALL | re.IGNORECASE)
-                
-                # Remove HTML tags
-                clean_body = re.sub(r'<[^>]+>', ' ', clean_body)
-                
-                # Remove CSS-like patterns that survived tag removal
-                clean_body = re.sub(r'\{[^}]*\}', ' ', clean_body)
-                clean_body = re.sub(r'#[\w-]+', ' ', clean_body)
-                clean_body = re.sub(r'\.[\w-]+', ' ', clean_body)
-                
-                # Clean up common HTML entities
-                clean_body = clean_body.replace('&nbsp;', ' ')
-                clean_body = clean_body.replace('&amp;', '&')
-                clean_body = clean_body.replace('&lt;', '<')
-                clean_body = clean_body.replace('&gt;', '>')
-                
-                # Clean up whitespace and formatting
-                clean_body = re.sub(r'\s+', ' ', clean_body).strip()
-                
-                # Remove lines that are just CSS or formatting remnants
-                lines = [line.strip() for line in clean_body.split('\n') if line.strip()]
-                filtered_lines = []
-                for line in lines:
-                    # Skip lines that look like CSS or formatting
-                    if not ((':' in line and ';' in line) or 
-                           line.startswith('#') or 
-                           line.startswith('.') or
-                           'font-' in line or
-                           'color:' in line or
-                           'text-decoration' in line):
-                        filtered_lines.append(line)
-                
-                clean_body = ' '.join(filtered_lines)
-                
-                logger.warning(f"📧 DEBUG: HTML stripped, new length: {len(clean_body)}")
-                logger.warning(f"📧 DEBUG: Clean text content (first 500 chars): {clean_body[:500]}...")
-                return clean_body
-            
-            return body.strip()
-            
+            return extract_email_text(payload)
         except Exception as e:
             logger.warning(f"Error extracting email body: {str(e)}")
             return ""
@@ -439,6 +590,13 @@ class BankEmailProcessor:
         config = cls.BANK_CONFIGS.get(bank_code, {})
         return config.get('sender_emails', [])
     
+    @classmethod
+    def filters_by_subject(cls, bank_code: str) -> bool:
+        """Whether is_bank_transaction_email() can reject emails of this bank"""
+        if bank_code.startswith('custom_'):
+            return False
+        return bool(cls.BANK_CONFIGS.get(bank_code, {}).get('subject_keywords'))
+    
     @classmethod
     def is_bank_transaction_email(cls, email: Dict[str, Any], bank_code: str) -> bool:
         """Check if email is a transaction notification from the bank"""
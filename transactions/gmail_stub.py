@@ -0,0 +1,249 @@
+"""
+Gmail API Stub Server
+Minimal local stand-in for the Gmail endpoints the sync uses, so batching,
+pagination, history checkpoints and quota handling can be exercised
+without a Google account: point settings.GMAIL_API_ENDPOINT at its URL.
+
+Serves messages.list (with pageToken), messages.get (full/metadata),
+history.list, getProfile and the multipart batch endpoint. Failures can
+be injected per message (fail_once: 429s before succeeding, broken: 400)
+and per list page (failing_pages).
+"""
+import base64
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from .sample_data import sample_bank_email_html
+
+
+GMAIL_PREFIX = '/gmail/v1/users/me'
+BATCH_PATH = '/batch/gmail/v1'
+STUB_SENDER = 'TPBank <tpbank@tpb.com.vn>'
+STUB_DATE = 'Sat, 15 Mar 2025 09:30:12 +0700'
+
+
+class GmailStubServer:
+    """
+    In-memory mailbox behind a threaded HTTP server.
+
+    Usage:
+        stub = GmailStubServer().start()
+        stub.add_message('m1')
+        settings.GMAIL_API_ENDPOINT = stub.url
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        self.host = host
+        self.port = port
+        self.url = None
+        self.messages: Dict[str, Dict[str, Any]] = {}
+        self.order: List[str] = []  # Newest first, like Gmail search results
+        self.history: List[Tuple[int, str]] = []  # (historyId, message ID)
+        self.history_id = 1000
+        self.expired_history = False  # Answer history.list with 404
+        self.fail_once: Dict[str, int] = {}  # message ID -> 429 responses left
+        self.broken = set()  # message IDs answered with 400
+        self.failing_pages = set()  # pageTokens answered with 400
+        self.requests: List[Tuple[str, str]] = []  # (method, path), batch parts included
+        self.batch_sizes: List[int] = []
+        self._lock = threading.Lock()
+        self._server = None
+
+    def add_message(self, message_id: str, subject: str = 'Thông báo biến động số dư',
+                    html: Optional[str] = None, sender: str = STUB_SENDER,
+                    labels: Tuple[str, ...] = ('INBOX',)) -> None:
+        """Add a message to the mailbox (newest first) and to the history"""
+        body = html if html is not None else sample_bank_email_html(promotions=2)
+        with self._lock:
+            self.history_id += 1
+            self.messages[message_id] = {
+                'id': message_id,
+                'threadId': message_id,
+                'labelIds': list(labels),
+                'historyId': str(self.history_id),
+                'internalDate': '1742005812000',
+                'payload': {
+                    'mimeType': 'text/html',
+                    'headers': [
+                        {'name': 'Subject', 'value': subject},
+                        {'name': 'From', 'value': sender},
+                        {'name': 'To', 'value': 'user@example.invalid'},
+                        {'name': 'Date', 'value': STUB_DATE},
+                        {'name': 'Message-ID', 'value': f'<{message_id}@stub>'},
+                    ],
+                    'body': {'data': base64.urlsafe_b64encode(body.encode('utf-8')).decode()},
+                },
+            }
+            self.order.insert(0, message_id)
+            self.history.append((self.history_id, message_id))
+
+    def seed(self, count: int) -> None:
+        """Add `count` bank emails, every other one a promotion"""
+        for index in range(count):
+            subject = 'Thông báo biến động số dư' if index % 2 == 0 else 'Ưu đãi tháng này'
+            self.add_message(f'stub{index:06d}', subject=subject)
+
+    def start(self) -> 'GmailStubServer':
+        """Serve in a daemon thread; sets url"""
+        self._server = ThreadingHTTPServer((self.host, self.port), _handler_for(self))
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self.url = f'http://{self.host}:{self._server.server_address[1]}'
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve in the current thread (manage.py gmail_stub)"""
+        self._server = ThreadingHTTPServer((self.host, self.port), _handler_for(self))
+        self.url = f'http://{self.host}:{self._server.server_address[1]}'
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def route(self, method: str, target: str, record: bool = True) -> Tuple[int, Dict[str, Any]]:
+        """Answer one API call; returns (status, JSON body)"""
+        parsed = urlparse(target)
+        query = parse_qs(parsed.query)
+        path = parsed.path
+        if record:
+            with self._lock:
+                self.requests.append((method, path))
+
+        match = re.match(rf'^{GMAIL_PREFIX}/messages/([^/]+)$', path)
+        if match:
+            return self._get_message(match.group(1), query)
+        if path == f'{GMAIL_PREFIX}/messages':
+            return self._list_messages(query)
+        if path == f'{GMAIL_PREFIX}/history':
+            return self._list_history(query)
+        if path == f'{GMAIL_PREFIX}/profile':
+            return 200, {'emailAddress': 'user@example.invalid', 'historyId': str(self.history_id)}
+        return 404, _error(404, 'Not Found')
+
+    def _get_message(self, message_id: str, query) -> Tuple[int, Dict[str, Any]]:
+        with self._lock:
+            if message_id in self.broken:
+                return 400, _error(400, 'Invalid message')
+            if self.fail_once.get(message_id, 0) > 0:
+                self.fail_once[message_id] -= 1
+                return 429, _error(429, 'rateLimitExceeded')
+            message = self.messages.get(message_id)
+        if message is None:
+            return 404, _error(404, 'Requested entity was not found.')
+
+        message = json.loads(json.dumps(message))
+        if query.get('format', ['full'])[0] == 'metadata':
+            wanted = set(query.get('metadataHeaders', []))
+            message['payload'] = {
+                'mimeType': message['payload']['mimeType'],
+                'headers': [h for h in message['payload']['headers'] if not wanted or h['name'] in wanted],
+            }
+        return 200, message
+
+    def _list_messages(self, query) -> Tuple[int, Dict[str, Any]]:
+        page_token = query.get('pageToken', ['0'])[0]
+        if page_token in self.failing_pages:
+            return 400, _error(400, 'Invalid pageToken')
+
+        start = int(page_token)
+        size = min(int(query.get('maxResults', ['100'])[0]), 500)
+        # Only the sender part of the query is honoured (date filters are ignored)
+        senders = re.findall(r'from:(\S+?)\)?(?:\s|$)', query.get('q', [''])[0])
+        with self._lock:
+            ids = [
+                message_id for message_id in self.order
+                if not senders or any(
+                    sender in header['value']
+                    for header in self.messages[message_id]['payload']['headers'] if header['name'] == 'From'
+                    for sender in senders
+                )
+            ]
+
+        body = {'messages': [{'id': i, 'threadId': i} for i in ids[start:start + size]], 'resultSizeEstimate': len(ids)}
+        if start + size < len(ids):
+            body['nextPageToken'] = str(start + size)
+        return 200, body
+
+    def _list_history(self, query) -> Tuple[int, Dict[str, Any]]:
+        if self.expired_history:
+            return 404, _error(404, 'Requested entity was not found.')
+
+        start_history_id = int(query['startHistoryId'][0])
+        offset = int(query.get('pageToken', ['0'])[0])
+        size = int(query.get('maxResults', ['100'])[0])
+        with self._lock:
+            records = [(history_id, message_id) for history_id, message_id in self.history if history_id > start_history_id]
+            page = records[offset:offset + size]
+            body = {
+                'historyId': str(self.history_id),
+                'history': [
+                    {'id': str(history_id), 'messagesAdded': [{'message': {
+                        'id': message_id, 'threadId': message_id,
+                        'labelIds': self.messages[message_id]['labelIds'],
+                    }}]}
+                    for history_id, message_id in page if message_id in self.messages
+                ],
+            }
+        if offset + size < len(records):
+            body['nextPageToken'] = str(offset + size)
+        return 200, body
+
+    def handle_batch(self, content_type: str, raw: str) -> Tuple[bytes, str]:
+        """Answer a multipart/mixed batch; returns (body, content type)"""
+        boundary = re.search(r'boundary="?([^";]+)"?', content_type).group(1)
+        parts = [part for part in raw.split(f'--{boundary}') if part.strip() and part.strip() != '--']
+        with self._lock:
+            self.requests.append(('POST', BATCH_PATH))
+            self.batch_sizes.append(len(parts))
+
+        out_boundary = 'batch_stub_response'
+        chunks = []
+        for part in parts:
+            content_id = re.search(r'Content-ID: <([^>]+)>', part).group(1)
+            request_line = re.search(r'(GET|POST) (\S+) HTTP/1\.1', part)
+            status, body = self.route(request_line.group(1), request_line.group(2), record=False)
+            payload = json.dumps(body)
+            chunks.append(
+                f'--{out_boundary}\r\nContent-Type: application/http\r\n'
+                f'Content-ID: <response-{content_id}>\r\n\r\n'
+                f'HTTP/1.1 {status} Stub\r\nContent-Type: application/json\r\n'
+                f'Content-Length: {len(payload.encode())}\r\n\r\n{payload}\r\n'
+            )
+        data = (''.join(chunks) + f'--{out_boundary}--\r\n').encode()
+        return data, f'multipart/mixed; boundary={out_boundary}'
+
+
+def _error(code: int, message: str) -> Dict[str, Any]:
+    return {'error': {'code': code, 'message': message, 'errors': [{'reason': message}]}}
+
+
+def _handler_for(stub: GmailStubServer):
+    class GmailStubHandler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, body, content_type: str = 'application/json'):
+            data = body if isinstance(body, bytes) else json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            status, body = stub.route('GET', self.path)
+            self._send(status, body)
+
+        def do_POST(self):
+            raw = self.rfile.read(int(self.headers.get('Content-Length', 0))).decode('utf-8')
+            if not self.path.startswith(BATCH_PATH):
+                return self._send(404, _error(404, 'Not Found'))
+            data, content_type = stub.handle_batch(self.headers['Content-Type'], raw)
+            self._send(200, data, content_type)
+
+    return GmailStubHandler
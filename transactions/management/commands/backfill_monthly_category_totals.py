@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+from authentication.models import User
+from transactions.models import MonthlyCategoryTotal
+from transactions.monthly_service import MonthlyTotalService
+
+
+class Command(BaseCommand):
+    help = 'Build per-category monthly rollups (and per-type counts) for existing transactions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            type=str,
+            help='Only backfill rollups for the user with this email',
+        )
+
+    def handle(self, *args, **options):
+        user = None
+        if options['user']:
+            try:
+                user = User.objects.get(email=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f"User {options['user']} not found")
+
+        self.stdout.write('🔄 Backfilling monthly category totals...')
+
+        # Recomputing every month rewrites MonthlyTotal and its category rows together
+        result = MonthlyTotalService.reconcile_monthly_totals(user=user)
+
+        rows = MonthlyCategoryTotal.objects.all()
+        if user is not None:
+            rows = rows.filter(user=user)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Rebuilt {result['checked']} months "
+                f"({result['corrected']} changed), {rows.count()} category rows stored"
+            )
+        )
@@ -0,0 +1,60 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from transactions.email_text import html_to_text
+from transactions.sample_data import sample_bank_email_html
+
+
+# name -> promotion blocks (small notification, typical, newsletter-sized)
+SIZES = {
+    'small': 2,
+    'typical': 20,
+    'large': 200,
+}
+NO_BUDGET = 1 << 30
+
+
+class Command(BaseCommand):
+    help = (
+        'Time the HTML-to-text extraction of bank notification emails on '
+        'sample bodies of realistic size, with and without the byte budget'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=50, help='Timed runs per case')
+        parser.add_argument('--warmup', type=int, default=5, help='Untimed runs per case')
+        parser.add_argument('--max-bytes', type=int, default=None, help='Byte budget (EMAIL_TEXT_MAX_BYTES if omitted)')
+
+    def handle(self, *args, **options):
+        self.stdout.write('🏁 Benchmarking bank email text extraction')
+
+        for name, promotions in SIZES.items():
+            html = sample_bank_email_html(promotions=promotions)
+            size = len(html.encode('utf-8'))
+            self.stdout.write(self.style.MIGRATE_HEADING(f'\n📧 {name} ({size / 1024:.1f} KB HTML)'))
+
+            for label, max_bytes in (('budget', options['max_bytes']), ('full', NO_BUDGET)):
+                timings, text = self._run(html, max_bytes, options['warmup'], options['repeat'])
+                median = statistics.median(timings)
+                self.stdout.write(
+                    f"   ⏱️ {label:<7} median {median:7.3f} ms   "
+                    f"p95 {timings[min(len(timings) - 1, int(len(timings) * 0.95))]:7.3f} ms   "
+                    f"{size / 1024 / 1024 / (median / 1000):7.1f} MB/s   "
+                    f"{len(text.encode('utf-8')):,} bytes of text"
+                )
+
+        self.stdout.write(self.style.SUCCESS('\n✅ Done'))
+
+    def _run(self, html, max_bytes, warmup, repeat):
+        timings = []
+        text = ''
+        for index in range(warmup + repeat):
+            started = time.perf_counter()
+            text = html_to_text(html, max_bytes)
+            elapsed = (time.perf_counter() - started) * 1000
+            if index >= warmup:
+                timings.append(elapsed)
+        timings.sort()
+        return timings, text
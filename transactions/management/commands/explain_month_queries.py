@@ -0,0 +1,153 @@
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from authentication.models import User
+from transactions.models import Transaction
+from transactions.date_ranges import month_date_filter
+from transactions.summary_service import TransactionSummaryService
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare query plans and timings of year/month filters (EXTRACT) against '
+        'half-open date ranges, without and with the composite Transaction '
+        'indexes. The indexes are dropped and re-created inside the rolled back '
+        'transaction, which locks the table while the command runs.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Insert this many synthetic transactions first (rolled back afterwards)',
+        )
+        parser.add_argument(
+            '--user',
+            type=str,
+            help='Benchmark an existing user by email instead of the synthetic one',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Runs per query for the timing median',
+        )
+
+    def handle(self, *args, **options):
+        # SQLite only edits schemas inside a transaction with foreign key
+        # checks off, and they cannot be turned off once it has started
+        connection.disable_constraint_checking()
+        try:
+            self._run(options)
+        finally:
+            connection.enable_constraint_checking()
+
+        self.stdout.write(self.style.SUCCESS('✅ Done (synthetic data and index changes rolled back)'))
+
+    def _run(self, options):
+        with transaction.atomic():
+            if options['user']:
+                user = User.objects.get(email=options['user'])
+            else:
+                user = self._create_benchmark_user()
+
+            if options['seed']:
+                self._seed(user, options['seed'])
+
+            today = date.today()
+
+            self.stdout.write(self.style.MIGRATE_HEADING('\n🚫 Without the composite indexes'))
+            with connection.schema_editor(atomic=False) as schema_editor:
+                for index in Transaction._meta.indexes:
+                    schema_editor.remove_index(Transaction, index)
+            self._compare(user, today.year, today.month, options['repeat'])
+
+            self.stdout.write(self.style.MIGRATE_HEADING('\n✅ With the composite indexes'))
+            with connection.schema_editor(atomic=False) as schema_editor:
+                for index in Transaction._meta.indexes:
+                    schema_editor.add_index(Transaction, index)
+            self._compare(user, today.year, today.month, options['repeat'])
+
+            # Never keep the synthetic data (or the index changes)
+            transaction.set_rollback(True)
+
+    def _create_benchmark_user(self):
+        return User.objects.create_user(
+            username='explain-month-queries',
+            email='explain-month-queries@example.invalid',
+        )
+
+    def _seed(self, user, count, batch_size=10000):
+        """Spread transactions over ~3 years for the user plus noise users"""
+        self.stdout.write(f'🌱 Seeding {count:,} transactions...')
+
+        noise_users = [
+            User.objects.create_user(
+                username=f'explain-month-noise-{i}',
+                email=f'explain-month-noise-{i}@example.invalid',
+            )
+            for i in range(9)
+        ]
+        owners = [user] + noise_users
+        types = ['expense', 'expense', 'expense', 'saving', 'investment']
+        categories = [choice for choice, _ in Transaction.EXPENSE_CATEGORIES]
+        start = date.today() - timedelta(days=3 * 365)
+
+        created = 0
+        while created < count:
+            batch = []
+            for _ in range(min(batch_size, count - created)):
+                transaction_type = random.choice(types)
+                batch.append(Transaction(
+                    user=random.choice(owners),
+                    transaction_type=transaction_type,
+                    amount=-random.randint(10, 500) * 1000 if transaction_type == 'expense'
+                    else random.randint(100, 5000) * 1000,
+                    description='benchmark',
+                    date=start + timedelta(days=random.randint(0, 3 * 365)),
+                    expense_category=random.choice(categories) if transaction_type == 'expense' else None,
+                ))
+            Transaction.objects.bulk_create(batch)
+            created += len(batch)
+            self.stdout.write(f'   {created:,}/{count:,}')
+
+    def _compare(self, user, year, month, repeat):
+        legacy = {'date__year': year, 'date__month': month}
+        ranged = month_date_filter(year, month)
+
+        scenarios = [
+            (
+                'Month list (first page)',
+                lambda filters: Transaction.objects.filter(user=user, **filters).order_by('-date', '-created_at')[:20],
+            ),
+            (
+                'Month expenses',
+                lambda filters: Transaction.objects.filter(user=user, transaction_type='expense', **filters),
+            ),
+        ]
+
+        for name, build in scenarios:
+            self.stdout.write(self.style.MIGRATE_HEADING(f'\n📊 {name}'))
+            for label, filters in (('year/month', legacy), ('date range', ranged)):
+                queryset = build(filters)
+                self.stdout.write(f'\n--- {label} ---')
+                self.stdout.write(queryset.explain())
+                self.stdout.write(f'⏱️ median {self._time(lambda: list(queryset.all()), repeat):.2f} ms')
+
+        self.stdout.write(self.style.MIGRATE_HEADING('\n📊 Month summary'))
+        for label, filters in (('year/month', legacy), ('date range', ranged)):
+            queryset = Transaction.objects.filter(user=user, **filters)
+            elapsed = self._time(lambda: TransactionSummaryService.summarize_queryset(queryset), repeat)
+            self.stdout.write(f'⏱️ {label}: median {elapsed:.2f} ms')
+
+    def _time(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from transactions.gmail_stub import GmailStubServer
+
+
+class Command(BaseCommand):
+    help = (
+        'Serve a local Gmail API stub with sample bank emails. Set '
+        'GMAIL_API_ENDPOINT to the printed URL to run syncs against it.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', type=str, default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--messages', type=int, default=1200, help='Sample bank emails to serve')
+
+    def handle(self, *args, **options):
+        stub = GmailStubServer(options['host'], options['port'])
+        stub.seed(options['messages'])
+
+        self.stdout.write(f"📬 Gmail stub serving {options['messages']:,} sample bank emails")
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ GMAIL_API_ENDPOINT=http://{options['host']}:{options['port']}  (Ctrl+C to stop)"
+        ))
+        try:
+            stub.serve_forever()
+        except KeyboardInterrupt:
+            self.stdout.write('👋 Gmail stub stopped')
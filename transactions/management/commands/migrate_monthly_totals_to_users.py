@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 from django.db import transaction
 from transactions.models import MonthlyTotal, Transaction
+from transactions.date_ranges import month_date_filter
 from authentication.models import User
 from django.utils.translation import gettext as _
 
@@ -113,8 +114,7 @@ class Command(BaseCommand):
         
         transactions = Transaction.objects.filter(
             user=user,
-            date__year=year,
-            date__month=month
+            **month_date_filter(year, month)
         )
         
         # Calculate totals
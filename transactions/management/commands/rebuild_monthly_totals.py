@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from transactions.monthly_service import MonthlyTotalService, REBUILD_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Rebuild all monthly totals and category rollups with set-based queries'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=REBUILD_CHUNK_SIZE,
+            help='Number of users rebuilt per grouped query',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('🔄 Rebuilding monthly totals...')
+
+        def progress(processed_users, total_users, updated_months):
+            self.stdout.write(
+                f'   📊 {processed_users}/{total_users} users, {updated_months} months'
+            )
+
+        updated_count = MonthlyTotalService.refresh_all_monthly_totals(
+            progress=progress,
+            chunk_size=options['chunk_size']
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ Rebuilt {updated_count} monthly totals')
+        )
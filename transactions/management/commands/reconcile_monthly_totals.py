@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+from authentication.models import User
+from transactions.monthly_service import MonthlyTotalService
+
+
+class Command(BaseCommand):
+    help = 'Recompute monthly and daily totals from transactions to repair drift from incremental updates'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            type=str,
+            help='Only reconcile totals for the user with this email',
+        )
+
+    def handle(self, *args, **options):
+        user = None
+        if options['user']:
+            try:
+                user = User.objects.get(email=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f"User {options['user']} not found")
+
+        self.stdout.write('🔄 Reconciling monthly totals...')
+
+        result = MonthlyTotalService.reconcile_monthly_totals(user=user)
+
+        if result['corrected'] or result['corrected_days']:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"⚠️ Corrected {result['corrected']} of {result['checked']} monthly totals and "
+                    f"{result['corrected_days']} of {result['checked_days']} daily totals"
+                )
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"✅ All {result['checked']} monthly totals and {result['checked_days']} daily totals are consistent"
+                )
+            )
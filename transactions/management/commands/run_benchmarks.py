@@ -0,0 +1,179 @@
+import json
+import platform
+import statistics
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.test import APIClient
+
+from authentication.models import User
+from expense_tracker.query_budget import QueryRecorder
+from transactions.data_version import DataVersionService
+from transactions.models import Transaction
+from transactions.sample_data import SAMPLE_EXPENSES
+
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / 'benchmarks' / 'baseline.json'
+BULK_IMPORT_SIZE = 100
+
+
+class Command(BaseCommand):
+    help = (
+        'Time the hot API endpoints against data from seed_benchmark_data and '
+        'compare median time and query count with a stored baseline. Every run '
+        'starts from a new data version (no conditional/month cache hits) and '
+        'is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--prefix', type=str, default='bench', help='Prefix used by seed_benchmark_data')
+        parser.add_argument('--repeat', type=int, default=10, help='Timed runs per scenario')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed runs per scenario')
+        parser.add_argument('--scenario', action='append', help='Only run these scenarios (repeatable)')
+        parser.add_argument('--baseline', type=str, default=str(DEFAULT_BASELINE), help='Baseline JSON file')
+        parser.add_argument('--save', action='store_true', help='Store the results as the new baseline')
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=0.25,
+            help='Allowed median slowdown against the baseline (0.25 = 25%%)',
+        )
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(email=f"{options['prefix']}-0@example.invalid").first()
+        if user is None:
+            raise CommandError('No benchmark data found, run "manage.py seed_benchmark_data" first')
+
+        client = APIClient()
+        client.force_authenticate(user)
+
+        scenarios = self._scenarios(user)
+        if options['scenario']:
+            unknown = set(options['scenario']) - set(scenarios)
+            if unknown:
+                raise CommandError(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+            scenarios = {name: scenarios[name] for name in options['scenario']}
+
+        dataset = {
+            'users': User.objects.filter(username__startswith=f"{options['prefix']}-").count(),
+            'user_transactions': Transaction.objects.filter(user=user).count(),
+        }
+        self.stdout.write(
+            f"🏁 Benchmarking as {user.email} ({dataset['user_transactions']:,} transactions, "
+            f"{dataset['users']} users)"
+        )
+
+        results = {}
+        for name, (method, path, payload) in scenarios.items():
+            results[name] = self._run(client, user, method, path, payload, options['warmup'], options['repeat'])
+            result = results[name]
+            self.stdout.write(
+                f"   ⏱️ {name:<18} median {result['median_ms']:8.2f} ms   "
+                f"p95 {result['p95_ms']:8.2f} ms   {result['queries']:3d} queries"
+            )
+
+        baseline_path = Path(options['baseline'])
+        if options['save']:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps({
+                'machine': platform.platform(),
+                'python': platform.python_version(),
+                'database': settings.DATABASES['default']['ENGINE'].rsplit('.', 1)[-1],
+                'dataset': dataset,
+                'results': results,
+            }, indent=2) + '\n')
+            self.stdout.write(self.style.SUCCESS(f'✅ Baseline saved to {baseline_path}'))
+            return
+
+        if not baseline_path.exists():
+            self.stdout.write(self.style.WARNING(f'⚠️ No baseline at {baseline_path}, run with --save to create one'))
+            return
+
+        self._compare(json.loads(baseline_path.read_text()), dataset, results, options['threshold'])
+
+    def _scenarios(self, user):
+        """name -> (method, path, payload)"""
+        today = date.today()
+        bulk_items = [
+            {
+                'transaction_type': 'expense',
+                'amount': sample['amount'],
+                'description': str(sample['description']),
+                'expense_category': sample['category'],
+                'date': (today - timedelta(days=index % 60)).isoformat(),
+            }
+            for index, sample in enumerate(SAMPLE_EXPENSES * (BULK_IMPORT_SIZE // len(SAMPLE_EXPENSES)))
+        ]
+        return {
+            'monthly_totals': ('get', '/api/monthly-totals/', None),
+            'calendar_data': ('get', f'/api/calendar-data/?year={today.year}&month={today.month}', None),
+            'future_projection': ('get', '/api/future-projection/?months=12', None),
+            'statistics': ('get', '/api/transactions/statistics/', None),
+            'sync_history': ('get', '/api/bank-integration/sync-history/', None),
+            'transaction_list': ('get', '/api/transactions/', None),
+            'bulk_import': ('post', '/api/transactions/bulk/', bulk_items),
+        }
+
+    def _run(self, client, user, method, path, payload, warmup, repeat):
+        timings = []
+        queries = 0
+        for index in range(warmup + repeat):
+            # New version: no ETag or month view cache hits, every run does the real work
+            DataVersionService.bump(user.id)
+            with transaction.atomic():
+                with QueryRecorder() as recorder:
+                    started = time.perf_counter()
+                    if method == 'post':
+                        response = client.post(path, payload, format='json')
+                    else:
+                        response = client.get(path)
+                    elapsed = (time.perf_counter() - started) * 1000
+                transaction.set_rollback(True)
+
+            if response.status_code not in (200, 201):
+                raise CommandError(f'{method.upper()} {path} returned {response.status_code}')
+            if index >= warmup:
+                timings.append(elapsed)
+                queries = recorder.count
+
+        timings.sort()
+        return {
+            'median_ms': round(statistics.median(timings), 3),
+            'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+            'min_ms': round(timings[0], 3),
+            'queries': queries,
+        }
+
+    def _compare(self, baseline, dataset, results, threshold):
+        if baseline.get('dataset') != dataset:
+            self.stdout.write(self.style.WARNING(
+                f"⚠️ Dataset differs from the baseline ({baseline.get('dataset')}), timings are not comparable"
+            ))
+
+        regressions = []
+        self.stdout.write(self.style.MIGRATE_HEADING('\n📊 Against baseline'))
+        for name, result in results.items():
+            base = baseline['results'].get(name)
+            if base is None:
+                self.stdout.write(f'   ➕ {name}: no baseline')
+                continue
+
+            ratio = result['median_ms'] / base['median_ms'] if base['median_ms'] else 1.0
+            slower = ratio > 1 + threshold
+            more_queries = result['queries'] > base['queries']
+            marker = '❌' if slower or more_queries else '✅'
+            self.stdout.write(
+                f"   {marker} {name:<18} {ratio:6.2f}x median "
+                f"({base['median_ms']:.2f} → {result['median_ms']:.2f} ms), "
+                f"queries {base['queries']} → {result['queries']}"
+            )
+            if slower or more_queries:
+                regressions.append(name)
+
+        if regressions:
+            raise CommandError(f"Performance regression in: {', '.join(regressions)}")
+        self.stdout.write(self.style.SUCCESS('✅ No regressions'))
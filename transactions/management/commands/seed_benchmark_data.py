@@ -0,0 +1,144 @@
+import random
+from datetime import date, datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from ai_chat.models import ChatMessage
+from authentication.models import User
+from transactions.bulk_service import TransactionBulkService
+from transactions.models import BankEmailTransaction, Transaction, UserBankConfig
+from transactions.monthly_service import MonthlyTotalService
+from transactions.sample_data import (
+    SAMPLE_BANK_EMAILS, SAMPLE_CHAT_MESSAGES, SAMPLE_EXPENSES, SAMPLE_INVESTMENTS, SAMPLE_SAVINGS
+)
+
+
+BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed synthetic users with realistic transactions, bank email records '
+        'and chat messages (shapes from the demo account) for run_benchmarks'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10, help='Number of users')
+        parser.add_argument('--years', type=int, default=2, help='Years of history per user, ending today')
+        parser.add_argument('--per-month', type=int, default=60, help='Transactions per user and month')
+        parser.add_argument('--prefix', type=str, default='bench', help='Username/email prefix of the synthetic users')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed (same seed, same data)')
+        parser.add_argument('--clear', action='store_true', help='Delete existing users with the prefix first')
+
+    def handle(self, *args, **options):
+        prefix = options['prefix']
+        existing = User.objects.filter(username__startswith=f'{prefix}-', email__endswith='@example.invalid')
+        if existing.exists():
+            if not options['clear']:
+                raise CommandError(f'Users with prefix "{prefix}" already exist, use --clear to replace them')
+            deleted_count = existing.count()
+            existing.delete()
+            self.stdout.write(f'🗑️ Deleted {deleted_count} existing {prefix} users')
+
+        rng = random.Random(options['seed'])
+        months = self._months(options['years'])
+
+        with transaction.atomic():
+            users = [
+                User.objects.create_user(username=f'{prefix}-{i}', email=f'{prefix}-{i}@example.invalid')
+                for i in range(options['users'])
+            ]
+            for index, user in enumerate(users, 1):
+                created = self._seed_user(user, months, options['per_month'], rng)
+                self.stdout.write(
+                    f'   🌱 {index}/{len(users)} {user.email}: {created[0]:,} transactions, '
+                    f'{created[1]:,} bank emails, {created[2]:,} chat messages'
+                )
+
+            self.stdout.write('🔄 Rebuilding monthly totals...')
+            updated_count = MonthlyTotalService.rebuild_monthly_totals([user.id for user in users])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Seeded {len(users)} users over {len(months)} months ({updated_count} monthly totals)'
+        ))
+
+    def _months(self, years):
+        """(year, month) of the last `years` years, oldest first, ending with the current month"""
+        today = date.today()
+        months = []
+        year, month = today.year, today.month
+        for _ in range(years * 12):
+            months.append((year, month))
+            year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+        return months[::-1]
+
+    def _random_day(self, year, month, rng):
+        today = date.today()
+        last_day = today.day if (year, month) == (today.year, today.month) else 28
+        return date(year, month, rng.randint(1, last_day))
+
+    def _jitter(self, amount, rng):
+        """Vary a sample amount by ±50%, rounded to 1,000₫"""
+        return max(1000, round(amount * rng.uniform(0.5, 1.5), -3))
+
+    def _seed_user(self, user, months, per_month, rng):
+        transactions = []
+        for year, month in months:
+            for index in range(per_month):
+                # Roughly 1 saving and 1 investment per 10 transactions
+                if index % 10 == 0:
+                    sample, transaction_type = rng.choice(SAMPLE_SAVINGS), 'saving'
+                elif index % 10 == 1:
+                    sample, transaction_type = rng.choice(SAMPLE_INVESTMENTS), 'investment'
+                else:
+                    sample, transaction_type = rng.choice(SAMPLE_EXPENSES), 'expense'
+
+                transactions.append(TransactionBulkService.build(user, {
+                    'transaction_type': transaction_type,
+                    'amount': self._jitter(sample['amount'], rng),
+                    'description': str(sample['description']),
+                    'expense_category': sample.get('category'),
+                    'date': self._random_day(year, month, rng),
+                    'ai_confidence': 0.9,
+                }, validate=False))
+        Transaction.objects.bulk_create(transactions, batch_size=BATCH_SIZE)
+
+        bank_config = UserBankConfig.objects.create(user=user, bank_code='tpbank', is_enabled=True)
+        emails = []
+        for year, month in months:
+            for index in range(max(1, per_month // 4)):
+                sample = rng.choice(SAMPLE_BANK_EMAILS)
+                day = self._random_day(year, month, rng)
+                emails.append(BankEmailTransaction(
+                    user=user,
+                    bank_config=bank_config,
+                    email_message_id=f'{user.username}-{year}{month:02d}-{index}',
+                    email_date=timezone.make_aware(datetime.combine(day, time(9, 30))),
+                    email_subject='TPBank: Thông báo biến động số dư',
+                    transaction_type=sample['transaction_type'],
+                    amount=sample['amount'],
+                    description=sample['description'],
+                    date=day,
+                    expense_category=sample['category'],
+                    ai_confidence=0.95,
+                    is_processed=rng.random() < 0.5,
+                ))
+        BankEmailTransaction.objects.bulk_create(emails, batch_size=BATCH_SIZE)
+
+        messages = []
+        for year, month in months:
+            for _ in range(max(1, per_month // 10)):
+                user_message, ai_response, language = rng.choice(SAMPLE_CHAT_MESSAGES)
+                messages.append(ChatMessage(
+                    user=user,
+                    user_message=user_message,
+                    ai_response=ai_response,
+                    language=language,
+                    is_confirmed=True,
+                    parsed_date=self._random_day(year, month, rng),
+                ))
+        ChatMessage.objects.bulk_create(messages, batch_size=BATCH_SIZE)
+
+        return len(transactions), len(emails), len(messages)
@@ -2,6 +2,7 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 from datetime import date, timedelta
 from transactions.models import Transaction, MonthlyTotal
+from transactions.date_ranges import month_date_filter
 from ai_chat.models import ChatMessage
 
 
@@ -103,8 +104,7 @@ class Command(BaseCommand):
         from django.db.models import Sum
         
         current_month_transactions = Transaction.objects.filter(
-            date__year=today.year,
-            date__month=today.month
+            **month_date_filter(today.year, today.month)
         )
         
         expense_total = abs(current_month_transactions.filter(
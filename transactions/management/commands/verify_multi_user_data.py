@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 from django.db import transaction
 from transactions.models import MonthlyTotal, Transaction
+from transactions.date_ranges import month_date_filter
 from authentication.models import User
 from django.utils.translation import gettext as _
 from datetime import date, timedelta
@@ -135,8 +136,7 @@ class Command(BaseCommand):
             # Manually calculate expected totals
             transactions = Transaction.objects.filter(
                 user=user,
-                date__year=now.year,
-                date__month=now.month
+                **month_date_filter(now.year, now.month)
             )
             
             expected_expense = abs(sum(t.amount for t in transactions if t.transaction_type == 'expense'))
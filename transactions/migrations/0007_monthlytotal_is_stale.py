@@ -0,0 +1,18 @@
+# Generated by Django 5.2.2 on 2026-10-17 06:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0006_add_custom_bank_support'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='monthlytotal',
+            name='is_stale',
+            field=models.BooleanField(default=False, verbose_name='Is Stale'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.2 on 2026-10-17 06:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def mark_monthly_totals_stale(apps, schema_editor):
+    """Existing rows have no per-type counts or category rows yet"""
+    MonthlyTotal = apps.get_model('transactions', 'MonthlyTotal')
+    MonthlyTotal.objects.update(is_stale=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0007_monthlytotal_is_stale'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='monthlytotal',
+            name='expense_count',
+            field=models.IntegerField(default=0, verbose_name='Expense Count'),
+        ),
+        migrations.AddField(
+            model_name='monthlytotal',
+            name='investment_count',
+            field=models.IntegerField(default=0, verbose_name='Investment Count'),
+        ),
+        migrations.AddField(
+            model_name='monthlytotal',
+            name='saving_count',
+            field=models.IntegerField(default=0, verbose_name='Saving Count'),
+        ),
+        migrations.CreateModel(
+            name='MonthlyCategoryTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField(verbose_name='Year')),
+                ('month', models.IntegerField(verbose_name='Month')),
+                ('category', models.CharField(choices=[('food', '🍜 Ăn uống'), ('coffee', '☕ Coffee'), ('transport', '🚗 Di chuyển'), ('shopping', '🛒 Mua sắm'), ('entertainment', '🎬 Giải trí'), ('health', '🏥 Sức khỏe'), ('education', '📚 Giáo dục'), ('utilities', '⚡ Tiện ích'), ('other', '📦 Khác')], max_length=20, verbose_name='Expense Category')),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Amount')),
+                ('transaction_count', models.IntegerField(default=0, verbose_name='Transaction Count')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Last Updated')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_category_totals', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Monthly Category Total',
+                'verbose_name_plural': 'Monthly Category Totals',
+                'ordering': ['-year', '-month', '-amount'],
+                'indexes': [models.Index(fields=['user', 'year', 'month'], name='transaction_user_id_ac5b2f_idx')],
+                'unique_together': {('user', 'year', 'month', 'category')},
+            },
+        ),
+        migrations.RunPython(mark_monthly_totals_stale, migrations.RunPython.noop),
+    ]
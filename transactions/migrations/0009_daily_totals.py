@@ -0,0 +1,44 @@
+# Generated by Django 5.2.2 on 2026-10-17 07:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def mark_monthly_totals_stale(apps, schema_editor):
+    """Daily rows are built when a stale month is recomputed"""
+    MonthlyTotal = apps.get_model('transactions', 'MonthlyTotal')
+    MonthlyTotal.objects.update(is_stale=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0008_monthly_category_totals'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Date')),
+                ('expense_amount', models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Expense Amount')),
+                ('saving_amount', models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Saving Amount')),
+                ('investment_amount', models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Investment Amount')),
+                ('expense_count', models.IntegerField(default=0, verbose_name='Expense Count')),
+                ('saving_count', models.IntegerField(default=0, verbose_name='Saving Count')),
+                ('investment_count', models.IntegerField(default=0, verbose_name='Investment Count')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Last Updated')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_totals', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Daily Total',
+                'verbose_name_plural': 'Daily Totals',
+                'ordering': ['-date'],
+                'unique_together': {('user', 'date')},
+            },
+        ),
+        migrations.RunPython(mark_monthly_totals_stale, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.2 on 2026-10-17 07:13
+
+from django.db import migrations, models
+
+from transactions.search import build_search_text, install_search_index, uninstall_search_index
+
+
+def backfill_search_text(apps, schema_editor):
+    Transaction = apps.get_model('transactions', 'Transaction')
+    batch = []
+    for transaction in Transaction.objects.only('id', 'description', 'expense_category').iterator(chunk_size=2000):
+        transaction.search_text = build_search_text(transaction.description, transaction.expense_category)
+        batch.append(transaction)
+        if len(batch) >= 2000:
+            Transaction.objects.bulk_update(batch, ['search_text'])
+            batch = []
+    if batch:
+        Transaction.objects.bulk_update(batch, ['search_text'])
+
+
+def create_search_index(apps, schema_editor):
+    install_search_index(schema_editor.connection)
+
+
+def drop_search_index(apps, schema_editor):
+    uninstall_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0010_transaction_date_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='search_text',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255, verbose_name='Search Text'),
+        ),
+        migrations.RunPython(backfill_search_text, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
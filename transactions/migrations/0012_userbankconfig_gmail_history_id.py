@@ -0,0 +1,18 @@
+# Generated by Django 5.2.2 on 2026-10-17 08:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0011_transaction_search_text'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userbankconfig',
+            name='gmail_history_id',
+            field=models.CharField(blank=True, help_text='Gmail historyId checkpoint for incremental syncs', max_length=32, null=True),
+        ),
+    ]
@@ -3,6 +3,7 @@ from django.utils.translation import gettext_lazy as _
 from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta
+from .search import build_search_text
 
 
 class Transaction(models.Model):
@@ -29,6 +30,16 @@ class Transaction(models.Model):
         ('other', _('📦 Khác')),
     ]
     
+    CATEGORY_ICONS = {
+        'food': '🍜', 'coffee': '☕', 'transport': '🚗',
+        'shopping': '🛒', 'entertainment': '🎬', 'health': '🏥',
+        'education': '📚', 'utilities': '⚡', 'other': '📦'
+    }
+    TYPE_ICONS = {
+        'saving': '💰',
+        'investment': '📈',
+    }
+    
     # Core fields
     transaction_type = models.CharField(
         max_length=20, 
@@ -44,6 +55,14 @@ class Transaction(models.Model):
         max_length=200,
         verbose_name=_('Description')
     )
+    # Lowercase description + category without diacritics, see transactions.search
+    search_text = models.CharField(
+        max_length=255,
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name=_('Search Text')
+    )
     date = models.DateField(
         verbose_name=_('Date')
     )
@@ -83,6 +102,10 @@ class Transaction(models.Model):
         verbose_name = _('Transaction')
         verbose_name_plural = _('Transactions')
         ordering = ['-date', '-created_at']
+        indexes = [
+            models.Index(fields=['user', 'date', 'created_at']),  # Month ranges + default ordering
+            models.Index(fields=['user', 'transaction_type', 'date']),  # Per-type ranges
+        ]
     
     def __str__(self):
         return f"{self.get_transaction_type_display()} - {self.amount:,}₫ - {self.date}"
@@ -90,20 +113,19 @@ class Transaction(models.Model):
     def get_icon(self):
         """Get icon based on transaction type and category"""
         if self.transaction_type == 'expense':
-            category_icons = {
-                'food': '🍜', 'coffee': '☕', 'transport': '🚗',
-                'shopping': '🛒', 'entertainment': '🎬', 'health': '🏥',
-                'education': '📚', 'utilities': '⚡', 'other': '📦'
-            }
-            return category_icons.get(self.expense_category, '📦')
-        elif self.transaction_type == 'saving':
-            return '💰'
-        elif self.transaction_type == 'investment':
-            return '📈'
-        return '💰'
+            return self.CATEGORY_ICONS.get(self.expense_category, '📦')
+        return self.TYPE_ICONS.get(self.transaction_type, '💰')
     
     def save(self, *args, **kwargs):
         """Override save to ensure category logic"""
+        self.normalize()
+        super().save(*args, **kwargs)
+    
+    def normalize(self):
+        """
+        Apply the field rules enforced on save.
+        Called directly for bulk_create(), which bypasses save().
+        """
         # Clear expense_category if not an expense
         if self.transaction_type != 'expense':
             self.expense_category = None
@@ -114,7 +136,8 @@ class Transaction(models.Model):
         elif self.transaction_type in ['saving', 'investment'] and self.amount < 0:
             self.amount = abs(self.amount)
         
-        super().save(*args, **kwargs)
+        # Keep the diacritic-free search document in sync
+        self.search_text = build_search_text(self.description, self.expense_category)
 
 
 class MonthlyTotal(models.Model):
@@ -155,6 +178,16 @@ class MonthlyTotal(models.Model):
         verbose_name=_('Investment Amount')
     )
     transaction_count = models.IntegerField(default=0)
+    expense_count = models.IntegerField(default=0, verbose_name=_('Expense Count'))
+    saving_count = models.IntegerField(default=0, verbose_name=_('Saving Count'))
+    investment_count = models.IntegerField(default=0, verbose_name=_('Investment Count'))
+    
+    # Set when transactions change outside the incremental update path;
+    # the next read recomputes the row instead of trusting it
+    is_stale = models.BooleanField(
+        default=False,
+        verbose_name=_('Is Stale')
+    )
     
     updated_at = models.DateTimeField(
         auto_now=True,
@@ -175,6 +208,144 @@ class MonthlyTotal(models.Model):
         return f"{self.user.email} - {self.year}/{self.month:02d} - Total: {self.total_amount:,.0f}₫" 
 
 
+class MonthlyCategoryTotal(models.Model):
+    """Track monthly expense totals per category for breakdowns"""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='monthly_category_totals',
+        verbose_name=_('User')
+    )
+    
+    year = models.IntegerField(verbose_name=_('Year'))
+    month = models.IntegerField(verbose_name=_('Month'))
+    category = models.CharField(
+        max_length=20,
+        choices=Transaction.EXPENSE_CATEGORIES,
+        verbose_name=_('Expense Category')
+    )
+    
+    amount = models.DecimalField(
+        max_digits=15, 
+        decimal_places=2, 
+        default=0,
+        verbose_name=_('Amount')
+    )
+    transaction_count = models.IntegerField(default=0, verbose_name=_('Transaction Count'))
+    
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_('Last Updated')
+    )
+    
+    class Meta:
+        unique_together = ['user', 'year', 'month', 'category']
+        verbose_name = _('Monthly Category Total')
+        verbose_name_plural = _('Monthly Category Totals')
+        ordering = ['-year', '-month', '-amount']
+        indexes = [
+            models.Index(fields=['user', 'year', 'month']),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.email} - {self.year}/{self.month:02d} - {self.category}: {self.amount:,.0f}₫"
+
+
+class DailyTotal(models.Model):
+    """Track daily totals per transaction type for calendar views"""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='daily_totals',
+        verbose_name=_('User')
+    )
+    
+    date = models.DateField(verbose_name=_('Date'))
+    
+    expense_amount = models.DecimalField(
+        max_digits=15, 
+        decimal_places=2, 
+        default=0,
+        verbose_name=_('Expense Amount')
+    )
+    saving_amount = models.DecimalField(
+        max_digits=15, 
+        decimal_places=2, 
+        default=0,
+        verbose_name=_('Saving Amount')
+    )
+    investment_amount = models.DecimalField(
+        max_digits=15, 
+        decimal_places=2, 
+        default=0,
+        verbose_name=_('Investment Amount')
+    )
+    expense_count = models.IntegerField(default=0, verbose_name=_('Expense Count'))
+    saving_count = models.IntegerField(default=0, verbose_name=_('Saving Count'))
+    investment_count = models.IntegerField(default=0, verbose_name=_('Investment Count'))
+    
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_('Last Updated')
+    )
+    
+    class Meta:
+        unique_together = ['user', 'date']
+        verbose_name = _('Daily Total')
+        verbose_name_plural = _('Daily Totals')
+        ordering = ['-date']
+    
+    def __str__(self):
+        return f"{self.user.email} - {self.date} - {self.transaction_count} transactions"
+    
+    @property
+    def transaction_count(self):
+        return self.expense_count + self.saving_count + self.investment_count
+    
+    @property
+    def total_amount(self):
+        """Total money moved (expense + saving + investment)"""
+        return self.expense_amount + self.saving_amount + self.investment_amount
+
+
+class BackgroundJob(models.Model):
+    """Status and progress of a maintenance job run by BackgroundJobService"""
+    STATUS_CHOICES = [
+        ('queued', _('Queued')),
+        ('running', _('Running')),
+        ('completed', _('Completed')),
+        ('failed', _('Failed')),
+    ]
+    
+    job_id = models.CharField(max_length=32, unique=True, verbose_name=_('Job ID'))
+    name = models.CharField(max_length=100, verbose_name=_('Name'))
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='queued',
+        verbose_name=_('Status')
+    )
+    progress = models.JSONField(default=dict, blank=True, verbose_name=_('Progress'))
+    result = models.JSONField(null=True, blank=True, verbose_name=_('Result'))
+    error = models.TextField(null=True, blank=True, verbose_name=_('Error'))
+    
+    started_at = models.DateTimeField(auto_now_add=True, verbose_name=_('Started At'))
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_('Last Updated'))
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name=_('Finished At'))
+    
+    class Meta:
+        verbose_name = _('Background Job')
+        verbose_name_plural = _('Background Jobs')
+        ordering = ['-started_at']
+    
+    def __str__(self):
+        return f"{self.name} ({self.job_id}) - {self.status}"
+    
+    @property
+    def is_finished(self):
+        return self.status in ('completed', 'failed')
+
+
 # =============================================================================
 # BANK INTEGRATION MODELS (Phase 1 - Gmail Bank Integration)
 # =============================================================================
@@ -328,6 +499,8 @@ class UserBankConfig(models.Model):
     last_successful_sync = models.DateTimeField(null=True, blank=True)
     sync_error_count = models.IntegerField(default=0)
     last_sync_error = models.TextField(blank=True, null=True)
+    gmail_history_id = models.CharField(max_length=32, blank=True, null=True,
+                                        help_text="Gmail historyId checkpoint for incremental syncs")
     
     # Email processing settings
     sender_email_pattern = models.CharField(max_length=255, blank=True, null=True,
@@ -1,9 +1,77 @@
-from django.db.models import Sum, Q
+from django.db import transaction as db_transaction
+from django.db.models import Q, F
+from django.utils import timezone
+from collections import defaultdict
 from datetime import datetime
 from decimal import Decimal
-from .models import Transaction, MonthlyTotal
+from .models import Transaction, MonthlyTotal, MonthlyCategoryTotal, DailyTotal
+from .summary_service import TransactionSummary, TransactionSummaryService
+from .date_ranges import month_date_filter
+from .data_version import DataVersionService
+from .events import publish_totals_changed
+from .signals import transactions_changed
+from expense_tracker.profiling import phase_timer
 
 
+# Maps transaction_type to the MonthlyTotal field that accumulates it
+TYPE_AMOUNT_FIELDS = {
+    'expense': 'expense_amount',
+    'saving': 'saving_amount',
+    'investment': 'investment_amount',
+}
+
+# Maps transaction_type to the MonthlyTotal field that counts it
+TYPE_COUNT_FIELDS = {
+    'expense': 'expense_count',
+    'saving': 'saving_count',
+    'investment': 'investment_count',
+}
+
+COUNT_FIELDS = {'transaction_count', *TYPE_COUNT_FIELDS.values()}
+
+# Users per grouped query and rows per INSERT when rebuilding all totals
+REBUILD_CHUNK_SIZE = 200
+REBUILD_BATCH_SIZE = 500
+
+
+def _monthly_values(row):
+    """Comparable totals of a MonthlyTotal row (amounts and counts)"""
+    return (
+        row.expense_amount, row.saving_amount, row.investment_amount, row.total_amount,
+        row.transaction_count, row.expense_count, row.saving_count, row.investment_count
+    )
+
+
+def _daily_values(row):
+    """Comparable totals of a DailyTotal row (amounts and counts)"""
+    return (
+        row.expense_amount, row.saving_amount, row.investment_amount,
+        row.expense_count, row.saving_count, row.investment_count
+    )
+
+
+def transaction_state(transaction):
+    """
+    Capture the fields of a transaction that feed the monthly totals.
+    
+    Take the snapshot *before* saving/deleting so the old values can be
+    subtracted when the transaction changes.
+    
+    Args:
+        transaction (Transaction): Transaction instance
+        
+    Returns:
+        dict: Snapshot with type, amount, date and category
+    """
+    return {
+        'transaction_type': transaction.transaction_type,
+        # Amounts are stored without decimals; round like the DB column does
+        'amount': Decimal(str(transaction.amount)).quantize(Decimal('1')),
+        'date': transaction.date,
+        'expense_category': transaction.expense_category,
+    }
+
+@phase_timer('monthly_totals')
 class MonthlyTotalService:
     """
     Service for calculating and managing monthly totals.
@@ -25,25 +93,25 @@ class MonthlyTotalService:
         # Get all transactions for the user and month
         transactions = Transaction.objects.filter(
             user=user,  # CRITICAL: Filter by user
-            date__year=year,
-            date__month=month
+            **month_date_filter(year, month)
         )
         
-        # Calculate totals
-        expense_total = abs(transactions.filter(
-            transaction_type='expense'
-        ).aggregate(total=Sum('amount'))['total'] or 0)
-        
-        saving_total = abs(transactions.filter(
-            transaction_type='saving'
-        ).aggregate(total=Sum('amount'))['total'] or 0)
+        # Calculate monthly and daily totals in a single pass
+        rows = transactions.order_by().values('date', 'expense_category').annotate(
+            **TransactionSummaryService.aggregates()
+        )
+        summary = TransactionSummary()
+        daily_summaries = defaultdict(TransactionSummary)
+        for row in rows:
+            summary.add_row(row)
+            daily_summaries[row['date']].add_row(row)
         
-        investment_total = abs(transactions.filter(
-            transaction_type='investment'
-        ).aggregate(total=Sum('amount'))['total'] or 0)
+        expense_total = summary.expense_total
+        saving_total = summary.saving_total
+        investment_total = summary.investment_total
         
         # Calculate net total (tổng của tất cả loại giao dịch)
-        net_total = expense_total + saving_total + investment_total
+        net_total = summary.gross_total
         
         # Create or update MonthlyTotal record
         monthly_total, created = MonthlyTotal.objects.get_or_create(
@@ -55,7 +123,10 @@ class MonthlyTotalService:
                 'saving_amount': saving_total,
                 'investment_amount': investment_total,
                 'total_amount': net_total,
-                'transaction_count': transactions.count()
+                'transaction_count': summary.transaction_count,
+                'expense_count': summary.expense_count,
+                'saving_count': summary.saving_count,
+                'investment_count': summary.investment_count
             }
         )
         
@@ -65,11 +136,424 @@ class MonthlyTotalService:
             monthly_total.saving_amount = saving_total
             monthly_total.investment_amount = investment_total
             monthly_total.total_amount = net_total
-            monthly_total.transaction_count = transactions.count()
+            monthly_total.transaction_count = summary.transaction_count
+            monthly_total.expense_count = summary.expense_count
+            monthly_total.saving_count = summary.saving_count
+            monthly_total.investment_count = summary.investment_count
+            monthly_total.is_stale = False
             monthly_total.save()
         
+        MonthlyTotalService._store_category_totals(user, year, month, summary)
+        MonthlyTotalService._store_daily_totals(
+            user,
+            DailyTotal.objects.filter(user=user, **month_date_filter(year, month)),
+            daily_summaries
+        )
+        
+        return monthly_total
+    
+    @staticmethod
+    def _store_category_totals(user, year, month, summary):
+        """
+        Replace the per-category rollup rows of one month.
+        
+        Args:
+            user: User instance
+            year (int): Year
+            month (int): Month (1-12)
+            summary (TransactionSummary): Summary of the month's transactions
+        """
+        rows = MonthlyTotalService._category_rows(user.pk, year, month, summary)
+        
+        MonthlyCategoryTotal.objects.filter(
+            user=user,
+            year=year,
+            month=month
+        ).exclude(
+            category__in=[row.category for row in rows]
+        ).delete()
+        
+        if rows:
+            MonthlyCategoryTotal.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=['user', 'year', 'month', 'category'],
+                update_fields=['amount', 'transaction_count', 'updated_at']
+            )
+    
+    @staticmethod
+    def _category_rows(user_id, year, month, summary):
+        """Build unsaved MonthlyCategoryTotal rows from a month summary"""
+        # Legacy expenses without a category are only part of the month total
+        return [
+            MonthlyCategoryTotal(
+                user_id=user_id,
+                year=year,
+                month=month,
+                category=category,
+                amount=amount,
+                transaction_count=summary.category_counts.get(category, 0)
+            )
+            for category, amount in summary.category_totals.items()
+            if category
+        ]
+    
+    @staticmethod
+    def _store_daily_totals(user, existing, daily_summaries):
+        """
+        Replace the daily rollup rows covered by `existing`.
+        
+        Args:
+            user: User instance
+            existing: DailyTotal queryset for the recomputed period
+            daily_summaries (dict): date -> TransactionSummary
+        """
+        rows = MonthlyTotalService._daily_rows(user.pk, daily_summaries)
+        
+        existing.exclude(date__in=[row.date for row in rows]).delete()
+        
+        if rows:
+            DailyTotal.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=['user', 'date'],
+                update_fields=[*TYPE_AMOUNT_FIELDS.values(), *TYPE_COUNT_FIELDS.values(), 'updated_at']
+            )
+    
+    @staticmethod
+    def _daily_rows(user_id, daily_summaries):
+        """Build unsaved DailyTotal rows from per-date summaries"""
+        return [
+            DailyTotal(
+                user_id=user_id,
+                date=day,
+                expense_amount=summary.expense_total,
+                saving_amount=summary.saving_total,
+                investment_amount=summary.investment_total,
+                expense_count=summary.expense_count,
+                saving_count=summary.saving_count,
+                investment_count=summary.investment_count
+            )
+            for day, summary in daily_summaries.items()
+            if summary.transaction_count
+        ]
+    
+    @staticmethod
+    def update_daily_total(user, day):
+        """
+        Recompute the daily rollup row of one date.
+        
+        Args:
+            user: User instance
+            day (date): Date to recompute
+        """
+        summary = TransactionSummaryService.summarize_queryset(
+            Transaction.objects.filter(user=user, date=day)  # CRITICAL: Filter by user
+        )
+        MonthlyTotalService._store_daily_totals(
+            user,
+            DailyTotal.objects.filter(user=user, date=day),
+            {day: summary}
+        )
+    
+    @staticmethod
+    def get_daily_totals(user, year, month):
+        """
+        Read the daily rollup rows of a month.
+        
+        Args:
+            user: User instance
+            year (int): Year
+            month (int): Month (1-12)
+            
+        Returns:
+            dict: date -> DailyTotal for days that have transactions
+        """
+        # Recomputes the month (daily rows included) if it is missing or stale
+        MonthlyTotalService.get_month_total(user, year, month)
+        
+        return {
+            row.date: row
+            for row in DailyTotal.objects.filter(
+                user=user,  # CRITICAL: Filter by user
+                **month_date_filter(year, month)
+            )
+        }
+    
+    @staticmethod
+    def get_month_total(user, year, month):
+        """
+        Read stored monthly totals without writing.
+        
+        The row is kept current by apply_transaction_change(), so it is
+        only recomputed when it does not exist yet or was marked stale.
+        
+        Args:
+            user: User instance
+            year (int): Year
+            month (int): Month (1-12)
+            
+        Returns:
+            MonthlyTotal: Stored (or freshly computed) monthly totals
+        """
+        monthly_total = MonthlyTotal.objects.filter(
+            user=user,
+            year=year,
+            month=month
+        ).first()
+        
+        if monthly_total is None or monthly_total.is_stale:
+            monthly_total = MonthlyTotalService.update_monthly_totals(user, year, month)
+        
         return monthly_total
     
+    @staticmethod
+    def mark_months_stale(periods):
+        """
+        Flag stored monthly totals for recomputation on next read.
+        
+        Args:
+            periods: Iterable of (user_id, year, month) tuples
+            
+        Returns:
+            int: Number of rows marked stale
+        """
+        condition = Q()
+        for user_id, year, month in set(periods):
+            condition |= Q(user_id=user_id, year=year, month=month)
+        
+        if not condition:
+            return 0
+        return MonthlyTotal.objects.filter(condition).update(is_stale=True)
+    
+    @staticmethod
+    def apply_transaction_change(user, old_state=None, new_state=None):
+        """
+        Incrementally apply a transaction change to the stored monthly totals.
+        
+        Only the signed delta between the old and new snapshot is applied,
+        using atomic F() updates, so the cost no longer depends on how many
+        transactions the month already holds. The per-category and daily
+        rollups are patched the same way. Months without a MonthlyTotal row,
+        or without a row for the touched category, are computed in full once.
+        
+        Args:
+            user: User instance
+            old_state (dict): Snapshot before the change (None on create)
+            new_state (dict): Snapshot after the change (None on delete)
+        """
+        deltas = defaultdict(lambda: defaultdict(Decimal))
+        category_deltas = defaultdict(lambda: defaultdict(lambda: [Decimal('0'), 0]))
+        daily_deltas = defaultdict(lambda: defaultdict(lambda: defaultdict(Decimal)))
+        
+        for state, sign in ((old_state, -1), (new_state, 1)):
+            if not state:
+                continue
+            field = TYPE_AMOUNT_FIELDS.get(state['transaction_type'])
+            if field is None:
+                continue
+            amount = abs(state['amount'])
+            period = (state['date'].year, state['date'].month)
+            month_delta = deltas[period]
+            month_delta[field] += sign * amount
+            month_delta['total_amount'] += sign * amount
+            month_delta['transaction_count'] += sign
+            month_delta[TYPE_COUNT_FIELDS[state['transaction_type']]] += sign
+            
+            day_delta = daily_deltas[period][state['date']]
+            day_delta[field] += sign * amount
+            day_delta[TYPE_COUNT_FIELDS[state['transaction_type']]] += sign
+            
+            if state['transaction_type'] == 'expense' and state['expense_category']:
+                category_delta = category_deltas[period][state['expense_category']]
+                category_delta[0] += sign * amount
+                category_delta[1] += sign
+        
+        now = timezone.now()
+        for (year, month), month_delta in deltas.items():
+            month_category_deltas = {
+                category: delta
+                for category, delta in category_deltas[(year, month)].items()
+                if any(delta)
+            }
+            if not any(month_delta.values()) and not month_category_deltas and not any(
+                any(day_delta.values()) for day_delta in daily_deltas[(year, month)].values()
+            ):
+                continue  # e.g. description-only edit
+            
+            updates = {
+                field: F(field) + (int(value) if field in COUNT_FIELDS else value)
+                for field, value in month_delta.items()
+                if value
+            }
+            updates['updated_at'] = now
+            
+            updated = MonthlyTotal.objects.filter(
+                user=user,
+                year=year,
+                month=month
+            ).update(**updates)
+            
+            if not updated:
+                # No row to patch yet - the full computation already sees the change
+                MonthlyTotalService.update_monthly_totals(user, year, month)
+                continue
+            
+            if not MonthlyTotalService._apply_category_deltas(user, year, month, month_category_deltas, now):
+                # First transaction of this category in the month
+                MonthlyTotalService.update_monthly_totals(user, year, month)
+                continue
+            
+            MonthlyTotalService._apply_daily_deltas(user, daily_deltas[(year, month)], now)
+        
+        # The post_save bump ran before these rollups changed; a
+        # month built in between must not stay cached
+        version = DataVersionService.bump(user.id)
+        
+        # Push the new totals to open dashboards once the write is visible
+        dates = [state['date'] for state in (old_state, new_state) if state]
+        transactions_changed.send(sender=Transaction, user_id=user.id, dates=dates)
+        db_transaction.on_commit(lambda: publish_totals_changed(user, dates, version))
+    
+    @staticmethod
+    def _apply_category_deltas(user, year, month, category_deltas, now):
+        """
+        Patch MonthlyCategoryTotal rows with (amount, count) deltas.
+        
+        Returns:
+            bool: False if a category row was missing and the month needs a full recompute
+        """
+        for category, (amount, count) in category_deltas.items():
+            updated = MonthlyCategoryTotal.objects.filter(
+                user=user,
+                year=year,
+                month=month,
+                category=category
+            ).update(
+                amount=F('amount') + amount,
+                transaction_count=F('transaction_count') + count,
+                updated_at=now
+            )
+            if not updated:
+                return False
+        
+        if any(count < 0 for _, count in category_deltas.values()):
+            # Categories that lost their last transaction disappear
+            MonthlyCategoryTotal.objects.filter(
+                user=user,
+                year=year,
+                month=month,
+                transaction_count__lte=0
+            ).delete()
+        
+        return True
+    
+    @staticmethod
+    def _apply_daily_deltas(user, daily_deltas, now):
+        """Patch DailyTotal rows with per-field deltas, creating missing days"""
+        for day, day_delta in daily_deltas.items():
+            if not any(day_delta.values()):
+                continue
+            
+            updates = {
+                field: F(field) + (int(value) if field in COUNT_FIELDS else value)
+                for field, value in day_delta.items()
+                if value
+            }
+            updates['updated_at'] = now
+            
+            updated = DailyTotal.objects.filter(user=user, date=day).update(**updates)
+            
+            if not updated:
+                MonthlyTotalService.update_daily_total(user, day)
+            elif any(day_delta[field] < 0 for field in TYPE_COUNT_FIELDS.values()):
+                # Days that lost their last transaction disappear
+                DailyTotal.objects.filter(
+                    user=user,
+                    date=day,
+                    expense_count__lte=0,
+                    saving_count__lte=0,
+                    investment_count__lte=0
+                ).delete()
+    
+    @staticmethod
+    def reconcile_monthly_totals(user=None, chunk_size=REBUILD_CHUNK_SIZE):
+        """
+        Recompute stored monthly, category and daily totals from
+        transactions to repair drift left by incremental updates.
+        
+        Uses the set-based rollup of rebuild_monthly_totals(): per chunk of
+        users one grouped query computes the expected rows, which are
+        compared with the stored ones in memory; only chunks with drift are
+        rewritten and only users with drift get a new data version.
+        
+        Args:
+            user: Optional User instance to limit the reconcile to
+            chunk_size (int): Users per grouped query
+            
+        Returns:
+            dict: Number of months/days checked and corrected
+        """
+        if user is not None:
+            user_ids = [user.pk]
+        else:
+            user_ids = sorted(
+                set(Transaction.objects.order_by().values_list('user_id', flat=True).distinct())
+                | set(MonthlyTotal.objects.order_by().values_list('user_id', flat=True).distinct())
+                | set(DailyTotal.objects.order_by().values_list('user_id', flat=True).distinct())
+            )
+        
+        result = {'checked': 0, 'corrected': 0, 'checked_days': 0, 'corrected_days': 0}
+        for offset in range(0, len(user_ids), chunk_size):
+            chunk = user_ids[offset:offset + chunk_size]
+            monthly_totals, category_totals, daily_totals = MonthlyTotalService._compute_rollups(chunk)
+            
+            expected_months = {
+                (row.user_id, row.year, row.month): _monthly_values(row) for row in monthly_totals
+            }
+            stored_months = {
+                (row.user_id, row.year, row.month): _monthly_values(row)
+                for row in MonthlyTotal.objects.filter(user_id__in=chunk)
+            }
+            expected_categories = defaultdict(dict)
+            for row in category_totals:
+                expected_categories[(row.user_id, row.year, row.month)][row.category] = (row.amount, row.transaction_count)
+            stored_categories = defaultdict(dict)
+            for user_id, year, month, category, amount, count in MonthlyCategoryTotal.objects.filter(
+                user_id__in=chunk
+            ).values_list('user_id', 'year', 'month', 'category', 'amount', 'transaction_count'):
+                stored_categories[(user_id, year, month)][category] = (amount, count)
+            expected_days = {(row.user_id, row.date): _daily_values(row) for row in daily_totals}
+            stored_days = {
+                (row.user_id, row.date): _daily_values(row)
+                for row in DailyTotal.objects.filter(user_id__in=chunk)
+            }
+            
+            # Stored months without transactions are rebuilt as zero rows
+            zero_month = _monthly_values(MonthlyTotal())
+            corrected_months = {
+                period for period in set(expected_months) | set(stored_months)
+                if expected_months.get(period, zero_month) != stored_months.get(period)
+                or expected_categories.get(period, {}) != stored_categories.get(period, {})
+            }
+            corrected_days = {
+                key for key in set(expected_days) | set(stored_days)
+                if expected_days.get(key) != stored_days.get(key)
+            }
+            
+            result['checked'] += len(set(expected_months) | set(stored_months))
+            result['corrected'] += len(corrected_months)
+            result['checked_days'] += len(set(expected_days) | set(stored_days))
+            result['corrected_days'] += len(corrected_days)
+            
+            drifted_users = {key[0] for key in corrected_months | corrected_days}
+            if drifted_users:
+                MonthlyTotalService._write_rollups(chunk, monthly_totals, category_totals, daily_totals)
+                for user_id in drifted_users:
+                    DataVersionService.bump(user_id)
+        
+        return result
+    
     @staticmethod
     def get_current_month_totals(user):
         """
@@ -82,7 +566,7 @@ class MonthlyTotalService:
             dict: Current month totals
         """
         now = datetime.now()
-        monthly_total = MonthlyTotalService.update_monthly_totals(user, now.year, now.month)
+        monthly_total = MonthlyTotalService.get_month_total(user, now.year, now.month)
         
         return {
             'expense': monthly_total.expense_amount,
@@ -92,17 +576,19 @@ class MonthlyTotalService:
         }
     
     @staticmethod
-    def get_formatted_totals(user):
+    def get_formatted_totals(user, totals=None):
         """
         Get current month totals with Vietnamese formatting for specific user.
         
         Args:
             user: User instance
+            totals (dict): Already loaded get_current_month_totals() result
         
         Returns:
             dict: Formatted totals for display
         """
-        totals = MonthlyTotalService.get_current_month_totals(user)
+        if totals is None:
+            totals = MonthlyTotalService.get_current_month_totals(user)
         
         return {
             'expense': f"-{totals['expense']:,.0f}₫",
@@ -112,31 +598,190 @@ class MonthlyTotalService:
         }
     
     @staticmethod
-    def refresh_all_monthly_totals():
+    def refresh_all_monthly_totals(progress=None, chunk_size=REBUILD_CHUNK_SIZE):
         """
         Refresh all monthly totals based on existing transactions.
         Useful for data migration or correction.
         
+        Args:
+            progress (callable): Optional callback, see rebuild_monthly_totals()
+            chunk_size (int): Users per grouped query
+        
         Returns:
             int: Number of monthly totals updated
         """
         from authentication.models import User
         
         # Get all users who have transactions
-        users_with_transactions = User.objects.filter(
-            transactions__isnull=False
-        ).distinct()
+        user_ids = list(
+            User.objects.filter(
+                transactions__isnull=False
+            ).distinct().order_by('pk').values_list('pk', flat=True)
+        )
         
-        updated_count = 0
-        for user in users_with_transactions:
-            # Get all unique year-month combinations for this user
-            user_date_combinations = Transaction.objects.filter(user=user).dates('date', 'month')
+        return MonthlyTotalService.rebuild_monthly_totals(
+            user_ids,
+            chunk_size=chunk_size,
+            progress=progress
+        )
+    
+    @staticmethod
+    def start_refresh_all_monthly_totals():
+        """
+        Run refresh_all_monthly_totals() as a background job.
+        
+        Returns:
+            str: Job id for BackgroundJobService.get_status()
+        """
+        from .background_jobs import BackgroundJobService
+        
+        def refresh(report):
+            def progress(processed_users, total_users, updated_months):
+                report(
+                    processed_users=processed_users,
+                    total_users=total_users,
+                    updated_months=updated_months
+                )
+            
+            return {'updated_count': MonthlyTotalService.refresh_all_monthly_totals(progress=progress)}
+        
+        return BackgroundJobService.start('refresh_monthly_totals', refresh)
+    
+    @staticmethod
+    def rebuild_monthly_totals(user_ids, chunk_size=REBUILD_CHUNK_SIZE, progress=None):
+        """
+        Set-based rebuild of MonthlyTotal, MonthlyCategoryTotal and
+        DailyTotal rows.
+        
+        Each chunk of users costs one grouped query over their transactions
+        plus a handful of bulk writes, instead of several queries for every
+        (user, month) pair.
+        
+        Args:
+            user_ids (list): Users to rebuild
+            chunk_size (int): Users per chunk
+            progress (callable): Called after each chunk with
+                (processed_users, total_users, updated_months)
+            
+        Returns:
+            int: Number of monthly totals written
+        """
+        updated_months = 0
+        
+        for offset in range(0, len(user_ids), chunk_size):
+            chunk = user_ids[offset:offset + chunk_size]
+            
+            monthly_totals, category_totals, daily_totals = MonthlyTotalService._compute_rollups(chunk)
+            MonthlyTotalService._write_rollups(chunk, monthly_totals, category_totals, daily_totals)
+            
+            # Cached views and ETags were built from the old rollup rows
+            for user_id in chunk:
+                DataVersionService.bump(user_id)
+            
+            updated_months += len(monthly_totals)
+            if progress:
+                progress(offset + len(chunk), len(user_ids), updated_months)
+        
+        return updated_months
+    
+    @staticmethod
+    def _compute_rollups(user_ids):
+        """
+        Compute the rollup rows of a chunk of users with one grouped query.
+        
+        Args:
+            user_ids (list): Users of the chunk
             
-            for date in user_date_combinations:
-                MonthlyTotalService.update_monthly_totals(user, date.year, date.month)
-            updated_count += 1
+        Returns:
+            tuple: Unsaved (MonthlyTotal, MonthlyCategoryTotal, DailyTotal) row lists
+        """
+        rows = Transaction.objects.filter(
+            user_id__in=user_ids
+        ).order_by().values(
+            'user_id', 'date', 'expense_category'
+        ).annotate(**TransactionSummaryService.aggregates())
+        
+        summaries = defaultdict(TransactionSummary)
+        daily_summaries = defaultdict(lambda: defaultdict(TransactionSummary))
+        for row in rows:
+            summaries[(row['user_id'], row['date'].year, row['date'].month)].add_row(row)
+            daily_summaries[row['user_id']][row['date']].add_row(row)
         
-        return updated_count
+        now = timezone.now()
+        monthly_totals = []
+        category_totals = []
+        for (user_id, year, month), summary in summaries.items():
+            monthly_totals.append(MonthlyTotal(
+                user_id=user_id,
+                year=year,
+                month=month,
+                expense_amount=summary.expense_total,
+                saving_amount=summary.saving_total,
+                investment_amount=summary.investment_total,
+                total_amount=summary.gross_total,
+                transaction_count=summary.transaction_count,
+                expense_count=summary.expense_count,
+                saving_count=summary.saving_count,
+                investment_count=summary.investment_count,
+                is_stale=False,
+                updated_at=now
+            ))
+            category_totals.extend(
+                MonthlyTotalService._category_rows(user_id, year, month, summary)
+            )
+        
+        daily_totals = []
+        for user_id, user_daily_summaries in daily_summaries.items():
+            daily_totals.extend(MonthlyTotalService._daily_rows(user_id, user_daily_summaries))
+        
+        return monthly_totals, category_totals, daily_totals
+    
+    @staticmethod
+    def _write_rollups(user_ids, monthly_totals, category_totals, daily_totals):
+        """
+        Replace all rollup rows of a chunk of users in one transaction.
+        
+        Args:
+            user_ids (list): Users of the chunk
+            monthly_totals, category_totals, daily_totals: Rows from _compute_rollups()
+        """
+        now = timezone.now()
+        with db_transaction.atomic():
+            # Months whose transactions are all gone drop back to zero
+            MonthlyTotal.objects.filter(user_id__in=user_ids).update(
+                expense_amount=0,
+                saving_amount=0,
+                investment_amount=0,
+                total_amount=0,
+                transaction_count=0,
+                expense_count=0,
+                saving_count=0,
+                investment_count=0,
+                is_stale=False,
+                updated_at=now
+            )
+            MonthlyTotal.objects.bulk_create(
+                monthly_totals,
+                batch_size=REBUILD_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=['user', 'year', 'month'],
+                update_fields=[
+                    'expense_amount', 'saving_amount', 'investment_amount',
+                    'total_amount', *COUNT_FIELDS, 'is_stale', 'updated_at'
+                ]
+            )
+            
+            MonthlyCategoryTotal.objects.filter(user_id__in=user_ids).delete()
+            MonthlyCategoryTotal.objects.bulk_create(
+                category_totals,
+                batch_size=REBUILD_BATCH_SIZE
+            )
+            
+            DailyTotal.objects.filter(user_id__in=user_ids).delete()
+            DailyTotal.objects.bulk_create(
+                daily_totals,
+                batch_size=REBUILD_BATCH_SIZE
+            )
     
     @staticmethod
     def get_monthly_breakdown(user, year, month):
@@ -151,58 +796,68 @@ class MonthlyTotalService:
         Returns:
             dict: Detailed breakdown with categories
         """
-        transactions = Transaction.objects.filter(
-            user=user,  # CRITICAL: Filter by user
-            date__year=year,
-            date__month=month
-        )
+        monthly_total = MonthlyTotalService.get_month_total(user, year, month)
+        
+        category_totals = {
+            row.category: row
+            for row in MonthlyCategoryTotal.objects.filter(
+                user=user,  # CRITICAL: Filter by user
+                year=year,
+                month=month
+            )
+        }
         
         # Expense breakdown by category
         expense_breakdown = {}
-        expenses = transactions.filter(transaction_type='expense')
         for category, display_name in Transaction.EXPENSE_CATEGORIES:
-            category_total = expenses.filter(
-                expense_category=category
-            ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
+            category_total = category_totals.get(category)
             
-            if category_total != 0:
+            if category_total is not None and category_total.amount != 0:
                 expense_breakdown[category] = {
                     'name': display_name,
-                    'total': abs(category_total),
-                    'count': expenses.filter(expense_category=category).count()
+                    'total': category_total.amount,
+                    'count': category_total.transaction_count
                 }
         
         # Transaction counts
         counts = {
-            'expense': expenses.count(),
-            'saving': transactions.filter(transaction_type='saving').count(),
-            'investment': transactions.filter(transaction_type='investment').count()
+            'expense': monthly_total.expense_count,
+            'saving': monthly_total.saving_count,
+            'investment': monthly_total.investment_count
         }
         
         return {
             'expense_breakdown': expense_breakdown,
             'transaction_counts': counts,
-            'total_transactions': transactions.count()
+            'total_transactions': monthly_total.transaction_count
         }
 
 
-def update_monthly_totals_on_transaction_change(transaction):
+def update_monthly_totals_on_transaction_change(transaction, previous_state=None, deleted=False):
     """
     Helper function to update monthly totals when a transaction changes.
     Can be used in signals or view logic.
     
     Args:
         transaction (Transaction): Transaction that was created/updated/deleted
+        previous_state (dict): transaction_state() taken before an update
+        deleted (bool): True if the transaction has been deleted
     """
-    MonthlyTotalService.update_monthly_totals(
-        transaction.user,  # CRITICAL: Pass user
-        transaction.date.year,
-        transaction.date.month
-    )
+    if deleted:
+        MonthlyTotalService.apply_transaction_change(
+            transaction.user,  # CRITICAL: Pass user
+            old_state=previous_state or transaction_state(transaction)
+        )
+    else:
+        MonthlyTotalService.apply_transaction_change(
+            transaction.user,  # CRITICAL: Pass user
+            old_state=previous_state,
+            new_state=transaction_state(transaction)
+        )
 
 def get_month_totals(user, year, month):
     """Get totals for specific month and user"""
-    monthly_total = MonthlyTotalService.update_monthly_totals(user, year, month)
+    monthly_total = MonthlyTotalService.get_month_total(user, year, month)
     return {
         'expense': monthly_total.expense_amount,
         'saving': monthly_total.saving_amount,
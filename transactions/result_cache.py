@@ -0,0 +1,125 @@
+"""
+Per-User Result Cache
+Namespaced cache for derived per-user data (month totals, breakdowns,
+projections, calendar grids, sync status) on the default cache backend
+(LocMem in development, django-redis in production).
+
+Keys embed the user's data version (see DataVersionService), which every
+write bumps: invalidating all of a user's results is one cache write and
+stale entries are never read again. Misses are single-flight: one request
+computes a result while concurrent requests for the same key wait briefly
+for it instead of stampeding the database.
+"""
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from django.core.cache import cache
+
+from .data_version import DataVersionService
+
+logger = logging.getLogger(__name__)
+
+
+RESULT_CACHE_PREFIX = 'result'
+RESULT_CACHE_TIMEOUT = 60 * 60 * 24  # Entries are versioned, expiry only frees memory
+RESULT_LOCK_TIMEOUT = 30  # Seconds before a crashed computation releases its lock
+RESULT_LOCK_WAIT = 2.0  # Seconds a concurrent miss waits for the computing request
+RESULT_LOCK_POLL_INTERVAL = 0.05
+
+_MISSING = object()
+
+
+class ResultCache:
+    """
+    Versioned per-user result cache with single-flight misses.
+
+    Hit/miss counters are kept per namespace for the current process.
+    """
+
+    _stats = defaultdict(Counter)
+    _stats_lock = threading.Lock()
+
+    @staticmethod
+    def make_key(namespace: str, user_id: int, version: int, parts: Iterable[Any] = ()) -> str:
+        """Cache key of a result, e.g. result:breakdown:42:<version>:2025:3:vi"""
+        suffix = ':'.join(str(part) for part in parts)
+        return f'{RESULT_CACHE_PREFIX}:{namespace}:{user_id}:{version}:{suffix}'
+
+    @staticmethod
+    def get_or_compute(namespace: str, user, parts: Iterable[Any], compute: Callable[[], Any],
+                       timeout: int = RESULT_CACHE_TIMEOUT, version: Optional[int] = None) -> Any:
+        """
+        Get a cached result of a user or compute and store it.
+
+        Args:
+            namespace (str): Kind of result (e.g. 'month_total', 'calendar')
+            user: User instance
+            parts: Everything else the result depends on (period, filters, language)
+            compute (callable): Builds the result; must return a picklable value
+            timeout (int): Seconds to keep the result (short for time dependent data)
+            version (int): DataVersionService version, read now if omitted
+
+        Returns:
+            Cached or freshly computed result
+        """
+        if version is None:
+            version = DataVersionService.get_version(user.id)
+        key = ResultCache.make_key(namespace, user.id, version, parts)
+
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING:
+            ResultCache._record(namespace, 'hits')
+            return value
+
+        lock_key = f'{key}:lock'
+        if cache.add(lock_key, 1, RESULT_LOCK_TIMEOUT):
+            ResultCache._record(namespace, 'misses')
+            try:
+                value = compute()
+                cache.set(key, value, timeout)
+                return value
+            finally:
+                cache.delete(lock_key)
+
+        # Another request is computing the same result, wait for it
+        deadline = time.monotonic() + RESULT_LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(RESULT_LOCK_POLL_INTERVAL)
+            value = cache.get(key, _MISSING)
+            if value is not _MISSING:
+                ResultCache._record(namespace, 'coalesced')
+                return value
+
+        ResultCache._record(namespace, 'lock_timeouts')
+        logger.warning(f"⚠️ Result cache lock wait timed out for {namespace} (user {user.id})")
+        value = compute()
+        cache.set(key, value, timeout)
+        return value
+
+    @staticmethod
+    def _record(namespace: str, event: str) -> None:
+        with ResultCache._stats_lock:
+            ResultCache._stats[namespace][event] += 1
+
+    @staticmethod
+    def stats() -> Dict[str, Any]:
+        """
+        Hit/miss counters of this process.
+
+        Returns:
+            dict: {'pid': ..., 'namespaces': {namespace: {hits, misses, coalesced,
+                  lock_timeouts, hit_rate}}}
+        """
+        with ResultCache._stats_lock:
+            snapshot = {namespace: dict(counter) for namespace, counter in ResultCache._stats.items()}
+
+        for counters in snapshot.values():
+            lookups = sum(counters.get(event, 0) for event in ('hits', 'misses', 'coalesced', 'lock_timeouts'))
+            served = counters.get('hits', 0) + counters.get('coalesced', 0)
+            counters['hit_rate'] = round(served / lookups, 3) if lookups else None
+
+        return {'pid': os.getpid(), 'namespaces': snapshot}
@@ -0,0 +1,100 @@
+"""
+Sample Data Shapes
+Realistic transaction, bank email and chat samples shared by the demo
+account (DemoLoginView) and the benchmark data generator
+(manage.py seed_benchmark_data)
+"""
+from django.utils.translation import gettext_lazy as _
+
+
+SAMPLE_EXPENSES = [
+    {'amount': 45000, 'description': _('Coffee and breakfast'), 'category': 'coffee'},
+    {'amount': 120000, 'description': _('Lunch at restaurant'), 'category': 'food'},
+    {'amount': 25000, 'description': _('Bus fare'), 'category': 'transport'},
+    {'amount': 300000, 'description': _('Groceries'), 'category': 'shopping'},
+    {'amount': 150000, 'description': _('Movie tickets'), 'category': 'entertainment'},
+]
+
+SAMPLE_SAVINGS = [
+    {'amount': 500000, 'description': _('Monthly savings')},
+    {'amount': 200000, 'description': _('Emergency fund')},
+]
+
+SAMPLE_INVESTMENTS = [
+    {'amount': 1000000, 'description': _('Stock investment')},
+    {'amount': 300000, 'description': _('Gold purchase')},
+]
+
+# Bank notification emails as stored after parsing (amounts signed like Transaction)
+SAMPLE_BANK_EMAILS = [
+    {'amount': -65000, 'description': 'GRAB*RIDE HCM', 'transaction_type': 'expense', 'category': 'transport'},
+    {'amount': -235000, 'description': 'SHOPEEPAY SHOPEE', 'transaction_type': 'expense', 'category': 'shopping'},
+    {'amount': -89000, 'description': 'HIGHLANDS COFFEE Q1', 'transaction_type': 'expense', 'category': 'coffee'},
+    {'amount': -1250000, 'description': 'EVN TIEN DIEN', 'transaction_type': 'expense', 'category': 'utilities'},
+    {'amount': 2000000, 'description': 'CHUYEN TIEN TIET KIEM', 'transaction_type': 'saving', 'category': None},
+]
+
+# (user message, AI response) pairs in the chat languages
+SAMPLE_CHAT_MESSAGES = [
+    ('cà phê 45k', 'Đã ghi nhận chi tiêu 45,000₫ cho cà phê ☕', 'vi'),
+    ('ăn trưa 120k hôm qua', 'Đã ghi nhận chi tiêu 120,000₫ cho ăn uống 🍜', 'vi'),
+    ('tiết kiệm 500k', 'Đã ghi nhận tiết kiệm 500,000₫ 💰', 'vi'),
+    ('bus fare 25k', 'Recorded an expense of 25,000₫ for transport 🚗', 'en'),
+    ('bought gold 300k', 'Recorded an investment of 300,000₫ 📈', 'en'),
+]
+
+# Layout of a bank notification email: head styles, nested layout tables
+# with inline styles, the transaction table, then promotions and footer
+_BANK_EMAIL_STYLE = ''.join(
+    f'.c{index} {{ font-family: Arial, sans-serif; font-size: {10 + index % 6}px; color: #{index * 2731 % 0xffffff:06x}; '
+    f'padding: {index % 9}px; border-collapse: collapse; }}\n'
+    for index in range(120)
+)
+
+_BANK_EMAIL_PROMOTION = (
+    '<tr><td class="c7" style="padding:12px 24px;font-family:Arial,sans-serif;font-size:13px;color:#555555;">'
+    '<table width="100%" cellpadding="0" cellspacing="0" border="0"><tr>'
+    '<td width="120" valign="top"><img src="https://example.invalid/promo/{index}.png" width="120" alt=""></td>'
+    '<td style="padding-left:16px;"><p style="margin:0 0 8px;font-weight:bold;">Ưu đãi {index}: Hoàn tiền 10% &amp; miễn phí chuyển khoản</p>'
+    '<p style="margin:0;">Áp dụng đến hết tháng. Xem chi tiết tại <a href="https://example.invalid/uu-dai/{index}">đây</a>&nbsp;&raquo;</p>'
+    '</td></tr></table></td></tr>\n'
+)
+
+
+def sample_bank_email_html(promotions: int = 20) -> str:
+    """
+    TPBank-style balance change notification HTML (about 27 KB with the
+    default 20 promotion blocks), used by benchmark_email_text
+    """
+    rows = [
+        ('Số tài khoản', 'xxxx6789'),
+        ('Thời gian', '15/03/2025 09:30:12'),
+        ('Số tiền giao dịch', '-65,000 VND'),
+        ('Số dư hiện tại', '12,345,678 VND'),
+        ('Nội dung', 'GRAB*RIDE HCM &#8211; Thanh to&aacute;n QR'),
+    ]
+    details = ''.join(
+        f'<tr><td class="c3" style="padding:6px 12px;border:1px solid #e0e0e0;">{label}</td>'
+        f'<td class="c4" style="padding:6px 12px;border:1px solid #e0e0e0;font-weight:bold;">{value}</td></tr>\n'
+        for label, value in rows
+    )
+    promotion_blocks = ''.join(_BANK_EMAIL_PROMOTION.format(index=index) for index in range(promotions))
+    return (
+        '<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Transitional//EN" '
+        '"http://www.w3.org/TR/xhtml1/DTD/xhtml1-transitional.dtd">\n'
+        '<html><head><meta http-equiv="Content-Type" content="text/html; charset=utf-8">'
+        f'<title>TPBank</title><style type="text/css">\n{_BANK_EMAIL_STYLE}</style>'
+        '<!--[if mso]><style>table { border-collapse: collapse; }</style><![endif]--></head>\n'
+        '<body style="margin:0;padding:0;background:#f4f4f4;">'
+        '<table width="100%" cellpadding="0" cellspacing="0" border="0"><tr><td align="center">'
+        '<table width="600" cellpadding="0" cellspacing="0" border="0" style="background:#ffffff;">\n'
+        '<tr><td style="padding:24px;"><img src="https://example.invalid/logo.png" alt="TPBank"></td></tr>\n'
+        '<tr><td style="padding:0 24px;"><h2 style="margin:0 0 12px;">Thông báo biến động số dư</h2>'
+        '<p>Kính gửi Quý khách,<br>TPBank xin thông báo tài khoản của Quý khách vừa phát sinh giao dịch:</p>'
+        f'<table width="100%" cellpadding="0" cellspacing="0" border="0">\n{details}</table></td></tr>\n'
+        f'{promotion_blocks}'
+        '<tr><td style="padding:24px;font-size:11px;color:#999999;">'
+        '<p>Đây là email tự động, vui lòng không trả lời.&nbsp;Hotline: 1900 58 58 85</p>'
+        '<p>&copy; 2025 TPBank. All rights reserved.</p></td></tr>\n'
+        '</table></td></tr></table></body></html>\n'
+    )
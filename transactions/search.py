@@ -0,0 +1,223 @@
+"""
+Transaction Search
+Diacritic-insensitive description search backed by a trigram index:
+pg_trgm GIN on PostgreSQL, an FTS5 trigram table on SQLite
+"""
+import logging
+import unicodedata
+from django.db import connection as default_connection, connections
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+logger = logging.getLogger(__name__)
+
+
+FTS_TABLE = 'transactions_transaction_fts'
+TRANSACTION_TABLE = 'transactions_transaction'
+PG_TRIGRAM_INDEX = 'transactions_transaction_search_trgm'
+
+# Trigram indexes can only answer terms of at least 3 characters
+MIN_INDEXED_TERM_LENGTH = 3
+
+# Up to this many FTS matches are inlined as an id list
+MAX_MATCHED_IDS = 1000
+
+# Connection alias -> whether the SQLite FTS table and triggers exist.
+# Checked once per process and kept current by install/uninstall_search_index
+# (run after every migrate), so searches don't query sqlite_master each time.
+_fts_available = {}
+
+SQLITE_FTS_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        search_text,
+        content='{TRANSACTION_TABLE}',
+        content_rowid='id',
+        tokenize='trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {TRANSACTION_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, search_text) VALUES (new.id, new.search_text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {TRANSACTION_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_text) VALUES ('delete', old.id, old.search_text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF search_text ON {TRANSACTION_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_text) VALUES ('delete', old.id, old.search_text);
+        INSERT INTO {FTS_TABLE}(rowid, search_text) VALUES (new.id, new.search_text);
+    END
+    """,
+]
+
+
+def normalize_search_text(text):
+    """
+    Normalize text for diacritic-insensitive matching.
+
+    "Cà phê Đà Lạt" -> "ca phe da lat"
+
+    Args:
+        text (str): Raw text
+
+    Returns:
+        str: Lowercase text without Vietnamese diacritics
+    """
+    if not text:
+        return ''
+    # đ/Đ are separate letters, not a base letter + combining mark
+    text = text.replace('đ', 'd').replace('Đ', 'D')
+    decomposed = unicodedata.normalize('NFD', text)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(stripped.lower().split())
+
+
+def build_search_text(description, expense_category=None):
+    """Search document stored on Transaction.search_text"""
+    return normalize_search_text(' '.join(filter(None, [description, expense_category])))
+
+
+def sqlite_fts_available(connection=None):
+    """
+    Check whether the SQLite FTS5 table and its sync triggers exist.
+
+    Table rebuilds in later SQLite migrations drop the triggers, so this
+    is checked instead of assumed; the answer is cached per database alias
+    and refreshed by ensure_search_index after migrations.
+    """
+    connection = connection or default_connection
+    if connection.vendor != 'sqlite':
+        return False
+    if connection.alias not in _fts_available:
+        _fts_available[connection.alias] = _sqlite_fts_installed(connection)
+    return _fts_available[connection.alias]
+
+
+def _sqlite_fts_installed(connection):
+    """Query sqlite_master for the FTS table and its three triggers"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE name IN (%s, %s, %s, %s)",
+            [FTS_TABLE, f'{FTS_TABLE}_ai', f'{FTS_TABLE}_ad', f'{FTS_TABLE}_au']
+        )
+        return cursor.fetchone()[0] == 4
+
+
+def install_search_index(connection=None):
+    """
+    Create the trigram search index for the current database backend.
+
+    Safe to call repeatedly; on SQLite it recreates missing triggers and
+    rebuilds the FTS table from the transactions table when it had to.
+    """
+    connection = connection or default_connection
+    _fts_available.pop(connection.alias, None)
+
+    with connection.cursor() as cursor:
+        if TRANSACTION_TABLE not in connection.introspection.table_names(cursor):
+            return
+        columns = [column.name for column in connection.introspection.get_table_description(cursor, TRANSACTION_TABLE)]
+        if 'search_text' not in columns:
+            return  # Migrations not applied yet (or rolled back)
+
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {PG_TRIGRAM_INDEX} '
+                f'ON {TRANSACTION_TABLE} USING gin (search_text gin_trgm_ops)'
+            )
+        return
+
+    if connection.vendor == 'sqlite' and not _sqlite_fts_installed(connection):
+        try:
+            with connection.cursor() as cursor:
+                for statement in SQLITE_FTS_SQL:
+                    cursor.execute(statement)
+                cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+                # Without statistics SQLite prefers walking the user index
+                # over the handful of matched ids
+                cursor.execute(f'ANALYZE {TRANSACTION_TABLE}')
+            logger.info("🔍 Installed SQLite FTS5 search index")
+        except Exception as e:
+            # Old SQLite builds without FTS5/trigram fall back to LIKE
+            logger.warning(f"⚠️ SQLite FTS5 search index unavailable: {str(e)}")
+            _fts_available[connection.alias] = False
+            return
+    if connection.vendor == 'sqlite':
+        _fts_available[connection.alias] = True
+
+
+def uninstall_search_index(connection=None):
+    """Drop the backend specific search index"""
+    connection = connection or default_connection
+    _fts_available.pop(connection.alias, None)
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f'DROP INDEX IF EXISTS {PG_TRIGRAM_INDEX}')
+        elif connection.vendor == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}')
+            cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def search_transactions(queryset, query):
+    """
+    Filter a Transaction queryset to rows matching every search term.
+
+    Args:
+        queryset: Transaction queryset
+        query (str): Free text search, e.g. "ca phe"
+
+    Returns:
+        QuerySet: Filtered queryset
+    """
+    terms = normalize_search_text(query).split()
+    if not terms:
+        return queryset
+
+    indexed_terms = []
+    if sqlite_fts_available(connections[queryset.db]):
+        indexed_terms = [term for term in terms if len(term) >= MIN_INDEXED_TERM_LENGTH]
+
+    if indexed_terms:
+        # One MATCH so FTS5 intersects the terms itself; quoting makes
+        # each term a literal substring
+        match = ' AND '.join('"' + term.replace('"', '""') + '"' for term in indexed_terms)
+        match_sql = f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s'
+
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(f'{match_sql} LIMIT %s', [match, MAX_MATCHED_IDS + 1])
+            matched_ids = [row[0] for row in cursor.fetchall()]
+
+        if len(matched_ids) <= MAX_MATCHED_IDS:
+            # A literal id list makes SQLite drive the query from the
+            # matches instead of walking every row of the user
+            queryset = queryset.filter(id__in=matched_ids)
+        else:
+            queryset = queryset.filter(id__in=RawSQL(match_sql, [match]))
+
+    for term in terms:
+        if term not in indexed_terms:
+            # LIKE on the normalized column uses pg_trgm on PostgreSQL
+            queryset = queryset.filter(search_text__contains=term)
+
+    return queryset
+
+
+class TransactionSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter replacement for transactions.
+
+    Matches description and category without diacritics through the
+    trigram search index instead of ILIKE scans on each search field.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '')
+        return search_transactions(queryset, query.replace('\x00', ''))
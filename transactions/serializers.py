@@ -138,23 +138,3 @@ class MonthlyTotalSerializer(serializers.ModelSerializer):
         sign = "+" if obj.total_amount >= 0 else ""
         return f"{sign}{obj.total_amount:,.0f}₫"
 
-
-class CalendarDataSerializer(serializers.Serializer):
-    """
-    Serializer for calendar data aggregation.
-    """
-    date = serializers.DateField()
-    transactions = TransactionListSerializer(many=True)
-    daily_total = serializers.DecimalField(max_digits=15, decimal_places=0)
-    formatted_daily_total = serializers.SerializerMethodField()
-    expense_count = serializers.IntegerField()
-    saving_count = serializers.IntegerField()
-    investment_count = serializers.IntegerField()
-    
-    def get_formatted_daily_total(self, obj):
-        """Format daily total with proper sign"""
-        total = obj['daily_total']
-        if total == 0:
-            return "0₫"
-        sign = "+" if total > 0 else ""
-        return f"{sign}{total:,.0f}₫" 
\ No newline at end of file
@@ -0,0 +1,11 @@
+"""
+Transaction Signals
+Sent by the write paths that maintain derived data (incremental totals,
+bulk imports, admin edits) so other apps can invalidate what they derived
+from a user's transactions.
+"""
+from django.dispatch import Signal
+
+
+# Sent with user_id and dates (every transaction date touched by the change)
+transactions_changed = Signal()
@@ -0,0 +1,155 @@
+"""
+Transaction Summary Service
+Computes totals, counts and per-category sums for a set of transactions
+in a single conditional-aggregation query
+"""
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, Optional
+from django.db.models import Sum, Count, Q
+
+from .models import Transaction
+
+
+TRANSACTION_TYPES = ('expense', 'saving', 'investment')
+
+
+@dataclass
+class TransactionSummary:
+    """
+    Aggregated view of a transaction queryset.
+
+    All totals are absolute values (expenses are stored negative).
+    Category dictionaries only cover expenses and are keyed by the raw
+    expense_category value, which may be None for legacy rows.
+    """
+    expense_total: Decimal = Decimal('0')
+    saving_total: Decimal = Decimal('0')
+    investment_total: Decimal = Decimal('0')
+    expense_count: int = 0
+    saving_count: int = 0
+    investment_count: int = 0
+    category_totals: Dict[Optional[str], Decimal] = field(default_factory=dict)
+    category_counts: Dict[Optional[str], int] = field(default_factory=dict)
+
+    @property
+    def transaction_count(self) -> int:
+        """Number of transactions of every type"""
+        return self.expense_count + self.saving_count + self.investment_count
+
+    @property
+    def gross_total(self) -> Decimal:
+        """Total money moved (expense + saving + investment)"""
+        return self.expense_total + self.saving_total + self.investment_total
+
+    @property
+    def net_balance(self) -> Decimal:
+        """Saving + investment minus expense"""
+        return self.saving_total + self.investment_total - self.expense_total
+
+    def total_for(self, transaction_type: str) -> Decimal:
+        """Absolute total for one transaction type"""
+        return getattr(self, f'{transaction_type}_total')
+
+    def count_for(self, transaction_type: str) -> int:
+        """Transaction count for one transaction type"""
+        return getattr(self, f'{transaction_type}_count')
+
+    def average_for(self, transaction_type: str) -> Decimal:
+        """Average absolute amount per transaction for one type"""
+        count = self.count_for(transaction_type)
+        return self.total_for(transaction_type) / count if count else Decimal('0')
+
+    def category_average(self, category: str) -> Decimal:
+        """Average absolute amount per expense transaction in a category"""
+        count = self.category_counts.get(category, 0)
+        return self.category_totals.get(category, Decimal('0')) / count if count else Decimal('0')
+
+    def add_row(self, row: Dict) -> None:
+        """
+        Fold one grouped aggregate row (see TransactionSummaryService.aggregates)
+        into this summary.
+        """
+        for transaction_type in TRANSACTION_TYPES:
+            total_field = f'{transaction_type}_total'
+            count_field = f'{transaction_type}_count'
+            setattr(self, total_field,
+                    getattr(self, total_field) + abs(row[total_field] or 0))
+            setattr(self, count_field,
+                    getattr(self, count_field) + row[count_field])
+
+        if row['expense_count']:
+            category = row['expense_category']
+            self.category_totals[category] = (
+                self.category_totals.get(category, Decimal('0')) + abs(row['expense_total'] or 0)
+            )
+            self.category_counts[category] = (
+                self.category_counts.get(category, 0) + row['expense_count']
+            )
+
+
+class TransactionSummaryService:
+    """
+    Shared summary engine for dashboard totals, statistics and analysis.
+    """
+
+    @staticmethod
+    def aggregates() -> Dict:
+        """
+        Conditional Sum/Count expressions per transaction type.
+
+        Group by expense_category (plus any other keys) and annotate with
+        these to get rows that TransactionSummary.add_row() understands.
+        """
+        aggregates = {}
+        for transaction_type in TRANSACTION_TYPES:
+            type_filter = Q(transaction_type=transaction_type)
+            aggregates[f'{transaction_type}_total'] = Sum('amount', filter=type_filter)
+            aggregates[f'{transaction_type}_count'] = Count('id', filter=type_filter)
+        return aggregates
+
+    @staticmethod
+    def summarize_queryset(queryset) -> TransactionSummary:
+        """
+        Summarize a Transaction queryset with one GROUP BY query.
+
+        Args:
+            queryset: Filtered Transaction queryset
+
+        Returns:
+            TransactionSummary: Totals, counts and expense category sums
+        """
+        # Non-expense rows have no category and collapse into the NULL group
+        rows = queryset.order_by().values('expense_category').annotate(
+            **TransactionSummaryService.aggregates()
+        )
+
+        summary = TransactionSummary()
+        for row in rows:
+            summary.add_row(row)
+
+        return summary
+
+    @staticmethod
+    def summarize(user, start_date=None, end_date=None, transaction_type=None) -> TransactionSummary:
+        """
+        Summarize a user's transactions for an optional date range and type.
+
+        Args:
+            user: User instance
+            start_date (date): Inclusive start date
+            end_date (date): Inclusive end date
+            transaction_type (str): Optional type filter
+
+        Returns:
+            TransactionSummary: Aggregated result
+        """
+        queryset = Transaction.objects.filter(user=user)
+        if start_date:
+            queryset = queryset.filter(date__gte=start_date)
+        if end_date:
+            queryset = queryset.filter(date__lte=end_date)
+        if transaction_type:
+            queryset = queryset.filter(transaction_type=transaction_type)
+
+        return TransactionSummaryService.summarize_queryset(queryset)
@@ -0,0 +1,255 @@
+import math
+from datetime import date, timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from authentication.models import User
+from expense_tracker.query_budget import assertQueryBudget
+from .bank_integration_service import BankIntegrationService
+from .gmail_service import GMAIL_LIST_PAGE_SIZE, GmailService, GmailStreamIncomplete
+from .gmail_stub import GMAIL_PREFIX, GmailStubServer
+from .models import Transaction, UserBankConfig, BankEmailTransaction, UserGmailPermission, DailyTotal
+from .monthly_service import MonthlyTotalService
+
+
+class EndpointQueryBudgetTests(TestCase):
+    """Pin the query count of the dashboard endpoints to settings.QUERY_BUDGETS"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='budget', email='budget@example.com', password='p')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        for day in range(1, 21):
+            Transaction.objects.create(
+                user=self.user,
+                transaction_type=('expense', 'saving', 'investment')[day % 3],
+                amount=1000 * day,
+                description=f'Budget {day}',
+                date=date(2025, 3, day),
+                expense_category='food' if day % 3 == 0 else None
+            )
+
+        for bank_code in ('tpbank', 'vietcombank', 'mbbank'):
+            bank_config = UserBankConfig.objects.create(user=self.user, bank_code=bank_code)
+            for index in range(5):
+                BankEmailTransaction.objects.create(
+                    user=self.user,
+                    bank_config=bank_config,
+                    email_message_id=f'{bank_code}-{index}',
+                    email_subject='Thông báo biến động số dư',
+                    email_date=timezone.now(),
+                    transaction_type='expense',
+                    amount=1000,
+                    description='Bank email',
+                    date=date(2025, 3, 1 + index)
+                )
+
+    @assertQueryBudget(settings.QUERY_BUDGETS['monthly-totals'])
+    def test_monthly_totals(self):
+        response = self.client.get('/api/monthly-totals/?year=2025&month=3')
+        self.assertEqual(response.status_code, 200)
+
+    @assertQueryBudget(settings.QUERY_BUDGETS['calendar-data'])
+    def test_calendar_data(self):
+        response = self.client.get('/api/calendar-data/?year=2025&month=3')
+        self.assertEqual(response.status_code, 200)
+
+    @assertQueryBudget(settings.QUERY_BUDGETS['bank-sync-history'])
+    def test_bank_sync_history(self):
+        response = self.client.get('/api/bank-integration/sync-history/')
+        self.assertEqual(response.status_code, 200)
+
+    @assertQueryBudget(settings.QUERY_BUDGETS['bank_config_list'])
+    def test_bank_config_list(self):
+        response = self.client.get('/api/bank-integration/configs/')
+        self.assertEqual(response.status_code, 200)
+
+
+class MonthlyTotalDeltaTests(TestCase):
+    """Incremental (F() delta) rollup updates must match a full recompute"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='delta', email='delta@example.com', password='p')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assertNoDrift(self):
+        result = MonthlyTotalService.reconcile_monthly_totals(self.user)
+        self.assertEqual(result['corrected'], 0, result)
+        self.assertEqual(result['corrected_days'], 0, result)
+
+    def _create(self, **data):
+        response = self.client.post('/api/transactions/', data, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertNoDrift()
+        return response.data['id']
+
+    def _update(self, transaction_id, **data):
+        response = self.client.patch(f'/api/transactions/{transaction_id}/', data, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertNoDrift()
+
+    def _delete(self, transaction_id):
+        response = self.client.delete(f'/api/transactions/{transaction_id}/')
+        self.assertEqual(response.status_code, 204, response.content)
+        self.assertNoDrift()
+
+    def test_create_update_delete_sequence(self):
+        lunch = self._create(transaction_type='expense', amount='50000', description='Phở',
+                             date='2025-03-05', expense_category='food')
+        saving = self._create(transaction_type='saving', amount='1000000', description='Tiết kiệm',
+                              date='2025-03-05')
+        taxi = self._create(transaction_type='expense', amount='80000', description='Grab',
+                            date='2025-03-06', expense_category='transport')
+
+        # Amount, category, type and date changes (the form always sends the amount)
+        self._update(lunch, amount='65000')
+        self._update(taxi, amount='80000', expense_category='food')
+        self._update(saving, transaction_type='investment', amount='1000000')
+        self._update(taxi, transaction_type='saving', amount='80000')
+        self._update(taxi, transaction_type='expense', amount='80000', expense_category='transport')
+
+        # Across months: the first move creates April, the second patches it
+        self._update(lunch, amount='65000', date='2025-04-01')
+        self._update(taxi, date='2025-04-02', amount='90000')
+        self._update(taxi, amount='90000', date='2025-03-06')
+
+        self._delete(lunch)
+        self._delete(saving)
+        self._delete(taxi)
+
+        self.assertFalse(DailyTotal.objects.filter(user=self.user).exists())
+
+
+class TransactionCursorPaginationTests(TestCase):
+    """Keyset pages must not skip or repeat rows that share a sort key"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='cursor', email='cursor@example.com', password='p')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        Transaction.objects.bulk_create([
+            Transaction(
+                user=self.user,
+                transaction_type='saving',
+                amount=1000 + index,
+                description=f'Cursor {index}',
+                date=date(2025, 3, 1 + index % 3)
+            )
+            for index in range(47)
+        ])
+        # Same date and created_at: only the id tells these rows apart
+        Transaction.objects.filter(user=self.user).update(created_at=timezone.now())
+
+    def test_pages_cover_every_row_once(self):
+        url = '/api/transactions/?pagination=cursor&page_size=10'
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, response.content)
+            self.assertNotIn('count', response.data)
+            seen.extend(row['id'] for row in response.data['results'])
+            url = response.data['next']
+
+        expected = list(
+            Transaction.objects.filter(user=self.user)
+            .order_by('-date', '-created_at', '-id')
+            .values_list('id', flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/transactions/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(GMAIL_QUOTA_UNITS_PER_SECOND=1000000)
+class GmailStubTests(TestCase):
+    """Gmail reads against the local stub server (transactions/gmail_stub.py)"""
+
+    def setUp(self):
+        self.stub = GmailStubServer().start()
+        self.addCleanup(self.stub.stop)
+
+        settings_override = override_settings(GMAIL_API_ENDPOINT=self.stub.url)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        # Retry immediately instead of backing off for seconds
+        backoff = mock.patch('transactions.gmail_fetch.backoff_delay', return_value=0)
+        backoff.start()
+        self.addCleanup(backoff.stop)
+
+        self.user = User.objects.create_user(username='gmail', email='gmail@example.com', password='p')
+        self.permission = UserGmailPermission.objects.create(
+            user=self.user,
+            has_gmail_permission=True,
+            gmail_oauth_token={'token': 'stub-token', 'scopes': []},
+            gmail_token_expires_at=timezone.now() + timedelta(hours=1)
+        )
+
+    def _message_list_requests(self):
+        return [path for _, path in self.stub.requests if path == f'{GMAIL_PREFIX}/messages']
+
+    def test_search_walks_every_page(self):
+        self.stub.seed(1200)
+
+        emails = list(GmailService(self.permission).iter_bank_emails(['tpbank@tpb.com.vn']))
+
+        self.assertEqual([email['id'] for email in emails], self.stub.order)
+        self.assertEqual(len(self._message_list_requests()), math.ceil(1200 / GMAIL_LIST_PAGE_SIZE))
+        self.assertTrue(self.stub.batch_sizes)
+        self.assertLessEqual(max(self.stub.batch_sizes), 100)
+
+    def test_rate_limited_messages_are_retried(self):
+        self.stub.seed(30)
+        for message_id in self.stub.order[:3]:
+            self.stub.fail_once[message_id] = 2
+
+        gmail_service = GmailService(self.permission)
+        emails = list(gmail_service.iter_bank_emails(['tpbank@tpb.com.vn']))
+
+        self.assertEqual(len(emails), 30)
+        self.assertEqual(set(self.stub.fail_once.values()), {0})
+        self.assertGreater(gmail_service.fetcher.stats['retries'], 0)
+        self.assertEqual(gmail_service.fetcher.given_up, [])
+
+    def test_broken_message_makes_the_stream_incomplete(self):
+        self.stub.seed(10)
+        broken_id = self.stub.order[4]
+        self.stub.broken.add(broken_id)
+
+        emails = []
+        with self.assertRaises(GmailStreamIncomplete):
+            for email in GmailService(self.permission).iter_bank_emails(['tpbank@tpb.com.vn']):
+                emails.append(email)
+
+        # Everything else was still delivered before the error
+        self.assertEqual(len(emails), 9)
+        self.assertNotIn(broken_id, [email['id'] for email in emails])
+
+    def test_expired_history_falls_back_to_search(self):
+        self.stub.seed(4)
+        self.stub.expired_history = True
+        bank_config = UserBankConfig.objects.create(
+            user=self.user, bank_code='tpbank', is_enabled=True, gmail_history_id='1'
+        )
+
+        service = BankIntegrationService(self.user)
+        with mock.patch.object(service.parser, 'parse_multiple_emails', return_value=[]) as parse:
+            result = service.sync_user_bank_emails()
+
+        self.assertTrue(result['success'], result)
+        self.assertIn(f'{GMAIL_PREFIX}/history', [path for _, path in self.stub.requests])
+        self.assertTrue(self._message_list_requests())
+        # seed() alternates balance notifications (even) with promotions
+        parsed_ids = [email['id'] for call in parse.call_args_list for email in call.args[0]]
+        self.assertEqual(sorted(parsed_ids), ['stub000000', 'stub000002'])
+        bank_config.refresh_from_db()
+        self.assertEqual(bank_config.gmail_history_id, str(self.stub.history_id))
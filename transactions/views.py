@@ -1,18 +1,23 @@
 from django.shortcuts import render
-from django.http import HttpResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import api_view, action
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import PageNumberPagination, BasePagination
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
-from django.db.models import Sum, Q, Count
-from django.utils.translation import gettext as _
+from django.db.models import Q
+from django.utils.translation import gettext as _, get_language
 from django.shortcuts import get_object_or_404
+from django.core.exceptions import ValidationError as DjangoValidationError
 from datetime import datetime, date, timedelta, timezone
-from collections import defaultdict
-import calendar
+import base64
+import binascii
+import json
 import logging
+import time
 
 # Configure logger for bank integration
 logger = logging.getLogger(__name__)
@@ -20,10 +25,21 @@ logger = logging.getLogger(__name__)
 from .models import Transaction, MonthlyTotal, UserBankConfig, UserGmailPermission, BankEmailTransaction
 from .serializers import (
     TransactionSerializer, TransactionCreateSerializer, TransactionListSerializer,
-    MonthlyTotalSerializer, CalendarDataSerializer
+    MonthlyTotalSerializer
+)
+from .monthly_service import (
+    MonthlyTotalService, update_monthly_totals_on_transaction_change, transaction_state
 )
-from .monthly_service import MonthlyTotalService, update_monthly_totals_on_transaction_change
 from .future_calculator import FutureProjectionCalculator
+from .summary_service import TransactionSummaryService
+from .date_ranges import month_date_filter
+from .search import TransactionSearchFilter
+from .fast_serializers import transaction_list_values, serialize_transaction_rows
+from .calendar_service import CALENDAR_FILTERS, CalendarService, render_calendar_days
+from .data_version import DataVersionService, conditional_on_data_version
+from .events import acquire_stream_slot, format_sse, get_broker, release_stream_slot
+from .bulk_service import BULK_MAX_ITEMS, TransactionBulkService
+from .result_cache import ResultCache
 
 
 def index(request):
@@ -31,7 +47,83 @@ def index(request):
     return render(request, 'index.html') 
 
 
+# Server-Sent Events stream settings
+EVENT_STREAM_HEARTBEAT_SECONDS = 15
+EVENT_STREAM_MAX_SECONDS = 55  # Below the gunicorn timeout; EventSource reconnects
+EVENT_STREAM_RETRY_MS = 3000
+EVENT_STREAM_BUSY_RETRY_MS = 5 * 60 * 1000  # Clients over the cap poll until they retry
+
+# Sync status counts the last 30 days, so it also expires with time
+SYNC_STATUS_CACHE_TIMEOUT = 60 * 5
+
+
+def event_stream(request):
+    """
+    Server-Sent Events stream of the current user's totals changes.
+    Replaces dashboard interval polling (see transactions/events.py).
+    
+    Reconnecting clients send Last-Event-ID; if the data changed in the
+    meantime they get a 'resync' event and refetch once. Clients over the
+    per-process stream cap get a 'busy' event and a long retry: delay and
+    poll until then.
+    """
+    if request.method != 'GET':
+        return JsonResponse({'error': _('Method not allowed')}, status=405)
+    
+    if not request.user.is_authenticated:
+        return JsonResponse({'error': _('Authentication required')}, status=401)
+    
+    response = StreamingHttpResponse(
+        _event_stream(request.user.id, request.headers.get('Last-Event-ID')),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Don't let proxies buffer the stream
+    return response
+
 
+def _event_stream(user_id, last_event_id=None):
+    from django.db import connection
+    
+    # Idle streams must not hold a database connection
+    if not connection.in_atomic_block:
+        connection.close()
+    
+    # Taken on first iteration: an unstarted generator never runs its finally
+    if not acquire_stream_slot():
+        yield f'retry: {EVENT_STREAM_BUSY_RETRY_MS}\n\n'
+        yield format_sse({'type': 'busy'})
+        return
+    
+    try:
+        yield from _subscribed_event_stream(user_id, last_event_id)
+    finally:
+        release_stream_slot()
+
+
+def _subscribed_event_stream(user_id, last_event_id=None):
+    subscription = get_broker().subscribe(user_id)
+    try:
+        yield f'retry: {EVENT_STREAM_RETRY_MS}\n\n'
+        
+        version = DataVersionService.get_version(user_id)
+        if last_event_id and last_event_id != str(version):
+            yield format_sse({'type': 'resync', 'id': version})
+        else:
+            yield format_sse({'type': 'hello', 'id': version})
+        
+        deadline = time.monotonic() + EVENT_STREAM_MAX_SECONDS
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            event = subscription.get(timeout=min(EVENT_STREAM_HEARTBEAT_SECONDS, remaining))
+            if event is None:
+                yield ': keepalive\n\n'
+            else:
+                yield format_sse(event)
+    finally:
+        subscription.close()
 
 
 class TransactionPagination(PageNumberPagination):
@@ -41,6 +133,85 @@ class TransactionPagination(PageNumberPagination):
     max_page_size = 100
 
 
+class TransactionCursorPagination(BasePagination):
+    """
+    Keyset pagination for transactions (opt-in with ?pagination=cursor or ?cursor=).
+    
+    Pages are ordered by (-date, -created_at, -id) and continue strictly after
+    the last row of the previous page, so every page costs the same index
+    range scan. No total count is returned.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    ordering = ('-date', '-created_at', '-id')
+    
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        
+        queryset = queryset.order_by(*self.ordering)
+        
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded:
+            last_date, last_created_at, last_id = self.decode_cursor(encoded)
+            queryset = queryset.filter(
+                Q(date__lt=last_date) |
+                Q(date=last_date, created_at__lt=last_created_at) |
+                Q(date=last_date, created_at=last_created_at, id__lt=last_id)
+            )
+        
+        # One extra row tells whether there is a next page without COUNT(*)
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+    
+    def decode_cursor(self, encoded):
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            return (
+                date.fromisoformat(payload['d']),
+                datetime.fromisoformat(payload['c']),
+                int(payload['i'])
+            )
+        except (TypeError, ValueError, KeyError, UnicodeError, binascii.Error):
+            raise NotFound(_('Invalid cursor'))
+    
+    def encode_cursor(self, transaction):
+        if isinstance(transaction, dict):
+            # values() row from the fast list path
+            key = (transaction['date'], transaction['created_at'], transaction['id'])
+        else:
+            key = (transaction.date, transaction.created_at, transaction.pk)
+        payload = json.dumps({
+            'd': key[0].isoformat(),
+            'c': key[1].isoformat(),
+            'i': key[2]
+        }, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+    
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+    
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data
+        })
+
+
 class TransactionViewSet(viewsets.ModelViewSet):
     """
     ViewSet for Transaction CRUD operations with filtering and pagination.
@@ -48,15 +219,27 @@ class TransactionViewSet(viewsets.ModelViewSet):
     """
     serializer_class = TransactionSerializer
     pagination_class = TransactionPagination
+    cursor_pagination_class = TransactionCursorPagination
     permission_classes = [IsAuthenticated]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['description', 'expense_category']
+    filter_backends = [TransactionSearchFilter, filters.OrderingFilter]
+    search_fields = ['description', 'expense_category']  # Indexed together in search_text
     ordering_fields = ['date', 'amount', 'created_at']
     ordering = ['-date', '-created_at']
     
+    @property
+    def paginator(self):
+        """Use keyset pagination when the client asks for cursor mode"""
+        if not hasattr(self, '_paginator'):
+            query_params = self.request.query_params
+            if query_params.get('pagination') == 'cursor' or 'cursor' in query_params:
+                self._paginator = self.cursor_pagination_class()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+    
     def get_serializer_class(self):
         """Return appropriate serializer based on action"""
-        if self.action == 'create':
+        if self.action in ('create', 'bulk'):
             return TransactionCreateSerializer
         elif self.action == 'list':
             return TransactionListSerializer
@@ -84,7 +267,10 @@ class TransactionViewSet(viewsets.ModelViewSet):
         month = self.request.query_params.get('month')
         year = self.request.query_params.get('year')
         if month and year:
-            queryset = queryset.filter(date__year=year, date__month=month)
+            try:
+                queryset = queryset.filter(**month_date_filter(year, month))
+            except (ValueError, TypeError):
+                queryset = queryset.none()
         
         # Filter by category (for expenses)
         category = self.request.query_params.get('category')
@@ -93,6 +279,19 @@ class TransactionViewSet(viewsets.ModelViewSet):
         
         return queryset
     
+    def list(self, request, *args, **kwargs):
+        """
+        List transactions from values() rows.
+        Same output as TransactionListSerializer without building model instances.
+        """
+        queryset = transaction_list_values(self.filter_queryset(self.get_queryset()))
+        
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serialize_transaction_rows(page))
+        
+        return Response(serialize_transaction_rows(queryset))
+    
     def perform_create(self, serializer):
         """Create transaction and update monthly totals"""
         transaction = serializer.save(user=self.request.user)
@@ -100,42 +299,86 @@ class TransactionViewSet(viewsets.ModelViewSet):
     
     def perform_update(self, serializer):
         """Update transaction and refresh monthly totals"""
-        old_date = self.get_object().date
+        # Snapshot before saving - serializer.save() mutates the instance in place
+        previous_state = transaction_state(serializer.instance)
         transaction = serializer.save()
         
-        # Update monthly totals for both old and new dates
-        update_monthly_totals_on_transaction_change(transaction)
-        if old_date != transaction.date:
-            MonthlyTotalService.update_monthly_totals(self.request.user, old_date.year, old_date.month)
+        # Move the old values out of (and the new values into) the monthly totals
+        update_monthly_totals_on_transaction_change(transaction, previous_state=previous_state)
     
     def perform_destroy(self, instance):
         """Delete transaction and update monthly totals"""
-        transaction_date = instance.date
-        user = instance.user
+        previous_state = transaction_state(instance)
         instance.delete()
-        MonthlyTotalService.update_monthly_totals(user, transaction_date.year, transaction_date.month)
+        update_monthly_totals_on_transaction_change(instance, previous_state=previous_state, deleted=True)
+    
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Create many transactions in one request.
+        Body: a list of transactions (same fields as create), or
+        {"transactions": [...]}. Totals are recomputed once per month.
+        """
+        items = request.data.get('transactions') if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list) or not items:
+            return Response(
+                {'error': _('Expected a non-empty list of transactions')},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if len(items) > BULK_MAX_ITEMS:
+            return Response(
+                {'error': _('At most %(count)d transactions per request') % {'count': BULK_MAX_ITEMS}},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        serializer = self.get_serializer(data=items, many=True)
+        serializer.is_valid(raise_exception=True)
+        
+        rows = []
+        for validated_data in serializer.validated_data:
+            custom_date = validated_data.pop('custom_date', None)
+            if custom_date:
+                validated_data['date'] = custom_date
+            rows.append(validated_data)
+        
+        try:
+            created = TransactionBulkService.bulk_ingest(request.user, rows)
+        except DjangoValidationError as e:
+            return Response(e.message_dict, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'created_count': len(created),
+            'transactions': TransactionListSerializer(created, many=True).data
+        }, status=status.HTTP_201_CREATED)
     
     @action(detail=False, methods=['get'])
     def statistics(self, request):
         """Get transaction statistics"""
-        queryset = self.get_queryset()
+        summary = TransactionSummaryService.summarize_queryset(self.get_queryset())
         
         # Overall statistics
-        total_transactions = queryset.count()
-        total_expense = abs(queryset.filter(transaction_type='expense').aggregate(
-            total=Sum('amount'))['total'] or 0)
-        total_saving = queryset.filter(transaction_type='saving').aggregate(
-            total=Sum('amount'))['total'] or 0
-        total_investment = queryset.filter(transaction_type='investment').aggregate(
-            total=Sum('amount'))['total'] or 0
-        
-        # Category breakdown for expenses
-        expense_categories = queryset.filter(transaction_type='expense').values(
-            'expense_category').annotate(
-            total=Sum('amount'), count=Count('id')).order_by('-total')
+        total_transactions = summary.transaction_count
+        total_expense = summary.expense_total
+        total_saving = summary.saving_total
+        total_investment = summary.investment_total
+        
+        # Category breakdown for expenses (signed totals, smallest spend first)
+        expense_categories = sorted(
+            (
+                {
+                    'expense_category': category,
+                    'total': -total,
+                    'count': summary.category_counts[category]
+                }
+                for category, total in summary.category_totals.items()
+            ),
+            key=lambda item: item['total'],
+            reverse=True
+        )
         
         # Calculate total money spent (all categories as positive)
-        net_total = total_expense + total_saving + total_investment
+        net_total = summary.gross_total
         
         return Response({
             'total_transactions': total_transactions,
@@ -150,6 +393,7 @@ class TransactionViewSet(viewsets.ModelViewSet):
 
 
 @api_view(['GET'])
+@conditional_on_data_version
 def calendar_data(request):
     """
     Get calendar data for a specific month and year.
@@ -162,7 +406,8 @@ def calendar_data(request):
         )
     """
     Get calendar data for a specific month and year.
-    Query params: month (1-12), year (YYYY), filter (all|expense|saving|investment)
+    Query params: month (1-12), year (YYYY), filter (all|expense|saving|investment),
+    include_transactions (true|false, default true)
     """
     try:
         month = int(request.GET.get('month', datetime.now().month))
@@ -187,63 +432,27 @@ def calendar_data(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    # Get transactions for the month (filtered by current user)
-    transactions = Transaction.objects.filter(
-        user=request.user,
-        date__year=year,
-        date__month=month
-    )
+    if filter_type not in CALENDAR_FILTERS:
+        return Response(
+            {'error': _('Invalid filter parameter')},
+            status=status.HTTP_400_BAD_REQUEST
+        )
     
-    # Apply filter if specified
-    if filter_type != 'all':
-        transactions = transactions.filter(transaction_type=filter_type)
-    
-    # Group transactions by date
-    transactions_by_date = defaultdict(list)
-    for transaction in transactions:
-        transactions_by_date[transaction.date].append(transaction)
-    
-    # Generate calendar data
-    calendar_data = []
-    
-    # Get all days in the month
-    month_range = calendar.monthrange(year, month)
-    for day in range(1, month_range[1] + 1):
-        current_date = date(year, month, day)
-        day_transactions = transactions_by_date.get(current_date, [])
-        
-        # Calculate daily total
-        daily_total = sum(t.amount for t in day_transactions)
-        
-        # Count transactions by type
-        expense_count = sum(1 for t in day_transactions if t.transaction_type == 'expense')
-        saving_count = sum(1 for t in day_transactions if t.transaction_type == 'saving')
-        investment_count = sum(1 for t in day_transactions if t.transaction_type == 'investment')
-        
-        # Serialize transactions
-        serialized_transactions = TransactionListSerializer(day_transactions, many=True).data
-        
-        calendar_data.append({
-            'date': current_date,
-            'transactions': serialized_transactions,
-            'daily_total': daily_total,
-            'expense_count': expense_count,
-            'saving_count': saving_count,
-            'investment_count': investment_count
-        })
+    # Day transactions are optional; the month grid only needs daily totals
+    include_transactions = request.GET.get('include_transactions', 'true').lower() not in ('0', 'false', 'no')
     
-    # Serialize calendar data
-    serializer = CalendarDataSerializer(calendar_data, many=True)
+    view = CalendarService.get_month_view(request.user, year, month, filter_type, include_transactions)
     
     return Response({
         'year': year,
         'month': month,
         'filter': filter_type,
-        'calendar_data': serializer.data
+        'calendar_data': render_calendar_days(view)
     })
 
 
 @api_view(['GET'])
+@conditional_on_data_version
 def monthly_totals(request):
     """
     Get monthly totals for dashboard (user-specific).
@@ -262,32 +471,43 @@ def monthly_totals(request):
         try:
             year = int(year)
             month = int(month)
-            totals = MonthlyTotalService.update_monthly_totals(request.user, year, month)
-            serializer = MonthlyTotalSerializer(totals)
+            data = ResultCache.get_or_compute(
+                'month_total', request.user, (year, month, get_language()),
+                lambda: dict(MonthlyTotalSerializer(
+                    MonthlyTotalService.get_month_total(request.user, year, month)
+                ).data)
+            )
         except (ValueError, TypeError):
             return Response(
                 {'error': _('Invalid year or month parameter')},
                 status=status.HTTP_400_BAD_REQUEST
             )
-    else:
-        # Get current month totals for authenticated user
-        totals_dict = MonthlyTotalService.get_current_month_totals(request.user)
-        formatted = MonthlyTotalService.get_formatted_totals(request.user)
         
-        return Response({
+        return Response(data)
+    
+    # Get current month totals for authenticated user
+    now = datetime.now()
+    
+    def current_month_totals():
+        totals_dict = MonthlyTotalService.get_current_month_totals(request.user)
+        return {
             'monthly_totals': totals_dict,
-            'formatted': formatted,
-            'year': datetime.now().year,
-            'month': datetime.now().month
-        })
+            'formatted': MonthlyTotalService.get_formatted_totals(request.user, totals=totals_dict),
+            'year': now.year,
+            'month': now.month
+        }
     
-    return Response(serializer.data)
+    return Response(ResultCache.get_or_compute(
+        'current_month_totals', request.user, (now.year, now.month, get_language()),
+        current_month_totals
+    ))
 
 
 @api_view(['PUT'])
 def refresh_monthly_totals(request):
     """
     Force refresh of all monthly totals (admin only).
+    Runs as a background job; poll the returned status URL for progress.
     """
     # Only allow superusers to refresh all monthly totals
     if not request.user.is_authenticated or not request.user.is_superuser:
@@ -297,12 +517,13 @@ def refresh_monthly_totals(request):
         )
         
     try:
-        updated_count = MonthlyTotalService.refresh_all_monthly_totals()
+        job_id = MonthlyTotalService.start_refresh_all_monthly_totals()
         return Response({
             'success': True,
-            'message': _(f'Updated {updated_count} monthly totals'),
-            'updated_count': updated_count
-        })
+            'message': _('Monthly totals refresh started'),
+            'job_id': job_id,
+            'status_url': request.build_absolute_uri(f'{job_id}/')
+        }, status=status.HTTP_202_ACCEPTED)
     except Exception as e:
         return Response(
             {'error': _(f'Error refreshing monthly totals: {str(e)}')},
@@ -311,6 +532,44 @@ def refresh_monthly_totals(request):
 
 
 @api_view(['GET'])
+def refresh_monthly_totals_status(request, job_id):
+    """
+    Get progress of a monthly totals refresh job (admin only).
+    """
+    if not request.user.is_authenticated or not request.user.is_superuser:
+        return Response(
+            {'error': _('Admin access required')},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    from .background_jobs import BackgroundJobService
+    
+    job_status = BackgroundJobService.get_status(job_id)
+    if job_status is None:
+        return Response(
+            {'error': _('Refresh job not found')},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    return Response(job_status)
+
+
+@api_view(['GET'])
+def result_cache_stats(request):
+    """
+    Get result cache hit/miss counters of the serving process (staff only).
+    """
+    if not request.user.is_authenticated or not request.user.is_staff:
+        return Response(
+            {'error': _('Admin access required')},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    return Response(ResultCache.stats())
+
+
+@api_view(['GET'])
+@conditional_on_data_version
 def monthly_breakdown(request):
     """
     Get detailed monthly breakdown with categories (user-specific).
@@ -331,7 +590,10 @@ def monthly_breakdown(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    breakdown = MonthlyTotalService.get_monthly_breakdown(request.user, year, month)
+    breakdown = ResultCache.get_or_compute(
+        'breakdown', request.user, (year, month, get_language()),
+        lambda: MonthlyTotalService.get_monthly_breakdown(request.user, year, month)
+    )
     
     return Response({
         'year': year,
@@ -341,6 +603,7 @@ def monthly_breakdown(request):
 
 
 @api_view(['GET'])
+@conditional_on_data_version
 def today_summary(request):
     """
     Get summary of today's transactions (user-specific).
@@ -358,14 +621,12 @@ def today_summary(request):
     )
     
     # Calculate totals
-    total_expense = abs(transactions.filter(transaction_type='expense').aggregate(
-        total=Sum('amount'))['total'] or 0)
-    total_saving = transactions.filter(transaction_type='saving').aggregate(
-        total=Sum('amount'))['total'] or 0
-    total_investment = transactions.filter(transaction_type='investment').aggregate(
-        total=Sum('amount'))['total'] or 0
+    summary = TransactionSummaryService.summarize_queryset(transactions)
+    total_expense = summary.expense_total
+    total_saving = summary.saving_total
+    total_investment = summary.investment_total
     
-    daily_total = total_saving + total_investment - total_expense
+    daily_total = summary.net_balance
     
     # Serialize transactions
     serialized_transactions = TransactionListSerializer(transactions, many=True).data
@@ -379,11 +640,12 @@ def today_summary(request):
             'investment': f"+{total_investment:,.0f}₫",
             'daily_total': f"{'+' if daily_total >= 0 else ''}{daily_total:,.0f}₫"
         },
-        'transaction_count': transactions.count()
+        'transaction_count': summary.transaction_count
     })
 
 
 @api_view(['GET'])
+@conditional_on_data_version
 def future_projection(request):
     """
     Get future financial projections with scenario analysis (user-specific).
@@ -411,17 +673,15 @@ def future_projection(request):
     
     try:
         # Simple mock projection when DB is empty or tables don't exist
-        from django.db import connection
         from django.db.utils import OperationalError
         
         try:
-            # Try to check if table exists
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT COUNT(*) FROM transactions_transaction LIMIT 1")
-            
-            # Initialize calculator if table exists
-            calculator = FutureProjectionCalculator(user=request.user)
-            projection_data = calculator.calculate_projection(months)
+            # Projections depend on today's date as well as the data. A missing
+            # table raises OperationalError here and nothing is cached.
+            projection_data = ResultCache.get_or_compute(
+                'projection', request.user, (months, date.today().isoformat(), get_language()),
+                lambda: FutureProjectionCalculator(user=request.user).calculate_projection(months)
+            )
             
         except OperationalError:
             # Return mock data if table doesn't exist
@@ -453,6 +713,7 @@ def future_projection(request):
 
 
 @api_view(['GET'])
+@conditional_on_data_version
 def monthly_analysis(request):
     """
     Get detailed analysis for a specific month (user-specific).
@@ -901,12 +1162,12 @@ class BankConfigListView(APIView):
         try:
             from .models import UserBankConfig
             
-            # Get all user's bank configs
-            bank_configs = UserBankConfig.objects.filter(user=request.user)
+            # Get all user's bank configs (one query, reused below)
+            bank_configs = list(UserBankConfig.objects.filter(user=request.user))
             
             # Prepare predefined banks that user hasn't configured yet
             predefined_banks = []
-            existing_codes = set(bank_configs.values_list('bank_code', flat=True))
+            existing_codes = {config.bank_code for config in bank_configs}
             
             for code, name in UserBankConfig.SUPPORTED_BANKS:
                 if code != 'custom' and code not in existing_codes:
@@ -953,46 +1214,21 @@ class BankSyncStatusView(APIView):
     """Get current sync status and basic stats"""
     permission_classes = [IsAuthenticated]
     
+    @conditional_on_data_version
     def get(self, request):
         """Get sync status for user"""
         try:
             logger.info(f"📊 Bank sync status request from user {request.user.email}")
             
-            # Check Gmail permission
-            try:
-                gmail_permission = UserGmailPermission.objects.get(user=request.user)
-                has_gmail_permission = gmail_permission.has_gmail_permission
-            except UserGmailPermission.DoesNotExist:
-                has_gmail_permission = False
-            
-            # Get enabled banks
-            enabled_banks = UserBankConfig.objects.filter(
-                user=request.user, 
-                is_enabled=True
-            ).values('bank_code', 'last_sync_at', 'is_custom_bank', 'custom_bank_name')
-            
-            # Get recent transactions count (last 30 days)
-            from django.utils import timezone
-            thirty_days_ago = timezone.now() - timedelta(days=30)
-            recent_transactions = BankEmailTransaction.objects.filter(
-                user=request.user,
-                created_at__gte=thirty_days_ago
-            ).count()
-            
-            # Get total transactions count
-            total_transactions = BankEmailTransaction.objects.filter(
-                user=request.user
-            ).count()
+            data = ResultCache.get_or_compute(
+                'sync_status', request.user, (),
+                lambda: self._build_status(request.user),
+                timeout=SYNC_STATUS_CACHE_TIMEOUT
+            )
             
             return Response({
                 'success': True,
-                'data': {
-                    'has_gmail_permission': has_gmail_permission,
-                    'enabled_banks': list(enabled_banks),
-                    'recent_transactions_count': recent_transactions,
-                    'total_transactions_count': total_transactions,
-                    'sync_status': 'ready' if has_gmail_permission and enabled_banks else 'not_configured'
-                }
+                'data': data
             })
             
         except Exception as e:
@@ -1000,4 +1236,41 @@ class BankSyncStatusView(APIView):
             return Response(
                 {'success': False, 'error': f'Status check failed: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            ) 
\ No newline at end of file
+            )
+    
+    @staticmethod
+    def _build_status(user):
+        """Gmail permission, enabled banks and bank transaction counts of a user"""
+        # Check Gmail permission
+        try:
+            gmail_permission = UserGmailPermission.objects.get(user=user)
+            has_gmail_permission = gmail_permission.has_gmail_permission
+        except UserGmailPermission.DoesNotExist:
+            has_gmail_permission = False
+        
+        # Get enabled banks
+        enabled_banks = list(UserBankConfig.objects.filter(
+            user=user, 
+            is_enabled=True
+        ).values('bank_code', 'last_sync_at', 'is_custom_bank', 'custom_bank_name'))
+        
+        # Get recent transactions count (last 30 days)
+        from django.utils import timezone
+        thirty_days_ago = timezone.now() - timedelta(days=30)
+        recent_transactions = BankEmailTransaction.objects.filter(
+            user=user,
+            created_at__gte=thirty_days_ago
+        ).count()
+        
+        # Get total transactions count
+        total_transactions = BankEmailTransaction.objects.filter(
+            user=user
+        ).count()
+        
+        return {
+            'has_gmail_permission': has_gmail_permission,
+            'enabled_banks': enabled_banks,
+            'recent_transactions_count': recent_transactions,
+            'total_transactions_count': total_transactions,
+            'sync_status': 'ready' if has_gmail_permission and enabled_banks else 'not_configured'
+        }